@@ -0,0 +1,81 @@
+# bench/bench_analytics.py
+"""
+소모 분석(analytics.analyze_consumption) 시간 측정 + numpy / array 계산 결과 비교.
+
+  python bench/bench_analytics.py                       # 품목 10,000개 × 12개월
+  python bench/bench_analytics.py --items 2000 --months 3 --per-day 500
+
+- synth.generate로 임시 DB 생성 → 엔진별 repeat회 실행(최솟값)
+- 두 엔진의 소모 속도/발주 제안이 같은지 확인(NumPy가 없으면 array만)
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "bench"))
+
+import analytics  # noqa: E402
+from db import connect  # noqa: E402
+from synth import SynthSpec, add_spec_arguments, generate, spec_from_args  # noqa: E402
+
+
+def _same(a, b) -> bool:
+    if len(a.items) != len(b.items):
+        return False
+    for x, y in zip(a.items, b.items):
+        if x.item_id != y.item_id or x.reorder_qty != y.reorder_qty:
+            return False
+        if not math.isclose(x.burn, y.burn, rel_tol=1e-9, abs_tol=1e-9):
+            return False
+        if any(not math.isclose(p, q, abs_tol=1e-6) for p, q in zip(x.weekly, y.weekly)):
+            return False
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="소모 분석 시간 측정")
+    add_spec_arguments(ap)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.set_defaults(items=10_000, months=12, per_day=SynthSpec().per_day * 5)
+    args = ap.parse_args(argv)
+
+    engines = ["array"] + (["numpy"] if analytics.np is not None else [])
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "bench.db")
+        t0 = time.perf_counter()
+        summary = generate(path, spec_from_args(args))
+        print(f"synth: items={summary['items']} movements={summary['movements']} ({time.perf_counter() - t0:.1f}s)")
+
+        conn = connect(path)
+        gid = summary["guilds"][0]
+        reports = {}
+        for engine in engines:
+            best = None
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                rep = analytics.analyze_consumption(conn, gid, now_epoch=summary["end_epoch"], engine=engine)
+                total = time.perf_counter() - t
+                if best is None or total < best[0]:
+                    best = (total, rep)
+            total, rep = best
+            reports[engine] = rep
+            print(
+                f"{engine:<6} total={total * 1000:8.1f}ms load={rep.load_s * 1000:8.1f}ms "
+                f"compute={rep.compute_s * 1000:8.1f}ms out_rows={rep.out_rows} reorder={len(rep.reorder())}"
+            )
+        conn.close()
+
+    if len(reports) == 2:
+        print("numpy == array:", _same(reports["numpy"], reports["array"]))
+
+
+if __name__ == "__main__":
+    main()
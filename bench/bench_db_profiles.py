@@ -0,0 +1,101 @@
+# bench/bench_db_profiles.py
+"""
+DB 튜닝 프로필(db.DB_PROFILES)별 apply_stock_change 처리량 비교.
+
+  python bench/bench_db_profiles.py                       # 전체 프로필, 기본 2000회
+  python bench/bench_db_profiles.py --ops 5000 --items 500
+  python bench/bench_db_profiles.py --profiles baseline balanced --json out.json
+
+- 프로필마다 임시 디렉터리에 새 DB(파일) 생성 → 스키마 적용 → 품목 시드
+- 입고/출고를 번갈아 ops회 실행(매번 커밋 = 실제 봇과 같은 패턴)
+- 결과: 초당 처리량, 지연 p50/p99(ms)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from db import DB_PROFILES, apply_schema, connect  # noqa: E402
+from repo.movement_repo import apply_stock_change  # noqa: E402
+
+
+GUILD_ID = 1
+
+
+def _seed(conn, items: int) -> list[int]:
+    t = "2026/01/01 00:00:00"
+    conn.execute(
+        "INSERT INTO categories (guild_id, name, is_active, sort_order, created_at, updated_at) VALUES (?, '벤치', 1, 0, ?, ?)",
+        (GUILD_ID, t, t),
+    )
+    cat_id = conn.execute("SELECT id FROM categories WHERE guild_id=?", (GUILD_ID,)).fetchone()[0]
+    conn.executemany(
+        "INSERT INTO items (guild_id, category_id, name, code, qty, warn_below, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, 1000, 10, ?, ?)",
+        [(GUILD_ID, cat_id, f"품목{i:05d}", f"B{i}", t, t) for i in range(items)],
+    )
+    conn.commit()
+    return [int(r[0]) for r in conn.execute("SELECT id FROM items WHERE guild_id=?", (GUILD_ID,))]
+
+
+def bench_profile(name: str, ops: int, items: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    with tempfile.TemporaryDirectory() as d:
+        conn = connect(os.path.join(d, "bench.db"), profile=name)
+        apply_schema(conn, str(ROOT / "src" / "schema.sql"))
+        ids = _seed(conn, items)
+
+        lat: list[float] = []
+        started = time.perf_counter()
+        for i in range(ops):
+            item_id = rnd.choice(ids)
+            action = "IN" if i % 2 == 0 else "OUT"
+            t0 = time.perf_counter()
+            apply_stock_change(conn, GUILD_ID, item_id, action, 1, None, "", "bench", 0)
+            lat.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        conn.close()
+
+    lat.sort()
+    return {
+        "profile": name,
+        "ops": ops,
+        "items": items,
+        "seconds": round(elapsed, 4),
+        "ops_per_sec": round(ops / elapsed, 1),
+        "p50_ms": round(statistics.median(lat) * 1000, 3),
+        "p99_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="DB 튜닝 프로필별 apply_stock_change 처리량")
+    ap.add_argument("--profiles", nargs="*", default=list(DB_PROFILES))
+    ap.add_argument("--ops", type=int, default=2000)
+    ap.add_argument("--items", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    args = ap.parse_args(argv)
+
+    results = [bench_profile(p, args.ops, args.items, args.seed) for p in args.profiles]
+
+    print(f"{'profile':<10} {'ops/s':>10} {'p50(ms)':>10} {'p99(ms)':>10}")
+    for r in results:
+        print(f"{r['profile']:<10} {r['ops_per_sec']:>10} {r['p50_ms']:>10} {r['p99_ms']:>10}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
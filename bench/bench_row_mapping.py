@@ -0,0 +1,112 @@
+# bench/bench_row_mapping.py
+"""
+repo 조회 함수의 행 → 결과 객체 변환 비용(10k행 기준 시간/메모리).
+
+  python bench/bench_row_mapping.py
+  python bench/bench_row_mapping.py --rows 10000 --repeat 5 --json out.json
+
+- 품목 rows개(카테고리 1개) + 기록 rows개를 넣은 임시 DB에서
+  list_items_by_category / search_items / list_items_for_report / list_movements_in_epoch_range 를 실행
+- time_ms: repeat회 중 최솟값, peak_kb: tracemalloc 최대 할당량, retained_kb: 결과 리스트가 붙잡고 있는 메모리
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from db import apply_schema, connect  # noqa: E402
+from repo.item_repo import list_items_by_category, search_items  # noqa: E402
+from repo.report_repo import list_items_for_report, list_movements_in_epoch_range  # noqa: E402
+
+
+GUILD_ID = 1
+
+
+def _seed(conn, rows: int) -> int:
+    t = "2026/01/01 00:00:00"
+    conn.execute(
+        "INSERT INTO categories (guild_id, name, is_active, sort_order, created_at, updated_at) VALUES (?, '벤치', 1, 0, ?, ?)",
+        (GUILD_ID, t, t),
+    )
+    cat_id = conn.execute("SELECT id FROM categories WHERE guild_id=?", (GUILD_ID,)).fetchone()[0]
+    conn.executemany(
+        "INSERT INTO items (guild_id, category_id, name, code, qty, warn_below, note, storage_location, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, 5, '메모', '창고 A', ?, ?)",
+        [(GUILD_ID, cat_id, f"품목{i:06d}", f"C{i}", i % 100, t, t) for i in range(rows)],
+    )
+    conn.executemany(
+        "INSERT INTO movements (guild_id, item_id, item_name_snapshot, item_code_snapshot, category_name_snapshot, "
+        "action, qty_change, before_qty, after_qty, reason, discord_name, created_at_kst_text, created_at_epoch) "
+        "VALUES (?, ?, ?, ?, '벤치', 'IN', 1, ?, ?, '', 'bench', ?, ?)",
+        [(GUILD_ID, 1 + i % rows, f"품목{i % rows:06d}", f"C{i % rows}", i, i + 1, t, 1_000_000 + i) for i in range(rows)],
+    )
+    conn.commit()
+    return int(cat_id)
+
+
+def _measure(fn, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+        del out
+
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    out = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(out)
+    del out
+    return {
+        "rows": n,
+        "time_ms": round(best * 1000, 2),
+        "peak_kb": round((peak - base) / 1024, 1),
+        "retained_kb": round((current - base) / 1024, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="repo 조회 결과 변환 비용 측정")
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", default=None)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as d:
+        conn = connect(os.path.join(d, "bench.db"))
+        apply_schema(conn, str(ROOT / "src" / "schema.sql"))
+        cat_id = _seed(conn, args.rows)
+
+        cases = {
+            "list_items_by_category": lambda: list_items_by_category(conn, GUILD_ID, cat_id, offset=0, limit=args.rows),
+            "search_items": lambda: search_items(conn, GUILD_ID, "품목", limit=args.rows),
+            "list_items_for_report": lambda: list_items_for_report(conn, GUILD_ID),
+            "list_movements_in_epoch_range": lambda: list_movements_in_epoch_range(conn, GUILD_ID, 0, 2_000_000_000),
+        }
+        results = {name: _measure(fn, args.repeat) for name, fn in cases.items()}
+        conn.close()
+
+    print(f"{'case':<32} {'rows':>7} {'time(ms)':>10} {'peak(KB)':>10} {'kept(KB)':>10}")
+    for name, r in results.items():
+        print(f"{name:<32} {r['rows']:>7} {r['time_ms']:>10} {r['peak_kb']:>10} {r['retained_kb']:>10}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# bench/run_bench.py
+"""
+repo/보고서 주요 경로 벤치마크(가짜 데이터, bench/synth.py).
+
+  python bench/run_bench.py                                   # 기본 크기
+  python bench/run_bench.py --items 5000 --months 12 --per-day 500 --json after.json
+  python bench/run_bench.py --json after.json --compare before.json   # 커밋 간 회귀 비교
+  python bench/run_bench.py --sql-profile 10                          # 측정 중 SQL 상위 10개(src/sql_profiler.py)
+
+측정 항목(길드 1개 기준, 각 repeat회 → min/median/p95 ms)
+- search_items: 이름 일부/코드 일부 검색(limit 20)
+- list_items_by_category_deep: 가장 큰 카테고리의 마지막 페이지(OFFSET 깊게, 12개)
+- apply_stock_change: 입고/출고 ops회 연속(매번 커밋) → ops/s
+- list_items_for_report
+- build_daily_log_wb / build_monthly_log_wb: 엑셀 생성 + 저장(BytesIO)까지
+- do_backup_sqlite: 백업 API 스냅샷
+- delete_movements_chunk_before_epoch: 가장 오래된 한 달을 청크로 전부 삭제(1회, DB 복사본에서)
+  (예전 delete_movements_before_epoch 한 방 삭제는 분기 정리 청크 작업으로 바뀌어 이 함수로 측정)
+
+JSON: {"meta": {...}, "results": {항목: {...}}} - meta에 git 커밋/파이썬/SQLite 버전/데이터 크기
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "bench"))
+
+from synth import add_spec_arguments, generate, spec_from_args, synth_guild_id  # noqa: E402
+
+from backup import do_backup_sqlite  # noqa: E402
+from db import connect  # noqa: E402
+import sql_profiler  # noqa: E402
+from repo.item_repo import count_items_by_category, list_items_by_category, search_items  # noqa: E402
+from repo.movement_repo import apply_stock_change  # noqa: E402
+from repo.report_repo import delete_movements_chunk_before_epoch, list_items_for_report  # noqa: E402
+from reporting import build_daily_log_wb, build_monthly_log_wb  # noqa: E402
+from utils.time_kst import KST  # noqa: E402
+
+
+PAGE_SIZE = 12  # ui/item_list.py 와 같음
+
+
+def _stats(samples: list[float], **extra) -> dict:
+    s = sorted(samples)
+    return {
+        "n": len(s),
+        "min_ms": round(s[0] * 1000, 3),
+        "median_ms": round(statistics.median(s) * 1000, 3),
+        "p95_ms": round(s[min(len(s) - 1, int(len(s) * 0.95))] * 1000, 3),
+        **extra,
+    }
+
+
+def _time(fn, repeat: int) -> tuple[list[float], object]:
+    out = None
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append(time.perf_counter() - t0)
+    return samples, out
+
+
+def _save_wb(wb) -> int:
+    bio = io.BytesIO()
+    wb.save(bio)
+    return bio.tell()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run(db_path: str, summary: dict, repeat: int, ops: int) -> dict[str, dict]:
+    gid = synth_guild_id(0)
+    results: dict[str, dict] = {}
+    conn = connect(db_path)
+
+    # --- 검색 ---
+    keywords = ["팔물", "00123", "G1", "없는품목"]
+    samples = []
+    for kw in keywords:
+        s, _ = _time(lambda: search_items(conn, gid, kw, limit=20), repeat)
+        samples.extend(s)
+    results["search_items"] = _stats(samples, keywords=keywords)
+
+    # --- 전체보기 깊은 페이지 ---
+    cat_id, total = conn.execute(
+        """
+        SELECT category_id, COUNT(*) AS n FROM items
+        WHERE guild_id=? AND is_active=1 GROUP BY category_id ORDER BY n DESC LIMIT 1
+        """,
+        (gid,),
+    ).fetchone()
+    last_offset = max(0, (int(total) - 1) // PAGE_SIZE * PAGE_SIZE)
+
+    def _deep_page():
+        count_items_by_category(conn, gid, cat_id)
+        return list_items_by_category(conn, gid, cat_id, offset=last_offset, limit=PAGE_SIZE)
+
+    s, _ = _time(_deep_page, repeat)
+    results["list_items_by_category_deep"] = _stats(s, category_items=int(total), offset=last_offset)
+
+    # --- 보고서용 품목 목록 ---
+    s, rows = _time(lambda: list_items_for_report(conn, gid), repeat)
+    results["list_items_for_report"] = _stats(s, rows=len(rows))
+
+    # --- 일일/월간 로그 엑셀 ---
+    now = datetime.fromtimestamp(summary["end_epoch"], KST)
+    day_start = int(now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+    prev_day = day_start - 86400
+    s, size = _time(lambda: _save_wb(build_daily_log_wb(conn, gid, prev_day, day_start)), repeat)
+    results["build_daily_log_wb"] = _stats(s, xlsx_bytes=size)
+
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    prev_month = (month_start.replace(year=month_start.year - 1, month=12) if month_start.month == 1
+                  else month_start.replace(month=month_start.month - 1))
+    m_args = (int(prev_month.timestamp()), int(month_start.timestamp()), prev_month.strftime("%Y-%m"))
+    m_rows = conn.execute(
+        "SELECT COUNT(*) FROM movements WHERE guild_id=? AND created_at_epoch>=? AND created_at_epoch<?",
+        (gid, m_args[0], m_args[1]),
+    ).fetchone()[0]
+    s, size = _time(lambda: _save_wb(build_monthly_log_wb(conn, gid, *m_args)), max(1, repeat // 2))
+    results["build_monthly_log_wb"] = _stats(s, rows=int(m_rows), xlsx_bytes=size)
+
+    # --- 백업 ---
+    with tempfile.TemporaryDirectory() as d:
+        n = [0]
+
+        def _backup():
+            n[0] += 1
+            return do_backup_sqlite(conn, Path(d) / f"b{n[0]}.db")
+
+        s, _ = _time(_backup, max(1, repeat // 2))
+    results["do_backup_sqlite"] = _stats(s, db_bytes=Path(db_path).stat().st_size)
+
+    # --- 입출고 처리량(쓰기) ---
+    rnd = random.Random(7)
+    ids = [int(r[0]) for r in conn.execute("SELECT id FROM items WHERE guild_id=? AND is_active=1", (gid,))]
+    lat = []
+    started = time.perf_counter()
+    for i in range(ops):
+        t0 = time.perf_counter()
+        apply_stock_change(conn, gid, rnd.choice(ids), "IN" if i % 2 == 0 else "OUT", 1, None, "", "bench", 0)
+        lat.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    results["apply_stock_change"] = _stats(lat, ops=ops, ops_per_sec=round(ops / elapsed, 1))
+    conn.close()
+
+    # --- 오래된 기록 청크 삭제(복사본에서 1회) ---
+    with tempfile.TemporaryDirectory() as d:
+        copy = Path(d) / "copy.db"
+        src = sqlite3.connect(db_path)
+        dst = sqlite3.connect(copy)
+        src.backup(dst)
+        src.close()
+        dst.close()
+
+        c2 = connect(str(copy))
+        cutoff = summary["start_epoch"] + 31 * 86400
+        deleted, chunks, last_id = 0, 0, 0
+        t0 = time.perf_counter()
+        while True:
+            n_del, last_id = delete_movements_chunk_before_epoch(c2, gid, cutoff, last_id, 2000)
+            if n_del == 0:
+                break
+            c2.commit()
+            deleted += n_del
+            chunks += 1
+        elapsed = time.perf_counter() - t0
+        c2.close()
+    results["delete_movements_chunk_before_epoch"] = _stats(
+        [elapsed], rows=deleted, chunks=chunks, rows_per_sec=round(deleted / elapsed, 1) if elapsed else 0,
+    )
+
+    return results
+
+
+def _print_table(results: dict[str, dict], base: dict[str, dict] | None) -> None:
+    head = f"{'case':<38} {'min(ms)':>10} {'median(ms)':>11} {'p95(ms)':>10}"
+    print(head + (f" {'vs base':>9}" if base else ""))
+    for name, r in results.items():
+        line = f"{name:<38} {r['min_ms']:>10} {r['median_ms']:>11} {r['p95_ms']:>10}"
+        if base and name in base and base[name].get("median_ms"):
+            ratio = r["median_ms"] / base[name]["median_ms"]
+            line += f" {ratio:>8.2f}x"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="repo/보고서 경로 벤치마크(가짜 데이터)")
+    add_spec_arguments(ap)
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--ops", type=int, default=1000, help="apply_stock_change 횟수")
+    ap.add_argument("--db", default=None, help="synth.py로 만든 DB 재사용(없으면 임시로 생성)")
+    ap.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    ap.add_argument("--compare", default=None, help="이전 결과 JSON과 median 비교")
+    ap.add_argument("--sql-profile", type=int, default=0, help="SQL 프로파일러를 켜고 상위 N개 출력")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as d:
+        db_path = args.db
+        if db_path:
+            # 쓰기 측정이 원본을 바꾸지 않게 복사해서 사용
+            db_path = str(shutil.copy(args.db, Path(d) / "bench.db"))
+            with sqlite3.connect(db_path) as c:
+                lo, hi = c.execute("SELECT MIN(created_at_epoch), MAX(created_at_epoch) FROM movements").fetchone()
+            summary = {"spec": {"db": args.db}, "start_epoch": int(lo or 0), "end_epoch": int(hi or time.time())}
+        else:
+            db_path = str(Path(d) / "bench.db")
+            t0 = time.perf_counter()
+            summary = generate(db_path, spec_from_args(args))
+            print(f"[BENCH] synth: items={summary['items']} movements={summary['movements']} "
+                  f"({time.perf_counter() - t0:.1f}s)")
+
+        if args.sql_profile:
+            sql_profiler.enable(slow_ms=10**9)  # 개별 [SLOW_SQL] 로그는 끄고 집계만
+        results = run(db_path, summary, max(1, args.repeat), max(1, args.ops))
+
+    base = None
+    if args.compare:
+        base = json.loads(Path(args.compare).read_text(encoding="utf-8")).get("results")
+    _print_table(results, base)
+
+    if args.sql_profile:
+        print()
+        for s in sql_profiler.snapshot(args.sql_profile):
+            site = next(iter(s["sites"]), "-")
+            print(f"{s['total_ms']:>10.1f}ms {s['count']:>6}x avg={s['avg_ms']:.3f}ms rows={s['rows']:<8} {site}")
+            print(f"{'':>12}{s['sql'][:140]}")
+        sql_profiler.disable()
+
+    if args.json:
+        out = {
+            "meta": {
+                "commit": _git_commit(),
+                "created_at": datetime.now(KST).strftime("%Y/%m/%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "data": summary["spec"],
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
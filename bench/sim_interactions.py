@@ -0,0 +1,385 @@
+# bench/sim_interactions.py
+"""
+디스코드 없이 UI 경로 부하 시뮬레이션(오프라인).
+
+  python bench/sim_interactions.py                                  # 20명, 1인당 10회
+  python bench/sim_interactions.py --users 50 --iterations 20 --think-ms 300 --rtt-ms 80
+  python bench/sim_interactions.py --db /tmp/synth.db --read-pool 4 --json sim.json
+
+- 가짜 Interaction(응답/팔로업/모달 기록)으로 실제 UI 콜백을 그대로 호출, DB는 실제 SQLite 파일
+  대시보드 버튼 → ActionItemSearchModal.on_submit → 품목 선택 → _InOutModal/_AdjustModal.on_submit
+  대시보드 검색 → ItemSearchModal.on_submit → 결과 선택(상세)
+  대시보드 전체보기 → ItemListView 페이지 넘기기
+- 사용자마다 비동기 태스크 1개(봇처럼 이벤트 루프 1개) → 다른 사용자의 DB 작업이 루프를 막으면 그만큼 ACK가 늦어짐
+- 단계별 ACK 지연(이벤트 도착 → 첫 응답) / 전체 처리 시간 백분위, 3초 ACK 기한까지 남은 여유를 출력
+  이벤트 도착 시각 = 사용자가 누르려던 시각(루프가 막혀 늦게 깨어나도 그 시간은 지연에 포함)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "bench"))
+
+from synth import add_spec_arguments, generate, spec_from_args, synth_guild_id  # noqa: E402
+
+from db import attach_read_pool, close_read_pool, connect  # noqa: E402
+from ui.dashboard_view import DashboardView  # noqa: E402
+from ui.item_list import ItemListView, _BtnNext, _BtnPrev  # noqa: E402
+
+
+ACK_DEADLINE_MS = 3000.0
+
+
+# ---- 가짜 디스코드 객체 ----
+
+@dataclass
+class FakeUser:
+    id: int
+    display_name: str
+    roles: list = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.display_name
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+@dataclass
+class FakeGuild:
+    id: int
+    owner_id: int
+    name: str = "벤치 서버"
+
+    def get_channel(self, channel_id: int):
+        return None  # 알림 채널 전송은 건너뜀(설정 조회 비용은 그대로 포함)
+
+    def get_member(self, user_id: int):
+        return None
+
+
+@dataclass
+class Sent:
+    kind: str
+    content: str | None = None
+    embed: object = None
+    view: object = None
+
+
+class FakeResponse:
+    def __init__(self, itx: "FakeInteraction"):
+        self._itx = itx
+        self._done = False
+        self.kind: str | None = None
+        self.modal = None
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _ack(self, kind: str) -> None:
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+        self.kind = kind
+        await self._itx.network(ack=True)
+
+    async def send_message(self, content=None, *, embed=None, view=None, ephemeral=False, **kwargs):
+        await self._ack("message")
+        self._itx.sent.append(Sent("message", content, embed, view))
+
+    async def defer(self, *, ephemeral=False, thinking=False):
+        await self._ack("defer")
+
+    async def edit_message(self, *, content=None, embed=None, view=None, **kwargs):
+        await self._ack("edit")
+        self._itx.sent.append(Sent("edit", content, embed, view))
+
+    async def send_modal(self, modal):
+        await self._ack("modal")
+        self.modal = modal
+
+
+class FakeFollowup:
+    def __init__(self, itx: "FakeInteraction"):
+        self._itx = itx
+
+    async def send(self, content=None, *, embed=None, view=None, ephemeral=False, **kwargs):
+        await self._itx.network()
+        self._itx.sent.append(Sent("followup", content, embed, view))
+
+
+class FakeClient:
+    def __init__(self, conn):
+        self.conn = conn
+        self.user = FakeUser(id=1, display_name="bot")
+
+
+class FakeInteraction:
+    def __init__(self, sim: "Simulator", user: FakeUser, arrival: float):
+        self._sim = sim
+        self.client = sim.client
+        self.user = user
+        self.guild = FakeGuild(id=sim.guild_id, owner_id=user.id)  # 관리자 검사(is_owner) 통과
+        self.guild_id = sim.guild_id
+        self.channel = None
+        self.message = None
+        self.arrival = arrival
+        self.acked_at: float | None = None
+        self.sent: list[Sent] = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def network(self, ack: bool = False) -> None:
+        """HTTP 왕복 흉내: 요청이 디스코드에 도착하는 시점(왕복의 절반)을 ACK 시각으로."""
+        half = self._sim.rtt / 2
+        if half:
+            await asyncio.sleep(half)
+        if ack:
+            self.acked_at = time.perf_counter()
+        if half:
+            await asyncio.sleep(half)
+
+    async def edit_original_response(self, **kwargs):
+        await self.network()
+
+    def last_view(self):
+        for s in reversed(self.sent):
+            if s.view is not None:
+                return s.view
+        return None
+
+
+# ---- 시뮬레이터 ----
+
+@dataclass
+class StepStats:
+    ack_ms: list[float] = field(default_factory=list)
+    total_ms: list[float] = field(default_factory=list)
+    no_ack: int = 0
+    errors: int = 0
+
+
+class Simulator:
+    def __init__(self, conn, guild_id: int, rtt_ms: float, think_ms: float, seed: int):
+        self.client = FakeClient(conn)
+        self.conn = conn
+        self.guild_id = guild_id
+        self.rtt = rtt_ms / 1000.0
+        self.think = think_ms / 1000.0
+        self.rnd = random.Random(seed)
+        self.steps: dict[str, StepStats] = {}
+        self.flows: dict[str, int] = {}
+        self.item_names = [str(r[0]) for r in conn.execute(
+            "SELECT name FROM items WHERE guild_id=? AND is_active=1", (guild_id,)
+        )]
+
+    async def wait_user(self) -> float:
+        """사용자 생각 시간만큼 쉬고, '눌렀어야 할' 시각을 돌려줌."""
+        delay = self.rnd.expovariate(1.0 / self.think) if self.think > 0 else 0.0
+        due = time.perf_counter() + delay
+        await asyncio.sleep(delay)
+        return due
+
+    async def step(self, name: str, user: FakeUser, call) -> FakeInteraction:
+        itx = FakeInteraction(self, user, await self.wait_user())
+        st = self.steps.setdefault(name, StepStats())
+        try:
+            await call(itx)
+        except Exception as e:
+            st.errors += 1
+            print(f"[SIM] {name} error: {type(e).__name__}: {e}")
+        done = time.perf_counter()
+        if itx.acked_at is None:
+            st.no_ack += 1
+        else:
+            st.ack_ms.append((itx.acked_at - itx.arrival) * 1000)
+        st.total_ms.append((done - itx.arrival) * 1000)
+        return itx
+
+    def keyword(self) -> str:
+        name = self.rnd.choice(self.item_names)
+        # 사람처럼 이름 일부만 입력(앞 단어 또는 번호 뒷자리)
+        return name.split()[0] if self.rnd.random() < 0.5 else name[-3:]
+
+
+def _button(view, custom_id: str):
+    return next(c for c in view.children if getattr(c, "custom_id", None) == custom_id)
+
+
+async def flow_stock(sim: Simulator, user: FakeUser, dash: DashboardView, action: str) -> None:
+    custom_id = {"IN": "inv:dash:incoming", "OUT": "inv:dash:outgoing", "ADJUST": "inv:dash:adjust"}[action]
+    itx = await sim.step("dashboard_button", user, _button(dash, custom_id).callback)
+    modal = itx.response.modal
+    if modal is None:
+        return
+    modal.q._value = sim.keyword()
+
+    itx = await sim.step("action_search_submit", user, modal.on_submit)
+    view = itx.last_view()
+    if view is None:
+        return  # 검색 결과 없음
+    select = view.children[0]
+    select._values = [sim.rnd.choice(select.options).value]
+
+    itx = await sim.step("action_item_select", user, select.callback)
+    modal = itx.response.modal
+    if modal is None:
+        return
+    if action == "ADJUST":
+        modal.new_qty._value = str(sim.rnd.randint(0, 200))
+        modal.reason._value = "재고 실사"
+        await sim.step("adjust_submit", user, modal.on_submit)
+    else:
+        modal.qty._value = str(sim.rnd.randint(1, 5))
+        modal.reason._value = ""
+        await sim.step("inout_submit", user, modal.on_submit)
+
+
+async def flow_search(sim: Simulator, user: FakeUser, dash: DashboardView) -> None:
+    itx = await sim.step("dashboard_button", user, _button(dash, "inv:dash:search").callback)
+    modal = itx.response.modal
+    if modal is None:
+        return
+    modal.q._value = sim.keyword()
+
+    itx = await sim.step("item_search_submit", user, modal.on_submit)
+    view = itx.last_view()
+    if view is None:
+        return
+    select = view.children[0]
+    select._values = [sim.rnd.choice(select.options).value]
+    await sim.step("item_result_select", user, select.callback)
+
+
+async def flow_list(sim: Simulator, user: FakeUser, dash: DashboardView, pages: int) -> None:
+    itx = await sim.step("dashboard_button", user, _button(dash, "inv:dash:list_all").callback)
+    view = itx.last_view()
+    if not isinstance(view, ItemListView):
+        return
+    nxt = next(c for c in view.children if isinstance(c, _BtnNext))
+    prv = next(c for c in view.children if isinstance(c, _BtnPrev))
+    for _ in range(pages):
+        btn = nxt if view.page < view.total_pages or sim.rnd.random() < 0.2 else prv
+        await sim.step("item_list_page", user, btn.callback)
+
+
+def _parse_mix(text: str) -> dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        k, _, v = part.partition("=")
+        mix[k.strip()] = int(v or 1)
+    unknown = set(mix) - {"in", "out", "adjust", "search", "list"}
+    if unknown:
+        raise SystemExit(f"알 수 없는 흐름: {', '.join(sorted(unknown))}")
+    return mix
+
+
+async def _user_loop(sim: Simulator, user: FakeUser, iterations: int, mix: dict[str, int], pages: int) -> None:
+    dash = DashboardView()
+    names, weights = list(mix), list(mix.values())
+    for _ in range(iterations):
+        flow = sim.rnd.choices(names, weights)[0]
+        sim.flows[flow] = sim.flows.get(flow, 0) + 1
+        if flow == "search":
+            await flow_search(sim, user, dash)
+        elif flow == "list":
+            await flow_list(sim, user, dash, pages)
+        else:
+            await flow_stock(sim, user, dash, flow.upper())
+
+
+def _pct(values: list[float], p: float) -> float:
+    s = sorted(values)
+    return s[min(len(s) - 1, int(len(s) * p))] if s else 0.0
+
+
+def summarize(sim: Simulator, warn_ms: float) -> dict[str, dict]:
+    out = {}
+    for name, st in sim.steps.items():
+        a = st.ack_ms or [0.0]
+        out[name] = {
+            "n": len(st.total_ms),
+            "ack_p50_ms": round(statistics.median(a), 2),
+            "ack_p95_ms": round(_pct(a, 0.95), 2),
+            "ack_p99_ms": round(_pct(a, 0.99), 2),
+            "ack_max_ms": round(max(a), 2),
+            "deadline_headroom_ms": round(ACK_DEADLINE_MS - max(a), 2),
+            "over_warn": sum(1 for v in st.ack_ms if v >= warn_ms),
+            "missed_deadline": sum(1 for v in st.ack_ms if v >= ACK_DEADLINE_MS) + st.no_ack,
+            "total_p50_ms": round(statistics.median(st.total_ms), 2) if st.total_ms else 0.0,
+            "total_p99_ms": round(_pct(st.total_ms, 0.99), 2),
+            "errors": st.errors,
+        }
+    return out
+
+
+async def _run(args, db_path: str) -> dict:
+    conn = connect(db_path)
+    if args.read_pool:
+        attach_read_pool(conn, args.read_pool)
+    try:
+        sim = Simulator(conn, synth_guild_id(0), args.rtt_ms, args.think_ms, args.seed)
+        users = [FakeUser(id=10_000 + i, display_name=f"직원{i:02d}") for i in range(args.users)]
+        mix = _parse_mix(args.mix)
+        started = time.perf_counter()
+        await asyncio.gather(*(_user_loop(sim, u, args.iterations, mix, args.pages) for u in users))
+        elapsed = time.perf_counter() - started
+        return {"elapsed_s": round(elapsed, 2), "flows": sim.flows, "steps": summarize(sim, args.warn_ms)}
+    finally:
+        close_read_pool(conn)
+        conn.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="오프라인 디스코드 UI 부하 시뮬레이션")
+    add_spec_arguments(ap)
+    ap.add_argument("--db", default=None, help="synth.py로 만든 DB(복사해서 사용). 없으면 임시 생성")
+    ap.add_argument("--users", type=int, default=20)
+    ap.add_argument("--iterations", type=int, default=10, help="사용자당 흐름 반복 수")
+    ap.add_argument("--mix", default="in=3,out=3,adjust=1,search=2,list=1")
+    ap.add_argument("--pages", type=int, default=3, help="전체보기에서 넘길 페이지 수")
+    ap.add_argument("--think-ms", type=float, default=500.0, help="사용자 조작 간격 평균(지수분포)")
+    ap.add_argument("--rtt-ms", type=float, default=0.0, help="디스코드 API 왕복 시간 흉내")
+    ap.add_argument("--warn-ms", type=float, default=2000.0, help="이 이상 ACK 지연은 경고로 집계")
+    ap.add_argument("--read-pool", type=int, default=0, help="읽기 풀 크기(0이면 봇 커넥션만)")
+    ap.add_argument("--json", default=None)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as d:
+        db_path = str(Path(d) / "sim.db")
+        if args.db:
+            shutil.copy(args.db, db_path)
+        else:
+            s = generate(db_path, spec_from_args(args))
+            print(f"[SIM] synth: items={s['items']} movements={s['movements']}")
+        result = asyncio.run(_run(args, db_path))
+
+    print(f"[SIM] users={args.users} iterations={args.iterations} elapsed={result['elapsed_s']}s flows={result['flows']}")
+    print(f"{'step':<22} {'n':>6} {'ack p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'여유(ms)':>9} {'≥warn':>6} {'≥3s':>5} {'err':>4}")
+    for name, r in sorted(result["steps"].items()):
+        print(
+            f"{name:<22} {r['n']:>6} {r['ack_p50_ms']:>9} {r['ack_p95_ms']:>9} {r['ack_p99_ms']:>9} "
+            f"{r['ack_max_ms']:>9} {r['deadline_headroom_ms']:>9} {r['over_warn']:>6} {r['missed_deadline']:>5} {r['errors']:>4}"
+        )
+
+    if args.json:
+        result["args"] = vars(args)
+        Path(args.json).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
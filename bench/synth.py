@@ -0,0 +1,185 @@
+# bench/synth.py
+"""
+벤치마크용 가짜 데이터 생성(실제 봇 스키마 그대로).
+
+  python bench/synth.py --out /tmp/synth.db --guilds 2 --items 2000 --categories 12 --months 6 --per-day 300
+
+- 길드마다 카테고리/품목 생성, months개월 전부터 지금까지 매일 per-day건 입출고 기록
+- 기록은 품목별 재고(before → after)가 이어지게 만듦(시점 복원/요약 계산이 실제와 같은 모양)
+- seed가 같으면 항상 같은 데이터
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from db import apply_schema, connect  # noqa: E402
+from utils.time_kst import KST  # noqa: E402
+
+
+@dataclass
+class SynthSpec:
+    guilds: int = 1
+    items: int = 1000          # 길드당
+    categories: int = 10       # 길드당
+    months: int = 3
+    per_day: int = 200         # 길드당 하루 기록 수
+    inactive_ratio: float = 0.05
+    seed: int = 42
+
+
+_NAME_WORDS = ("팔물탕", "쌍화탕", "보험약", "스틱약", "공진단", "해벽산", "십전대보", "소화제", "파스", "붕대")
+_ACTORS = ("김약사", "이실장", "박원장", "최간호", "정직원")
+_REASONS = ("", "", "", "정기 입고", "환자 처방", "재고 실사", "파손")
+
+
+def synth_guild_id(n: int) -> int:
+    return 1000 + n
+
+
+def _kst_text(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, KST).strftime("%Y/%m/%d %H:%M:%S")
+
+
+def generate(db_path: str, spec: SynthSpec, now_epoch: int | None = None) -> dict:
+    """db_path에 스키마 적용 + 데이터 생성. 반환값: 생성 요약(길드 id, 행 수, 기간)."""
+    rnd = random.Random(spec.seed)
+    now_epoch = int(now_epoch if now_epoch is not None else time.time())
+    now_dt = datetime.fromtimestamp(now_epoch, KST)
+    start_dt = (now_dt - timedelta(days=31 * spec.months)).replace(hour=0, minute=0, second=0, microsecond=0)
+    days = max(1, (now_dt - start_dt).days)
+
+    conn = connect(db_path)
+    apply_schema(conn, str(ROOT / "src" / "schema.sql"))
+    created = _kst_text(int(start_dt.timestamp()))
+
+    summary = {"spec": asdict(spec), "guilds": [], "items": 0, "movements": 0,
+               "start_epoch": int(start_dt.timestamp()), "end_epoch": now_epoch}
+
+    for g in range(spec.guilds):
+        gid = synth_guild_id(g)
+
+        conn.executemany(
+            "INSERT INTO categories (guild_id, name, is_active, sort_order, created_at, updated_at) VALUES (?, ?, 1, ?, ?, ?)",
+            [(gid, f"카테고리{c:02d}", c, created, created) for c in range(spec.categories)],
+        )
+        cat_rows = conn.execute("SELECT id, name FROM categories WHERE guild_id=? ORDER BY id", (gid,)).fetchall()
+
+        item_rows = []
+        for i in range(spec.items):
+            cat_id, _ = cat_rows[i % len(cat_rows)]
+            name = f"{_NAME_WORDS[i % len(_NAME_WORDS)]} {i:05d}"
+            code = f"G{i}" if i % 3 else None
+            active = 0 if rnd.random() < spec.inactive_ratio else 1
+            item_rows.append((gid, cat_id, name, code, rnd.randint(20, 200), rnd.choice((0, 5, 10, 20)),
+                              "" if i % 4 else "냉장 보관", f"선반 {i % 30 + 1}", active, created, created))
+        conn.executemany(
+            "INSERT INTO items (guild_id, category_id, name, code, qty, warn_below, note, storage_location, "
+            "is_active, created_at, updated_at) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+            item_rows,
+        )
+
+        items = conn.execute(
+            """
+            SELECT i.id, i.name, COALESCE(i.code,''), c.name, i.qty
+            FROM items i JOIN categories c ON c.id=i.category_id
+            WHERE i.guild_id=? AND i.is_active=1
+            """,
+            (gid,),
+        ).fetchall()
+        qty = {int(r[0]): int(r[4]) for r in items}
+
+        # 하루씩 시간순으로 만들어 넣음(id 순서 = 시간 순서, 실제 봇과 같음)
+        n_mov = 0
+        batch: list[tuple] = []
+        for day in range(days):
+            day_start = int((start_dt + timedelta(days=day)).timestamp())
+            for t in sorted(rnd.randrange(9 * 3600, 19 * 3600) for _ in range(spec.per_day)):
+                iid, iname, icode, cname, _ = items[rnd.randrange(len(items))]
+                before = qty[iid]
+                roll = rnd.random()
+                if roll < 0.45:
+                    action, change = "IN", rnd.randint(1, 30)
+                elif roll < 0.95:
+                    action, change = "OUT", -min(before, rnd.randint(1, 10)) if before > 0 else 0
+                else:
+                    action, change = "ADJUST", rnd.randint(-5, 5)
+                after = before + change
+                qty[iid] = after
+                epoch = day_start + t
+                batch.append((gid, iid, iname, icode, cname, action, change, before, after,
+                              rnd.choice(_REASONS), rnd.choice(_ACTORS), _kst_text(epoch), epoch))
+            if len(batch) >= 5000:
+                _insert_movements(conn, batch)
+                n_mov += len(batch)
+                batch.clear()
+        _insert_movements(conn, batch)
+        n_mov += len(batch)
+
+        conn.executemany("UPDATE items SET qty=? WHERE id=?", [(v, k) for k, v in qty.items()])
+        conn.commit()
+
+        summary["guilds"].append(gid)
+        summary["items"] += spec.items
+        summary["movements"] += n_mov
+
+    conn.close()
+    return summary
+
+
+def _insert_movements(conn, rows: list[tuple]) -> None:
+    if not rows:
+        return
+    conn.executemany(
+        """
+        INSERT INTO movements (
+            guild_id, item_id, item_name_snapshot, item_code_snapshot, category_name_snapshot,
+            action, qty_change, before_qty, after_qty, reason, discord_name,
+            created_at_kst_text, created_at_epoch
+        ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+        rows,
+    )
+
+
+def add_spec_arguments(ap: argparse.ArgumentParser) -> None:
+    d = SynthSpec()
+    ap.add_argument("--guilds", type=int, default=d.guilds)
+    ap.add_argument("--items", type=int, default=d.items, help="길드당 품목 수")
+    ap.add_argument("--categories", type=int, default=d.categories, help="길드당 카테고리 수")
+    ap.add_argument("--months", type=int, default=d.months, help="기록 기간(개월)")
+    ap.add_argument("--per-day", type=int, default=d.per_day, help="길드당 하루 기록 수")
+    ap.add_argument("--seed", type=int, default=d.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> SynthSpec:
+    return SynthSpec(
+        guilds=args.guilds, items=args.items, categories=args.categories,
+        months=args.months, per_day=args.per_day, seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="벤치마크용 가짜 DB 생성")
+    ap.add_argument("--out", required=True)
+    add_spec_arguments(ap)
+    args = ap.parse_args(argv)
+
+    if Path(args.out).exists():
+        raise SystemExit(f"이미 있는 파일이에요: {args.out}")
+    started = time.perf_counter()
+    s = generate(args.out, spec_from_args(args))
+    print(f"[SYNTH] {args.out}: guilds={s['guilds']} items={s['items']} movements={s['movements']} "
+          f"({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
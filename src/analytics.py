@@ -0,0 +1,389 @@
+# src/analytics.py
+"""
+품목별 소모(출고) 분석 + 발주 제안.
+
+- 길드 1개의 출고(OUT)를 (품목, 일) 단위로 SQL에서 합계 → 쿼리 1번(+ 기간이 걸친 보관 파일)
+- 품목 축 배열로 한 번에 계산(NumPy가 있으면 bincount로 벡터화, 없으면 array.array + 1회 순회)
+  · 일평균 출고: 최근 7일 / 28일 / 91일
+  · 소모 속도(burn) = 0.5×7일 + 0.3×28일 + 0.2×91일 평균(최근 변화를 더 반영한 가중 이동평균)
+  · 예상 소진일 = 현재 재고 / burn, 경고까지 = (재고 - warn_below) / burn
+  · 발주 제안: 재고 ≤ warn_below + burn×ANALYTICS_LEAD_DAYS(입고까지 걸리는 날) 이면
+    warn_below + burn×(LEAD + ANALYTICS_COVER_DAYS) 까지 채우는 수량
+  · 최근 N주 주별 출고량(주간 시트)
+- 경고 기준(warn_below) 제안: 최근 WARN_SUGGEST_DAYS일 일별 출고의 평균/표준편차로
+  평균×입고기간 + 안전재고(z×표준편차×√입고기간) → /경고기준제안 에서 검토 후 한 번에 적용
+- 1만 품목 × 1년 기록도 수 초 안(bench/bench_analytics.py)
+"""
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from archive import iter_archived_rows
+from db import read_conn
+from utils.time_kst import KST
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성: 없으면 array.array로 같은 계산
+    np = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+_WINDOWS = (7, 28, 91)
+_WEIGHTS = (0.5, 0.3, 0.2)
+
+# 품목/일별 출고량(운영 테이블과 보관 파일 공통, GROUP BY item_id, d)
+_OUT_BY_DAY_WHERE = "AND action = 'OUT' AND item_id IS NOT NULL"
+
+
+def _out_by_day_select(start_epoch: int) -> str:
+    return f"item_id, (created_at_epoch - {int(start_epoch)}) / 86400 AS d, -SUM(qty_change) AS out_qty"
+
+
+@dataclass
+class ItemForecast:
+    item_id: int
+    name: str
+    code: str
+    category_name: str
+    qty: int
+    warn_below: int
+    avg7: float
+    avg28: float
+    avg91: float
+    burn: float
+    days_to_stockout: float     # burn=0이면 inf
+    days_to_warn: float
+    reorder_qty: int
+    weekly: list[float] = field(default_factory=list)   # 오래된 주 → 최근 주
+
+
+@dataclass
+class ConsumptionReport:
+    guild_id: int
+    as_of_epoch: int
+    days: int
+    weeks: int
+    lead_days: int
+    cover_days: int
+    engine: str
+    load_s: float
+    compute_s: float
+    out_rows: int
+    items: list[ItemForecast]
+
+    def consuming(self) -> list[ItemForecast]:
+        """출고가 있었던 품목, 급한 순(소진일 짧은 순)."""
+        xs = [f for f in self.items if f.burn > 0]
+        xs.sort(key=lambda f: (f.days_to_stockout, -f.burn))
+        return xs
+
+    def reorder(self) -> list[ItemForecast]:
+        return [f for f in self.consuming() if f.reorder_qty > 0]
+
+
+def _load_items(rc: sqlite3.Connection, guild_id: int) -> list[tuple]:
+    return rc.execute(
+        """
+        SELECT i.id, i.name, COALESCE(i.code,''), COALESCE(c.name,'기타'), i.qty, i.warn_below
+        FROM items i
+        LEFT JOIN categories c ON c.id = i.category_id AND c.guild_id = i.guild_id
+        WHERE i.guild_id = ? AND i.is_active = 1
+        ORDER BY i.id
+        """,
+        (int(guild_id),),
+    ).fetchall()
+
+
+def _load_out_by_day(conn: sqlite3.Connection, guild_id: int, start_epoch: int, end_epoch: int) -> list[tuple]:
+    """(item_id, 일 번호(0=start 날짜), 출고량) - 운영 테이블 + 기간이 걸친 보관 파일."""
+    select = _out_by_day_select(start_epoch)
+    with read_conn(conn) as rc:
+        rows = rc.execute(
+            f"SELECT {select} FROM movements WHERE guild_id = ? "
+            f"AND created_at_epoch >= ? AND created_at_epoch < ? {_OUT_BY_DAY_WHERE} GROUP BY item_id, d",
+            (int(guild_id), int(start_epoch), int(end_epoch)),
+        ).fetchall()
+    out = [tuple(r) for r in rows]
+    for batch in iter_archived_rows(
+        conn, guild_id, start_epoch, end_epoch, select, _OUT_BY_DAY_WHERE, group_by="item_id, d", order_by="",
+    ):
+        out.extend(batch)
+    return out
+
+
+def _compute_numpy(ids: list[int], qty, warn, out_rows: list[tuple], days: int, weeks: int, lead: int, cover: int):
+    n = len(ids)
+    ids_arr = np.asarray(ids, dtype=np.int64)
+    qty = np.asarray(qty, dtype=np.float64)
+    warn = np.asarray(warn, dtype=np.float64)
+
+    if out_rows:
+        raw = np.asarray(out_rows, dtype=np.float64)
+        item_col, d, out = raw[:, 0].astype(np.int64), raw[:, 1].astype(np.int64), raw[:, 2]
+        pos = np.searchsorted(ids_arr, item_col)
+        pos = np.clip(pos, 0, max(0, n - 1))
+        ok = (ids_arr[pos] == item_col) if n else np.zeros(len(item_col), dtype=bool)  # 비활성 품목 제외
+        pos, d, out = pos[ok], d[ok], out[ok]
+    else:
+        pos = np.zeros(0, dtype=np.int64)
+        d = np.zeros(0, dtype=np.int64)
+        out = np.zeros(0, dtype=np.float64)
+
+    avgs = []
+    for w in _WINDOWS:
+        m = d >= days - w
+        avgs.append(np.bincount(pos[m], weights=out[m], minlength=n) / w)
+    burn = sum(wt * a for wt, a in zip(_WEIGHTS, avgs))
+
+    week = (days - 1 - d) // 7          # 0 = 최근 주
+    m = week < weeks
+    weekly = np.bincount(pos[m] * weeks + week[m], weights=out[m], minlength=n * weeks).reshape(n, weeks)[:, ::-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_out = np.where(burn > 0, np.maximum(qty, 0) / burn, np.inf)
+        to_warn = np.where(burn > 0, np.maximum(qty - warn, 0) / burn, np.inf)
+    need = (burn > 0) & (qty <= warn + burn * lead)
+    reorder = np.where(need, np.ceil(warn + burn * (lead + cover) - qty), 0).clip(min=0)
+
+    return (
+        [a.tolist() for a in avgs], burn.tolist(), to_out.tolist(), to_warn.tolist(),
+        reorder.astype(np.int64).tolist(), weekly.tolist(),
+    )
+
+
+def _compute_array(ids: list[int], qty, warn, out_rows: list[tuple], days: int, weeks: int, lead: int, cover: int):
+    n = len(ids)
+    index = {iid: i for i, iid in enumerate(ids)}
+    sums = [array("d", bytes(8 * n)) for _ in _WINDOWS]
+    weekly_flat = array("d", bytes(8 * n * weeks))
+    cut = [days - w for w in _WINDOWS]
+
+    for item_id, d, out in out_rows:
+        i = index.get(item_id)
+        if i is None:
+            continue
+        for k, c in enumerate(cut):
+            if d >= c:
+                sums[k][i] += out
+        wk = (days - 1 - d) // 7
+        if wk < weeks:
+            weekly_flat[i * weeks + (weeks - 1 - wk)] += out
+
+    avgs = [[s[i] / w for i in range(n)] for s, w in zip(sums, _WINDOWS)]
+    burn, to_out, to_warn, reorder, weekly = [], [], [], [], []
+    for i in range(n):
+        b = sum(wt * a[i] for wt, a in zip(_WEIGHTS, avgs))
+        q, wb = float(qty[i]), float(warn[i])
+        burn.append(b)
+        to_out.append(max(q, 0) / b if b > 0 else math.inf)
+        to_warn.append(max(q - wb, 0) / b if b > 0 else math.inf)
+        need = b > 0 and q <= wb + b * lead
+        reorder.append(max(0, math.ceil(wb + b * (lead + cover) - q)) if need else 0)
+        weekly.append(list(weekly_flat[i * weeks:(i + 1) * weeks]))
+    return avgs, burn, to_out, to_warn, reorder, weekly
+
+
+def _window(now_epoch: int | None, days: int) -> tuple[int, int]:
+    """오늘(KST) 0시까지 days일 → (시작 epoch, 끝 epoch). 오늘은 하루가 덜 끝나서 제외."""
+    now = datetime.fromtimestamp(int(now_epoch if now_epoch is not None else time.time()), KST)
+    end_dt = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return int((end_dt - timedelta(days=days)).timestamp()), int(end_dt.timestamp())
+
+
+def analyze_consumption(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    now_epoch: int | None = None,
+    days: int | None = None,
+    weeks: int = 8,
+    engine: str | None = None,
+) -> ConsumptionReport:
+    """
+    오늘(KST) 0시 기준 지난 days일(기본 ANALYTICS_DAYS=364) 출고로 품목별 소모 속도/소진 예상/발주 제안.
+    engine: "numpy" | "array" (기본: NumPy 있으면 numpy)
+    """
+    days = max(91, int(days or _env_int("ANALYTICS_DAYS", 364)))
+    weeks = max(1, min(int(weeks), days // 7))
+    lead = max(0, _env_int("ANALYTICS_LEAD_DAYS", 7))
+    cover = max(1, _env_int("ANALYTICS_COVER_DAYS", 14))
+    engine = engine or ("numpy" if np is not None else "array")
+    if engine == "numpy" and np is None:
+        engine = "array"
+
+    start_epoch, end_epoch = _window(now_epoch, days)
+
+    t0 = time.perf_counter()
+    with read_conn(conn) as rc:
+        items = _load_items(rc, guild_id)
+    out_rows = _load_out_by_day(conn, guild_id, start_epoch, end_epoch)
+    t1 = time.perf_counter()
+
+    ids = [int(r[0]) for r in items]
+    qty = [int(r[4] or 0) for r in items]
+    warn = [int(r[5] or 0) for r in items]
+    compute = _compute_numpy if engine == "numpy" else _compute_array
+    avgs, burn, to_out, to_warn, reorder, weekly = compute(ids, qty, warn, out_rows, days, weeks, lead, cover)
+    t2 = time.perf_counter()
+
+    forecasts = [
+        ItemForecast(
+            item_id=ids[i], name=str(r[1] or ""), code=str(r[2] or ""), category_name=str(r[3] or "기타"),
+            qty=qty[i], warn_below=warn[i],
+            avg7=avgs[0][i], avg28=avgs[1][i], avg91=avgs[2][i], burn=burn[i],
+            days_to_stockout=to_out[i], days_to_warn=to_warn[i], reorder_qty=int(reorder[i]),
+            weekly=weekly[i],
+        )
+        for i, r in enumerate(items)
+    ]
+    return ConsumptionReport(
+        guild_id=int(guild_id), as_of_epoch=end_epoch, days=days, weeks=weeks, lead_days=lead, cover_days=cover,
+        engine=engine, load_s=t1 - t0, compute_s=t2 - t1, out_rows=len(out_rows), items=forecasts,
+    )
+
+
+@dataclass
+class WarnSuggestion:
+    item_id: int
+    name: str
+    code: str
+    category_name: str
+    qty: int
+    current: int        # 현재 warn_below(0 = 꺼짐)
+    suggested: int
+    daily_mean: float
+    daily_std: float
+
+    @property
+    def newly_alerting(self) -> bool:
+        """적용하면 바로 경고 상태(qty ≤ 기준)가 되는 품목."""
+        was = self.current > 0 and self.qty <= self.current
+        return self.qty <= self.suggested and not was
+
+
+def _demand_stats(ids: list[int], out_rows: list[tuple], days: int) -> tuple[list[float], list[float]]:
+    """품목별 일 출고 평균/표준편차(출고 없는 날 = 0 포함)."""
+    n = len(ids)
+    if np is not None:
+        ids_arr = np.asarray(ids, dtype=np.int64)
+        if out_rows and n:
+            raw = np.asarray(out_rows, dtype=np.float64)
+            item_col, out = raw[:, 0].astype(np.int64), raw[:, 2]
+            pos = np.clip(np.searchsorted(ids_arr, item_col), 0, n - 1)
+            ok = ids_arr[pos] == item_col
+            total = np.bincount(pos[ok], weights=out[ok], minlength=n)
+            sq = np.bincount(pos[ok], weights=out[ok] ** 2, minlength=n)
+        else:
+            total = sq = np.zeros(n)
+        mean = total / days
+        std = np.sqrt(np.maximum(sq / days - mean ** 2, 0))
+        return mean.tolist(), std.tolist()
+
+    index = {iid: i for i, iid in enumerate(ids)}
+    total = array("d", bytes(8 * n))
+    sq = array("d", bytes(8 * n))
+    for item_id, _, out in out_rows:
+        i = index.get(item_id)
+        if i is not None:
+            total[i] += out
+            sq[i] += out * out
+    mean = [t / days for t in total]
+    std = [math.sqrt(max(q / days - m * m, 0.0)) for q, m in zip(sq, mean)]
+    return mean, std
+
+
+def warn_suggest_basis_text() -> str:
+    days = max(28, _env_int("WARN_SUGGEST_DAYS", 91))
+    lead = max(1, _env_int("ANALYTICS_LEAD_DAYS", 7))
+    z = max(0.0, _env_float("WARN_SUGGEST_Z", 1.65))
+    return f"최근 {days}일 출고 기준 · 일평균×{lead}일 + 안전재고(z={z:g})"
+
+
+def suggest_warn_below(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    now_epoch: int | None = None,
+) -> list[WarnSuggestion]:
+    """
+    길드 전체 품목 경고 기준 제안(바꿀 만한 것만, 차이 큰 순).
+    - 기준 = ceil(일평균 × 입고기간 + z × 일 표준편차 × √입고기간)
+      (ANALYTICS_LEAD_DAYS=7, WARN_SUGGEST_Z=1.65 ≈ 95% 기간 동안 안 떨어짐)
+    - 기간 중 출고가 없던 품목은 제안 안 함(손으로 넣은 기준 유지)
+    - 현재 값과 WARN_SUGGEST_MIN_CHANGE_PCT%(기본 20) 미만 차이는 제외 → 매주 조금씩 흔들리는 것 방지
+    """
+    days = max(28, _env_int("WARN_SUGGEST_DAYS", 91))
+    lead = max(1, _env_int("ANALYTICS_LEAD_DAYS", 7))
+    z = max(0.0, _env_float("WARN_SUGGEST_Z", 1.65))
+    min_pct = max(0, _env_int("WARN_SUGGEST_MIN_CHANGE_PCT", 20))
+    start_epoch, end_epoch = _window(now_epoch, days)
+
+    with read_conn(conn) as rc:
+        items = _load_items(rc, guild_id)
+    out_rows = _load_out_by_day(conn, guild_id, start_epoch, end_epoch)
+    ids = [int(r[0]) for r in items]
+    mean, std = _demand_stats(ids, out_rows, days)
+
+    root_lead = math.sqrt(lead)
+    result: list[WarnSuggestion] = []
+    for i, r in enumerate(items):
+        if mean[i] <= 0:
+            continue
+        suggested = max(1, math.ceil(mean[i] * lead + z * std[i] * root_lead - 1e-9))
+        current = int(r[5] or 0)
+        if current > 0 and abs(suggested - current) * 100 < current * min_pct:
+            continue
+        if suggested == current:
+            continue
+        result.append(WarnSuggestion(
+            item_id=ids[i], name=str(r[1] or ""), code=str(r[2] or ""), category_name=str(r[3] or "기타"),
+            qty=int(r[4] or 0), current=current, suggested=suggested, daily_mean=mean[i], daily_std=std[i],
+        ))
+    result.sort(key=lambda x: (-abs(x.suggested - x.current), x.item_id))
+    return result
+
+
+def _fmt_days(v: float) -> str:
+    if math.isinf(v):
+        return "-"
+    return f"{v:.0f}일" if v >= 1 else "오늘"
+
+
+def build_consumption_text(rep: ConsumptionReport, n: int = 10) -> str:
+    """/소모분석 출력: 급한 품목 n개 + 발주 제안 수."""
+    cons = rep.consuming()
+    reorder = rep.reorder()
+    as_of = datetime.fromtimestamp(rep.as_of_epoch - 1, KST).strftime("%Y-%m-%d")
+    lines = [
+        f"📉 **소모 분석** ({as_of}까지 {rep.days}일 · 품목 {len(rep.items)}개 중 출고 {len(cons)}개)",
+        f"발주 제안 **{len(reorder)}개** (입고까지 {rep.lead_days}일 + {rep.cover_days}일치 확보 기준)",
+    ]
+    if not cons:
+        lines.append("최근 출고 기록이 없어요.")
+        return "\n".join(lines)
+    lines.append("```")
+    lines.append(f"{'품목':<14}{'재고':>6}{'일평균':>7}{'소진':>6}{'발주':>6}")
+    for f in cons[:n]:
+        name = f.name[:14]
+        lines.append(f"{name:<14}{f.qty:>6}{f.burn:>7.1f}{_fmt_days(f.days_to_stockout):>6}{f.reorder_qty or '':>6}")
+    lines.append("```")
+    lines.append(f"계산 {rep.engine} · 읽기 {rep.load_s * 1000:.0f}ms · 계산 {rep.compute_s * 1000:.0f}ms")
+    return "\n".join(lines)[:1990]
@@ -0,0 +1,290 @@
+# src/archive.py
+"""
+입출고 기록(movements) 보관 계층.
+
+- 분기 정리 때 오래된 기록을 지우지 않고 분기별 보관 DB 파일로 옮김
+  ARCHIVE_DIR/movements_YYYY-QN.db (모든 길드 공용, guild_id 컬럼으로 구분)
+- 옮기기는 id 순서로 일정 행 수씩:
+  1) 보관 파일에 INSERT OR IGNORE + commit (별도 커넥션, 워커 스레드)
+  2) 운영 DB에서 그 id들만 DELETE + commit (짧은 쓰기 트랜잭션)
+  → 진행 위치는 maintenance_jobs에 기록, 재시작해도 이어서 진행(중복 없이)
+- 보고서/시점 복원은 기간이 보관 구간에 걸치면 보관 파일을 읽기 전용으로 열어 합쳐 읽음
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from db import read_conn
+from repo.archive_repo import list_archives_in_range, upsert_archive_entry
+from repo.maintenance_repo import record_job_progress
+from repo.records import Movement
+from repo.report_repo import delete_movements_chunk_before_epoch, list_movements_in_epoch_range
+from utils.time_kst import KST, now_kst
+
+
+def _archive_dir() -> Path:
+    d = Path(os.environ.get("ARCHIVE_DIR", "./data/archive"))
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def _archive_chunk_rows() -> int:
+    try:
+        return max(100, int(os.environ.get("ARCHIVE_CHUNK_ROWS", "2000")))
+    except ValueError:
+        return 2000
+
+
+def quarter_bounds(epoch: int) -> tuple[str, int, int]:
+    """epoch가 속한 KST 분기 → (YYYY-QN, 시작 epoch, 다음 분기 시작 epoch)."""
+    dt = datetime.fromtimestamp(int(epoch), KST)
+    q = (dt.month - 1) // 3 + 1
+    start = dt.replace(month=1 + (q - 1) * 3, day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = start.replace(year=start.year + 1, month=1) if q == 4 else start.replace(month=start.month + 3)
+    return f"{start.year}-Q{q}", int(start.timestamp()), int(end.timestamp())
+
+
+def archive_file_name(quarter_key: str) -> str:
+    return f"movements_{quarter_key}.db"
+
+
+def movement_columns(conn: sqlite3.Connection) -> list[tuple[str, str]]:
+    return [(r[1], r[2] or "") for r in conn.execute("PRAGMA table_info(movements)").fetchall()]
+
+
+def _open_archive_for_write(path: Path, columns: list[tuple[str, str]]) -> sqlite3.Connection:
+    aconn = sqlite3.connect(path)
+    aconn.execute("PRAGMA journal_mode = DELETE;")
+    col_defs = ", ".join(
+        "id INTEGER PRIMARY KEY" if name == "id" else f"{name} {ctype}".strip()
+        for name, ctype in columns
+    )
+    aconn.execute(f"CREATE TABLE IF NOT EXISTS movements ({col_defs})")
+
+    # 운영 스키마에 컬럼이 늘었으면 보관 파일에도 추가
+    have = {r[1] for r in aconn.execute("PRAGMA table_info(movements)").fetchall()}
+    for name, ctype in columns:
+        if name not in have:
+            aconn.execute(f"ALTER TABLE movements ADD COLUMN {name} {ctype}".strip())
+
+    aconn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_archive_guild_epoch ON movements(guild_id, created_at_epoch)"
+    )
+    aconn.commit()
+    return aconn
+
+
+def _write_archive_rows(path: Path, columns: list[tuple[str, str]], guild_id: int, rows: list[tuple]) -> int:
+    """(워커 스레드) 보관 파일에 rows 추가 → 이 길드의 보관 행 수 반환."""
+    names = [c[0] for c in columns]
+    aconn = _open_archive_for_write(path, columns)
+    try:
+        aconn.executemany(
+            f"INSERT OR IGNORE INTO movements ({', '.join(names)}) VALUES ({', '.join(['?'] * len(names))})",
+            rows,
+        )
+        aconn.commit()
+        row = aconn.execute("SELECT COUNT(*) FROM movements WHERE guild_id=?", (int(guild_id),)).fetchone()
+        return int(row[0])
+    finally:
+        aconn.close()
+
+
+def _chunk_pause_sec() -> float:
+    try:
+        return max(0.0, float(os.environ.get("CLEANUP_CHUNK_PAUSE_MS", "50")) / 1000.0)
+    except ValueError:
+        return 0.05
+
+
+async def _archive_chunk(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    cutoff_epoch: int,
+    after_id: int,
+    limit: int,
+    columns: list[tuple[str, str]],
+) -> tuple[int, int]:
+    """
+    청크 1개를 보관 파일에 쓰고(커밋) 운영 테이블에서 DELETE(커밋은 호출 쪽).
+    반환값: (옮긴 수, 마지막 id)
+    """
+    names = [c[0] for c in columns]
+    rows = conn.execute(
+        f"""
+        SELECT {', '.join(names)} FROM movements
+        WHERE id > ? AND guild_id = ? AND created_at_epoch < ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (int(after_id), int(guild_id), int(cutoff_epoch), int(limit)),
+    ).fetchall()
+    if not rows:
+        return 0, int(after_id)
+
+    i_id = names.index("id")
+    i_epoch = names.index("created_at_epoch")
+
+    by_quarter: dict[tuple[str, int, int], list[tuple]] = {}
+    for r in rows:
+        by_quarter.setdefault(quarter_bounds(r[i_epoch]), []).append(tuple(r))
+
+    # 파일부터 전부 쓰고(await) → 목록 기록 + 커밋은 await 없이 한 번에.
+    # bot.conn에 쓰기 트랜잭션을 연 채로 기다리면 그 사이 입출고 BEGIN이 실패하고,
+    # 다른 곳의 commit()이 파일보다 먼저 목록을 커밋해 버림
+    d = _archive_dir()
+    entries = []
+    for (qkey, q_start, q_end), q_rows in by_quarter.items():
+        fname = archive_file_name(qkey)
+        total = await asyncio.to_thread(_write_archive_rows, d / fname, columns, guild_id, q_rows)
+        entries.append((qkey, fname, q_start, q_end, total))
+
+    k = now_kst()
+    for qkey, fname, q_start, q_end, total in entries:
+        upsert_archive_entry(conn, guild_id, qkey, fname, q_start, q_end, total, k.kst_text, k.epoch)
+    conn.commit()
+
+    ids = [int(r[i_id]) for r in rows]
+    conn.executemany("DELETE FROM movements WHERE id=?", [(i,) for i in ids])
+    return len(ids), ids[-1]
+
+
+async def run_movement_cleanup_job(conn: sqlite3.Connection, job: dict) -> int:
+    """
+    maintenance_jobs 작업 1개를 last_id 다음부터 끝까지 진행.
+    - kind=movement_archive: 보관 파일로 이동 / movement_purge: 삭제만
+    - 청크마다: 삭제 + 진행 위치 기록을 한 트랜잭션으로 커밋 → 재시작해도 정확히 이어감
+    - 청크 사이에 잠깐 쉬어서 입출고 처리가 끼어들 수 있게
+    반환값: 이번 실행에서 처리한 행 수
+    """
+    chunk = _archive_chunk_rows()
+    pause = _chunk_pause_sec()
+    columns = movement_columns(conn)
+
+    job_key = str(job["job_key"])
+    guild_id = int(job["guild_id"])
+    cutoff_epoch = int(job["cutoff_epoch"])
+    last_id = int(job["last_id"])
+    purge = job["kind"] == "movement_purge"
+    done = 0
+
+    while True:
+        if purge:
+            n, last = delete_movements_chunk_before_epoch(conn, guild_id, cutoff_epoch, last_id, chunk)
+        else:
+            n, last = await _archive_chunk(conn, guild_id, cutoff_epoch, last_id, chunk, columns)
+        if n == 0:
+            break
+
+        record_job_progress(conn, job_key, last, n, now_kst().epoch)
+        conn.commit()
+
+        last_id = last
+        done += n
+        await asyncio.sleep(pause)
+
+    return done
+
+
+def _open_archive_readonly(path: Path) -> sqlite3.Connection:
+    aconn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    aconn.row_factory = sqlite3.Row
+    return aconn
+
+
+def live_min_id(conn: sqlite3.Connection, guild_id: int) -> int | None:
+    """운영 테이블에 남은 이 길드 기록의 최소 id(없으면 None)."""
+    with read_conn(conn) as rc:
+        row = rc.execute("SELECT MIN(id) FROM movements WHERE guild_id=?", (int(guild_id),)).fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def iter_archived_rows(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    start_epoch: int,
+    end_epoch: int,
+    select: str | list[str],
+    where: str = "",
+    params: tuple = (),
+    *,
+    after_id: int = 0,
+    skip_live: bool = True,
+    group_by: str = "",
+    order_by: str = "id",
+    batch_size: int = 5000,
+) -> Iterator[list[tuple]]:
+    """
+    기간 [start_epoch, end_epoch)에 걸친 보관 파일(분기 오래된 순)에서
+      SELECT {select} FROM movements WHERE guild_id / 기간 / id > after_id {where} [GROUP BY] [ORDER BY]
+    결과를 batch_size행씩. 보관 파일을 읽는 곳은 모두 이걸 씀.
+    - select가 컬럼 이름 목록이면 예전 보관 파일에 없는 컬럼은 NULL로
+    - skip_live: 운영 테이블 최소 id 이상은 건너뜀. 옮기기는 id 순으로 복사 → 삭제라서,
+      옮기는 도중 양쪽에 있는 행은 항상 그 id 이상 → 운영 테이블 결과와 합쳐도 중복 없음
+      (시점 복원처럼 id 순서로 직접 걸러내는 곳만 False)
+    """
+    archives = list_archives_in_range(conn, guild_id, start_epoch, end_epoch)
+    if not archives:
+        return
+    extra, extra_params = "", ()
+    if skip_live:
+        min_id = live_min_id(conn, guild_id)
+        if min_id is not None:
+            extra, extra_params = "AND id < ?", (min_id,)
+
+    d = _archive_dir()
+    for a in archives:
+        path = d / a["file_name"]
+        if not path.exists():
+            print(f"[ARCHIVE] missing file: {path}")
+            continue
+        aconn = _open_archive_readonly(path)
+        try:
+            cols = select
+            if not isinstance(cols, str):
+                have = {r[1] for r in aconn.execute("PRAGMA table_info(movements)")}
+                cols = ", ".join(c if c in have else f"NULL AS {c}" for c in select)
+            cur = aconn.execute(
+                f"""
+                SELECT {cols} FROM movements
+                WHERE guild_id = ? AND created_at_epoch >= ? AND created_at_epoch < ? AND id > ?
+                  {extra} {where}
+                {f"GROUP BY {group_by}" if group_by else ""}
+                {f"ORDER BY {order_by}" if order_by else ""}
+                """,
+                (int(guild_id), int(start_epoch), int(end_epoch), int(after_id), *extra_params, *params),
+            )
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [tuple(r) for r in rows]
+        finally:
+            aconn.close()
+
+
+def list_archived_movements(conn: sqlite3.Connection, guild_id: int, start_epoch: int, end_epoch: int) -> list[Movement]:
+    """보관 파일에서 [start_epoch, end_epoch) 기록 읽기(시간순, 운영 테이블에 남은 id 제외)."""
+    out: list[Movement] = []
+    for rows in iter_archived_rows(
+        conn, guild_id, start_epoch, end_epoch, list(Movement.__slots__), order_by="created_at_epoch, id",
+    ):
+        out.extend(Movement(*r) for r in rows)
+    return out
+
+
+def list_movements_with_archive(conn: sqlite3.Connection, guild_id: int, start_epoch: int, end_epoch: int) -> list[Movement]:
+    """보고서용: 운영 테이블 + (기간이 걸치면) 보관 파일 기록을 합쳐 시간순으로."""
+    hot = list_movements_in_epoch_range(conn, guild_id, start_epoch, end_epoch)
+    archived = list_archived_movements(conn, guild_id, start_epoch, end_epoch)
+    if not archived:
+        return hot
+
+    merged = archived + hot
+    merged.sort(key=lambda r: (int(r.created_at_epoch), r.id))
+    return merged
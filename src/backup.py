@@ -1,17 +1,35 @@
 # src/backup.py
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 import re
 import sqlite3
+import time
 import zipfile
 from pathlib import Path
 from datetime import datetime, timedelta
 
 import discord
 
-from utils.time_kst import now_kst
+from db import database_path
+from exporter import cleanup_old_exports
+from guild_export import export_guild_file, count_export_rows
+from utils.metrics import BACKUP_FAILURES, BACKUP_LAST_BYTES, BACKUP_LAST_SUCCESS, BACKUP_SECONDS, REGISTRY
+from utils.time_kst import now_kst, KST
 from repo.settings_repo import get_settings
+from repo.backup_repo import (
+    upsert_backup_entry,
+    insert_legacy_backup_entry,
+    record_backup_skip,
+    mark_backup_verified,
+    has_backup,
+    list_backup_entries,
+    list_snapshots_for_month,
+    list_expired_backups,
+    mark_backups_deleted,
+)
 
 
 # 기본값: ./data/backups
@@ -22,75 +40,83 @@ def _backup_dir() -> Path:
     return d
 
 
-def _marker_path() -> Path:
-    return _backup_dir() / ".last_backup_date"
+# 카탈로그 도입 전 상태 파일(1회 이관 후 삭제)
+_LEGACY_MARKERS = (".last_backup_date", ".last_monthly_archive_ym")
 
 
-def _monthly_marker_path() -> Path:
-    return _backup_dir() / ".last_monthly_archive_ym"
-
-def _read_last_monthly_archive_ym() -> str:
-    try:
-        return _monthly_marker_path().read_text(encoding="utf-8").strip()
-    except Exception:
-        return ""
-
-def _write_last_monthly_archive_ym(ym: str) -> None:
-    try:
-        _monthly_marker_path().write_text(ym, encoding="utf-8")
-    except Exception:
-        pass
-
-
-def _read_last_backup_date() -> str:
-    try:
-        return _marker_path().read_text(encoding="utf-8").strip()
-    except Exception:
-        return ""
-
-
-def _write_last_backup_date(date_text: str) -> None:
-    try:
-        _marker_path().write_text(date_text, encoding="utf-8")
-    except Exception:
-        pass
-
-
-def _cleanup_old_backups(keep_days: int = 60) -> None:
+def migrate_legacy_backup_state(conn: sqlite3.Connection) -> None:
     """
-    오래된 백업 파일 정리(기본 60일 보관).
+    (1회) 카탈로그 도입 전 백업 파일/마커 파일을 backup_catalog로 이관.
+    - 마커 파일이 남아있을 때만 디렉터리를 한 번 훑고, 끝나면 마커를 지운다.
+    - 이후 목록/정리/스케줄 판단은 카탈로그 조회만 사용(디렉터리 스캔 X)
     """
     d = _backup_dir()
-    cutoff = now_kst().dt - timedelta(days=keep_days)
+    markers = [d / name for name in _LEGACY_MARKERS]
+    if not any(p.exists() for p in markers):
+        return
 
-    for p in d.glob("inventory_backup_*.db"):
-        m = re.search(r"inventory_backup_(\d{4}-\d{2}-\d{2})\.db$", p.name)
-        if not m:
+    for p in d.glob("inventory_backup_*"):
+        m = re.fullmatch(r"inventory_backup_(\d{4}-\d{2}(?:-\d{2})?)\.(db|zip)", p.name)
+        if not m or not p.is_file():
             continue
+        key, ext = m.group(1), m.group(2)
+        if ext == "db":
+            kind = "daily"
+        elif len(key) == 7:
+            kind = "monthly_zip"
+        else:
+            kind = "upload_zip"
+        st = p.stat()
+        dt = datetime.fromtimestamp(st.st_mtime, KST)
+        insert_legacy_backup_entry(
+            conn, p.name, kind, key, st.st_size,
+            dt.strftime("%Y/%m/%d %H:%M:%S"), int(st.st_mtime),
+        )
+    conn.commit()
+
+    # 마커가 '처리 완료'라고 기록해 둔 회차는 파일이 없어도 완료로 남김(중복 실행 방지)
+    k = now_kst()
+    for p, kind, fmt in (
+        (markers[0], "daily", "inventory_backup_{}.db"),
+        (markers[1], "monthly_zip", "inventory_backup_{}.zip"),
+    ):
+        try:
+            key = p.read_text(encoding="utf-8").strip()
+        except Exception:
+            key = ""
+        if key and not has_backup(conn, kind, key):
+            record_backup_skip(conn, fmt.format(key), kind, key, "이전 마커 파일에서 이관", k.kst_text, k.epoch)
+
+    for p in markers:
         try:
-            dt = datetime.strptime(m.group(1), "%Y-%m-%d")
-            if dt < cutoff.replace(tzinfo=None):
-                p.unlink(missing_ok=True)
+            p.unlink(missing_ok=True)
         except Exception:
             pass
 
-    for p in d.glob("inventory_backup_*.zip"):
-        m = re.search(r"inventory_backup_(\d{4}-\d{2}-\d{2})\.zip$", p.name)
-        if not m:
-            continue
+
+def _cleanup_old_backups(conn: sqlite3.Connection, keep_days: int = 60) -> None:
+    """
+    오래된 백업 파일 정리(기본 60일 보관, 월간 ZIP은 보관).
+    대상은 카탈로그 인덱스로 조회하고, 지운 파일은 deleted_at_epoch로 표시.
+    """
+    d = _backup_dir()
+    k = now_kst()
+    cutoff_epoch = int((k.dt - timedelta(days=keep_days)).timestamp())
+
+    removed: list[int] = []
+    for e in list_expired_backups(conn, cutoff_epoch):
         try:
-            dt = datetime.strptime(m.group(1), "%Y-%m-%d")
-            if dt < cutoff.replace(tzinfo=None):
-                p.unlink(missing_ok=True)
+            (d / str(e["file_name"])).unlink(missing_ok=True)
+            removed.append(int(e["id"]))
         except Exception:
             pass
+    mark_backups_deleted(conn, removed, k.epoch)
 
 
-def _make_zip(db_path: Path) -> Path:
-    zip_path = db_path.with_suffix(".zip")
+def _zip_files(files: list[Path], zip_path: Path) -> None:
     with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.write(db_path, arcname=db_path.name)
-    return zip_path
+        for p in files:
+            zf.write(p, arcname=p.name)
 
 
 async def _get_alert_channel(client, guild: discord.Guild):
@@ -103,9 +129,27 @@ async def _get_alert_channel(client, guild: discord.Guild):
     return ch if isinstance(ch, discord.TextChannel) else None
 
 
-def do_backup_sqlite(src_conn: sqlite3.Connection, target_path: Path) -> None:
+# 검증 시 원본과 행 수를 비교할 테이블
+_VERIFY_TABLES = ("items", "movements", "categories")
+
+
+def _verify_max_bytes_per_sec() -> int:
+    """검증 단계 읽기 속도 상한(BACKUP_VERIFY_MAX_MBPS, 기본 16MB/s, 0이면 제한 없음)."""
+    try:
+        mbps = float(os.environ.get("BACKUP_VERIFY_MAX_MBPS", "16"))
+    except ValueError:
+        mbps = 16.0
+    return int(mbps * 1024 * 1024) if mbps > 0 else 0
+
+
+def _source_counts(conn: sqlite3.Connection) -> dict[str, int]:
+    return {t: int(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]) for t in _VERIFY_TABLES}
+
+
+def do_backup_sqlite(src_conn: sqlite3.Connection, target_path: Path) -> dict[str, int]:
     """
     sqlite3 백업 API로 안전하게 스냅샷 생성.
+    반환값: 스냅샷 시점의 원본 행 수(items/movements/categories) - 검증 단계 비교용
     """
     # 혹시 모를 flush
     try:
@@ -113,19 +157,224 @@ def do_backup_sqlite(src_conn: sqlite3.Connection, target_path: Path) -> None:
     except Exception:
         pass
 
+    # 같은 커넥션에서 백업 직전에 세므로(중간에 끼어드는 쓰기 없음) 스냅샷과 시점이 같다
+    counts = _source_counts(src_conn)
+
     dst_conn = sqlite3.connect(str(target_path))
     try:
         src_conn.backup(dst_conn)  # 온라인 백업
+        # 원본이 WAL이면 백업본도 WAL 헤더를 물려받음 → 단일 파일로 되돌려 -wal/-shm 안 생기게
+        dst_conn.execute("PRAGMA journal_mode = DELETE;")
         dst_conn.commit()
     finally:
         dst_conn.close()
+    return counts
+
+
+def verify_backup_file(path: Path, expected_counts: dict[str, int] | None, max_bytes_per_sec: int = 0) -> dict:
+    """
+    (워커 스레드 전용) 백업 파일 검증. 공유 커넥션은 사용하지 않는다.
+    1) sha256 계산 - max_bytes_per_sec로 읽기 속도 제한
+    2) 읽기 전용(mode=ro)으로 열어서 PRAGMA quick_check
+    3) items/movements/categories 행 수를 스냅샷 시점 원본과 비교
+    - 1)에서 파일을 한 번 읽어두므로 2), 3)은 대부분 OS 캐시에서 읽힌다.
+    - .zip이면 2), 3) 대신 ZIP CRC 검사(testzip)
+    - .gz(길드 내보내기)면 끝까지 풀어보면서 테이블별 행 수를 내보낼 때 센 값과 비교
+
+    returns {"status": "ok"|"failed", "detail": str, "sha256": str, "size_bytes": int}
+    """
+    size = path.stat().st_size
+
+    h = hashlib.sha256()
+    started = time.monotonic()
+    done = 0
+    with open(path, "rb") as f:
+        while True:
+            buf = f.read(1024 * 1024)
+            if not buf:
+                break
+            h.update(buf)
+            done += len(buf)
+            if max_bytes_per_sec > 0:
+                ahead = done / max_bytes_per_sec - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    problems: list[str] = []
+    if path.suffix == ".zip":
+        try:
+            with zipfile.ZipFile(path) as zf:
+                bad = zf.testzip()
+            if bad:
+                problems.append(f"ZIP CRC 오류: {bad}")
+        except zipfile.BadZipFile as e:
+            problems.append(f"BadZipFile: {e}")
+        return {
+            "status": "failed" if problems else "ok",
+            "detail": " / ".join(problems),
+            "sha256": h.hexdigest(),
+            "size_bytes": size,
+        }
+
+    expected_counts = expected_counts or {}
+    if path.suffix == ".gz":
+        try:
+            got_counts = count_export_rows(path)
+            for t, want in expected_counts.items():
+                if int(got_counts.get(t, 0)) != int(want):
+                    problems.append(f"{t} 행 수 불일치(내보내기 {want} / 파일 {got_counts.get(t, 0)})")
+        except Exception as e:
+            problems.append(f"{type(e).__name__}: {e}")
+        return {
+            "status": "failed" if problems else "ok",
+            "detail": " / ".join(problems),
+            "sha256": h.hexdigest(),
+            "size_bytes": size,
+        }
+
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        conn.execute("PRAGMA cache_size = -2048;")  # 검증용 커넥션은 캐시 작게
+        qc = [str(r[0]) for r in conn.execute("PRAGMA quick_check;").fetchall()]
+        if qc != ["ok"]:
+            problems.append("quick_check: " + "; ".join(qc[:3]))
+
+        for t in _VERIFY_TABLES:
+            want = expected_counts.get(t)
+            got = int(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0])
+            if want is not None and got != int(want):
+                problems.append(f"{t} 행 수 불일치(원본 {want} / 백업 {got})")
+    except sqlite3.DatabaseError as e:
+        problems.append(f"{type(e).__name__}: {e}")
+    finally:
+        conn.close()
+
+    return {
+        "status": "failed" if problems else "ok",
+        "detail": " / ".join(problems),
+        "sha256": h.hexdigest(),
+        "size_bytes": size,
+    }
+
+
+# 진행 중인 검증 task 참조(GC 방지) + 검증은 한 번에 하나씩(디스크 대역폭 보호)
+_verify_tasks: set[asyncio.Task] = set()
+REGISTRY.gauge("inventory_backup_verify_pending", "검증 대기/진행 중인 백업 수").set_function(lambda: len(_verify_tasks))
+_verify_lock: asyncio.Lock | None = None
+
+
+async def _verify_in_background(
+    client,
+    guild: discord.Guild | None,
+    backup_id: int,
+    db_file: Path,
+    counts: dict[str, int] | None,
+) -> None:
+    global _verify_lock
+    if _verify_lock is None:
+        _verify_lock = asyncio.Lock()
+
+    async with _verify_lock:
+        try:
+            res = await asyncio.to_thread(verify_backup_file, db_file, counts, _verify_max_bytes_per_sec())
+        except Exception as e:
+            res = {"status": "failed", "detail": f"{type(e).__name__}: {e}", "sha256": "", "size_bytes": 0}
+
+    try:
+        mark_backup_verified(
+            client.conn, backup_id,
+            res["status"], res["detail"], res["sha256"], res["size_bytes"],
+            now_kst().epoch,
+        )
+    except Exception as e:
+        print("[BACKUP_VERIFY_ERROR]", repr(e))
+
+    if res["status"] != "ok":
+        BACKUP_FAILURES.inc("verify")
+        print(f"[BACKUP_VERIFY_FAILED] {db_file.name}: {res['detail']}")
+        ch = await _get_alert_channel(client, guild) if guild else None
+        if ch:
+            try:
+                await ch.send(f"⚠️ 백업 검증 실패: `{db_file.name}`\n- {res['detail']}")
+            except Exception:
+                pass
+
+
+def _catalog_and_verify(
+    client,
+    guild: discord.Guild | None,
+    db_file: Path,
+    kind: str,
+    counts: dict[str, int] | None,
+    snapshot_key: str,
+    guild_id: int | None = None,
+) -> int:
+    """
+    백업 파일을 카탈로그에 pending으로 기록하고, 검증은 백그라운드로 넘긴다(이벤트 루프 안 막음).
+    """
+    k = now_kst()
+    backup_id = upsert_backup_entry(
+        client.conn, db_file.name, kind, db_file.stat().st_size, counts, k.kst_text, k.epoch,
+        snapshot_key, guild_id,
+    )
+    task = asyncio.create_task(_verify_in_background(client, guild, backup_id, db_file, counts))
+    _verify_tasks.add(task)
+    task.add_done_callback(_verify_tasks.discard)
+    return backup_id
+
+
+# 디스코드 기본 업로드 제한(안전하게 8MB 기준)
+MAX_UPLOAD = 8 * 1024 * 1024
+
+
+def _observe_backup(kind: str, started: float, path: Path) -> None:
+    BACKUP_SECONDS.observe(time.perf_counter() - started, kind)
+    BACKUP_LAST_BYTES.set(path.stat().st_size, kind)
+    BACKUP_LAST_SUCCESS.set(time.time(), kind)
+
+
+def _snapshot_whole_db(client, today: str, kind: str) -> Path:
+    """
+    전체 DB 스냅샷(서버 보관용, 채널 업로드 X) + 카탈로그 기록/백그라운드 검증 + 보관기간 정리.
+    """
+    db_file = _backup_dir() / f"inventory_backup_{today}.db"
+    started = time.perf_counter()
+    try:
+        counts = do_backup_sqlite(client.conn, db_file)
+    except Exception:
+        BACKUP_FAILURES.inc("snapshot")
+        raise
+    _observe_backup("snapshot", started, db_file)
+    _catalog_and_verify(client, None, db_file, kind, counts, today)
+    _cleanup_old_backups(client.conn, keep_days=60)
+    cleanup_old_exports()
+    return db_file
+
+
+async def _export_guild_now(client, guild: discord.Guild, today: str) -> Path:
+    """
+    길드 1개만 내보내기(워커 스레드, 별도 읽기 전용 커넥션) + 카탈로그 기록/백그라운드 검증.
+    파일 크기는 전체 DB가 아니라 그 길드 데이터 크기에 비례.
+    """
+    export_file = _backup_dir() / f"inventory_guild_{guild.id}_{today}.jsonl.gz"
+    started = time.perf_counter()
+    try:
+        counts = await asyncio.to_thread(export_guild_file, database_path(client.conn), guild.id, export_file)
+    except Exception:
+        BACKUP_FAILURES.inc("guild_export")
+        raise
+    _observe_backup("guild_export", started, export_file)
+    _catalog_and_verify(client, guild, export_file, "guild_export", counts, today, guild.id)
+    return export_file
 
 
 async def run_daily_backup(client, guild: discord.Guild, hour: int = 18, minute: int = 40) -> None:
     """
-    ✅ 매일 (기본 18:40 KST) DB 백업 실행
+    ✅ 매일 (기본 18:40 KST) 백업 실행
     - 18:30 리포트 후 10분 뒤로 기본 설정
-    - 하루 1번만 수행(.last_backup_date로 중복 방지)
+    - 전체 DB 스냅샷: 서버에만 보관(하루 1번, 첫 길드 차례에 수행)
+    - 길드 내보내기: 길드마다 하루 1번, 이 파일만 해당 길드 채널에 업로드(다른 길드 데이터 X)
+    - 중복 방지: 카탈로그에 오늘자 daily / 길드별 guild_export가 있으면 건너뜀
     """
     k = now_kst()
     dt = k.dt
@@ -135,101 +384,104 @@ async def run_daily_backup(client, guild: discord.Guild, hour: int = 18, minute:
     if dt < scheduled:
         return
 
-    if _read_last_backup_date() == today:
-        return
-
-    d = _backup_dir()
-    db_file = d / f"inventory_backup_{today}.db"
+    if not has_backup(client.conn, "daily", today):
+        _snapshot_whole_db(client, today, "daily")
 
-    do_backup_sqlite(client.conn, db_file)
+    if has_backup(client.conn, "guild_export", today, guild.id):
+        return
 
-    # 정리
-    _cleanup_old_backups(keep_days=60)
+    export_file = await _export_guild_now(client, guild, today)
 
     # 알림 채널에 결과만 남기기(파일 업로드는 용량 안전할 때만)
     ch = await _get_alert_channel(client, guild)
     if ch:
-        size = db_file.stat().st_size
+        size = export_file.stat().st_size
         size_mb = size / (1024 * 1024)
 
-        # 디스코드 기본 업로드 제한(안전하게 8MB 기준)
-        MAX_UPLOAD = 8 * 1024 * 1024
-
-        # zip 만들어서 더 작아지면 올리기 시도
-        zip_path = _make_zip(db_file)
-        zip_size = zip_path.stat().st_size
-
-        if zip_size <= MAX_UPLOAD:
+        if size <= MAX_UPLOAD:
             await ch.send(
-                content=f"🗄️ DB 백업 완료 ({today})",
-                file=discord.File(fp=str(zip_path), filename=zip_path.name),
+                content=f"🗄️ 서버 데이터 백업 완료 ({today})",
+                file=discord.File(fp=str(export_file), filename=export_file.name),
             )
         else:
             await ch.send(
-                f"🗄️ DB 백업 완료 ({today})\n"
-                f"- 파일: `{db_file.name}` ({size_mb:.2f}MB)\n"
-                f"- zip이 8MB를 초과해서 채널 업로드는 생략했어요. (서버에 저장됨)"
+                f"🗄️ 서버 데이터 백업 완료 ({today})\n"
+                f"- 파일: `{export_file.name}` ({size_mb:.2f}MB)\n"
+                f"- 8MB를 초과해서 채널 업로드는 생략했어요. (서버에 저장됨)"
             )
 
-    _write_last_backup_date(today)
-
 
 async def force_backup_now(client, guild: discord.Guild) -> tuple[bool, str]:
     """
     ✅ 관리자 수동 백업: 지금 즉시 백업 생성 + (가능하면) 업로드
+    - 전체 DB 스냅샷은 서버에만 저장, 채널에는 이 길드 내보내기 파일만 업로드
     """
     k = now_kst()
     dt = k.dt
     today = dt.strftime("%Y-%m-%d")
 
-    d = _backup_dir()
-    db_file = d / f"inventory_backup_{today}.db"
-
-    do_backup_sqlite(client.conn, db_file)
-    _cleanup_old_backups(keep_days=60)
+    _snapshot_whole_db(client, today, "manual")
+    export_file = await _export_guild_now(client, guild, today)
 
     ch = await _get_alert_channel(client, guild)
     if not ch:
         return False, "리포트/알림 채널이 미설정이라 업로드는 못 했어요. 서버에 백업 파일은 저장됐어요."
 
-    MAX_UPLOAD = 8 * 1024 * 1024
-    zip_path = _make_zip(db_file)
-
-    if zip_path.stat().st_size <= MAX_UPLOAD:
+    size = export_file.stat().st_size
+    if size <= MAX_UPLOAD:
         await ch.send(
-            content=f"🗄️ (수동) DB 백업 완료 ({today})",
-            file=discord.File(fp=str(zip_path), filename=zip_path.name),
+            content=f"🗄️ (수동) 서버 데이터 백업 완료 ({today})",
+            file=discord.File(fp=str(export_file), filename=export_file.name),
         )
         return True, "채널 업로드까지 완료했어요."
     else:
-        size_mb = db_file.stat().st_size / (1024 * 1024)
+        size_mb = size / (1024 * 1024)
         await ch.send(
-            f"🗄️ (수동) DB 백업 완료 ({today})\n"
-            f"- 파일: `{db_file.name}` ({size_mb:.2f}MB)\n"
-            f"- zip이 8MB를 초과해서 채널 업로드는 생략했어요. (서버에 저장됨)"
+            f"🗄️ (수동) 서버 데이터 백업 완료 ({today})\n"
+            f"- 파일: `{export_file.name}` ({size_mb:.2f}MB)\n"
+            f"- 8MB를 초과해서 채널 업로드는 생략했어요. (서버에 저장됨)"
         )
         return True, "백업은 했고, 용량 때문에 채널 업로드는 생략됐어요."
 
 
-def list_backup_files(limit: int = 20) -> list[tuple[str, float, float]]:
+def list_backup_files(conn: sqlite3.Connection, limit: int = 20, guild_id: int | None = None) -> list[dict]:
     """
-    returns [(filename, size_mb, mtime_epoch), ...] newest first
+    카탈로그 기준 백업 파일 목록(최신순). 디렉터리 스캔 없음.
+    guild_id를 주면 다른 길드의 내보내기 파일은 빠진다.
+    returns [{file_name, kind, size_bytes, verify_status, ...}, ...]
     """
+    return list_backup_entries(conn, limit=max(1, min(limit, 50)), guild_id=guild_id)
+
+
+async def _archive_whole_db_month(client, ym: str) -> None:
+    """(서버 보관용) 지난달 전체 DB 일일 스냅샷 ZIP. 채널 업로드 X, 월 1번."""
+    k = now_kst()
     d = _backup_dir()
-    files = []
-    for p in d.glob("inventory_backup_*"):
-        if p.is_file():
-            size_mb = p.stat().st_size / (1024 * 1024)
-            files.append((p.name, size_mb, p.stat().st_mtime))
-    files.sort(key=lambda x: x[2], reverse=True)
-    return files[:max(1, min(limit, 50))]
+    db_files = [d / str(e["file_name"]) for e in list_snapshots_for_month(client.conn, ym)]
+    db_files = [p for p in db_files if p.is_file()]
+
+    zip_path = d / f"inventory_backup_{ym}.zip"
+    if not db_files:
+        record_backup_skip(
+            client.conn, zip_path.name, "monthly_zip", ym,
+            "해당 월 일일 백업 없음", k.kst_text, k.epoch,
+        )
+        return
+
+    try:
+        await asyncio.to_thread(_zip_files, db_files, zip_path)
+    except Exception as e:
+        print("[MONTHLY_ARCHIVE_ERROR]", repr(e))
+        return
+    _catalog_and_verify(client, None, zip_path, "monthly_zip", None, ym)
 
 
 async def run_monthly_archive(client, guild: discord.Guild, hour: int = 18, minute: int = 50) -> None:
     """
     ✅ 매달 1일 (기본 18:50 KST) 에 '지난달 백업들'을 ZIP로 묶어 업로드 시도
     - 1일로 하는 이유: 월말에 서버가 꺼져도 다음날(1일) 살아나면 처리 가능
-    - 중복 업로드 방지: .last_monthly_archive_ym
+    - 길드 채널에는 그 길드 내보내기 파일 ZIP만 올림(전체 DB ZIP은 서버 보관)
+    - 중복 업로드 방지: 카탈로그에 해당 월 monthly_zip(전체/길드별)이 있으면 건너뜀
     """
     k = now_kst()
     dt = k.dt
@@ -246,29 +498,34 @@ async def run_monthly_archive(client, guild: discord.Guild, hour: int = 18, minu
     prev_month_dt = (dt.replace(day=1) - timedelta(days=1))
     ym = prev_month_dt.strftime("%Y-%m")
 
-    if _read_last_monthly_archive_ym() == ym:
+    if not has_backup(client.conn, "monthly_zip", ym):
+        await _archive_whole_db_month(client, ym)
+
+    if has_backup(client.conn, "monthly_zip", ym, guild.id):
         return
 
     d = _backup_dir()
 
-    # 지난달의 일일 백업(.db)만 모아서 zip 만들기
-    # 파일명: inventory_backup_YYYY-MM-DD.db
-    prefix = f"inventory_backup_{ym}-"  # 예: inventory_backup_2026-01-
-    db_files = sorted([p for p in d.glob(f"{prefix}*.db") if p.is_file()])
+    # 지난달의 이 길드 일일 내보내기만 모아서 zip 만들기(카탈로그 조회)
+    entries = list_snapshots_for_month(client.conn, ym, kinds=("guild_export",), guild_id=guild.id)
+    files = [d / str(e["file_name"]) for e in entries]
+    files = [p for p in files if p.is_file()]
+
+    zip_path = d / f"inventory_guild_{guild.id}_{ym}.zip"
 
     # 없으면 종료(아직 백업이 없거나 파일 규칙 변경 등)
-    if not db_files:
+    if not files:
         ch = await _get_alert_channel(client, guild)
         if ch:
             await ch.send(f"📦 월간 백업 ZIP 생성 시도({ym}) → 해당 월의 일일 백업 파일이 없어서 건너뛰었어요.")
-        _write_last_monthly_archive_ym(ym)
+        record_backup_skip(
+            client.conn, zip_path.name, "monthly_zip", ym,
+            "해당 월 일일 백업 없음", k.kst_text, k.epoch, guild.id,
+        )
         return
 
-    zip_path = d / f"inventory_backup_{ym}.zip"
     try:
-        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for p in db_files:
-                zf.write(p, arcname=p.name)
+        await asyncio.to_thread(_zip_files, files, zip_path)
     except Exception:
         # zip 생성 실패
         ch = await _get_alert_channel(client, guild)
@@ -276,23 +533,22 @@ async def run_monthly_archive(client, guild: discord.Guild, hour: int = 18, minu
             await ch.send(f"📦 월간 백업 ZIP 생성 실패({ym})")
         return
 
+    _catalog_and_verify(client, guild, zip_path, "monthly_zip", None, ym, guild.id)
+
     # 업로드 시도(8MB 기준)
     ch = await _get_alert_channel(client, guild)
     if ch:
-        MAX_UPLOAD = 8 * 1024 * 1024
         zsize = zip_path.stat().st_size
         zmb = zsize / (1024 * 1024)
 
         if zsize <= MAX_UPLOAD:
             await ch.send(
-                content=f"📦 월간 DB 백업 ZIP ({ym})",
+                content=f"📦 월간 백업 ZIP ({ym})",
                 file=discord.File(fp=str(zip_path), filename=zip_path.name),
             )
         else:
             await ch.send(
-                f"📦 월간 DB 백업 ZIP 생성 완료({ym})\n"
+                f"📦 월간 백업 ZIP 생성 완료({ym})\n"
                 f"- 파일: `{zip_path.name}` ({zmb:.2f}MB)\n"
                 f"- 8MB 초과로 채널 업로드는 생략했어요. (서버에 저장됨)"
             )
-
-    _write_last_monthly_archive_ym(ym)
@@ -1,18 +1,383 @@
 # src/db.py
 from __future__ import annotations
 
+import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Callable, Iterator
 
 
-def connect(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+# 커넥션 튜닝 프로필(DB_PROFILE). 개별 값은 DB_SYNCHRONOUS 등 환경변수로 덮어쓸 수 있음
+# - baseline: 예전 동작(foreign_keys + WAL만, 나머지는 SQLite 기본값)
+# - safe: 커밋마다 fsync(FULL), 메모리 적게
+# - balanced(기본): WAL + synchronous=NORMAL(전원 꺼지면 마지막 커밋 몇 개만 잃을 수 있음, DB 손상은 없음)
+# - fast: balanced + 캐시/mmap 크게, 체크포인트 간격 넓게
+# 수치는 bench/bench_db_profiles.py 로 비교
+DB_PROFILES: dict[str, dict[str, object]] = {
+    "baseline": {},
+    "safe": {
+        "synchronous": "FULL",
+        "cache_size": -8000,          # KiB 단위(음수) → 8MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 1000,
+    },
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -32000,         # 32MB
+        "mmap_size": 128 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 1000,
+    },
+    "fast": {
+        "synchronous": "NORMAL",
+        "cache_size": -65536,         # 64MB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 4000,
+    },
+}
+
+DEFAULT_DB_PROFILE = "balanced"
+
+# PRAGMA 이름 → 덮어쓰기 환경변수
+_PRAGMA_ENV = {
+    "synchronous": "DB_SYNCHRONOUS",
+    "cache_size": "DB_CACHE_SIZE",
+    "mmap_size": "DB_MMAP_SIZE",
+    "temp_store": "DB_TEMP_STORE",
+    "busy_timeout": "DB_BUSY_TIMEOUT_MS",
+    "wal_autocheckpoint": "DB_WAL_AUTOCHECKPOINT",
+}
+
+
+def resolve_db_profile(name: str | None = None) -> dict[str, object]:
+    """프로필 + 환경변수 덮어쓰기 → 실제 적용할 PRAGMA 값."""
+    name = (name or os.environ.get("DB_PROFILE") or DEFAULT_DB_PROFILE).strip().lower()
+    if name not in DB_PROFILES:
+        print(f"[DB] unknown DB_PROFILE={name!r}, using {DEFAULT_DB_PROFILE}")
+        name = DEFAULT_DB_PROFILE
+    values = dict(DB_PROFILES[name])
+    for pragma, env in _PRAGMA_ENV.items():
+        v = os.environ.get(env)
+        if v is not None and v.strip() != "":
+            values[pragma] = v.strip()
+    return values
+
+
+def apply_db_profile(conn: sqlite3.Connection, profile: dict[str, object]) -> None:
+    for pragma, value in profile.items():
+        conn.execute(f"PRAGMA {pragma} = {value};")
+
+
+def statement_cache_size() -> int:
+    """
+    커넥션별 준비된 문장(prepared statement) 캐시 크기. 파이썬 기본값은 128.
+    repo 전체의 SQL 문이 150개 안팎(동적으로 만드는 문장 포함)이라 넉넉하게 256 - 캐시에서 밀려나면 매번 다시 파싱함
+    """
+    try:
+        return max(0, int(os.environ.get("DB_STATEMENT_CACHE", "256")))
+    except ValueError:
+        return 256
+
+
+# ---- 쿼리 관찰(계측/프로파일링용) ----
+# observer(event, sql, seconds, rows)
+# - event: "execute" | "executemany" | "fetch" | "commit"
+# - rows: fetch면 가져온 행 수, executemany면 파라미터 묶음 수, 나머지는 -1
+# 관찰자가 없으면 시간 측정 없이 바로 원래 메서드 호출
+QueryObserver = Callable[[str, str, float, int], None]
+_QUERY_OBSERVERS: list[QueryObserver] = []
+
+
+def add_query_observer(fn: QueryObserver) -> None:
+    if fn not in _QUERY_OBSERVERS:
+        _QUERY_OBSERVERS.append(fn)
+
+
+def remove_query_observer(fn: QueryObserver) -> None:
+    if fn in _QUERY_OBSERVERS:
+        _QUERY_OBSERVERS.remove(fn)
+
+
+def _notify(event: str, sql: str, seconds: float, rows: int) -> None:
+    for fn in tuple(_QUERY_OBSERVERS):
+        try:
+            fn(event, sql, seconds, rows)
+        except Exception as e:
+            print("[DB_OBSERVER_ERROR]", repr(e))
+
+
+class ObservedCursor(sqlite3.Cursor):
+    _obs_sql = ""
+
+    def execute(self, sql: str, parameters: Any = (), /):
+        if not _QUERY_OBSERVERS:
+            return super().execute(sql, parameters)
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._obs_sql = sql
+            _notify("execute", sql, time.perf_counter() - t0, -1)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /):
+        if not _QUERY_OBSERVERS:
+            return super().executemany(sql, seq_of_parameters)
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._obs_sql = sql
+            _notify("executemany", sql, time.perf_counter() - t0, len(seq_of_parameters))
+
+    def fetchone(self):
+        if not _QUERY_OBSERVERS:
+            return super().fetchone()
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        _notify("fetch", self._obs_sql, time.perf_counter() - t0, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size: int | None = None):
+        if not _QUERY_OBSERVERS:
+            return super().fetchmany(self.arraysize if size is None else size)
+        t0 = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        _notify("fetch", self._obs_sql, time.perf_counter() - t0, len(rows))
+        return rows
+
+    def fetchall(self):
+        if not _QUERY_OBSERVERS:
+            return super().fetchall()
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        _notify("fetch", self._obs_sql, time.perf_counter() - t0, len(rows))
+        return rows
+
+
+class ObservedConnection(sqlite3.Connection):
+    """봇/읽기 풀 커넥션 클래스. 관찰자가 등록돼 있을 때만 쿼리 시간/행 수를 알려줌."""
+
+    def cursor(self, factory: type = ObservedCursor):  # type: ignore[override]
+        return super().cursor(factory)
+
+    # C 구현의 Connection.execute는 self.cursor()를 거치지 않고 기본 Cursor를 만듦
+    # → 관찰 중일 때만 ObservedCursor로 실행(fetch 시간/행 수까지 잡히게)
+    def execute(self, sql: str, parameters: Any = (), /):
+        if not _QUERY_OBSERVERS:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /):
+        if not _QUERY_OBSERVERS:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        if not _QUERY_OBSERVERS or not self.in_transaction:
+            return super().commit()
+        t0 = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            _notify("commit", "COMMIT", time.perf_counter() - t0, -1)
+
+
+def connect(db_path: str, profile: str | None = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, cached_statements=statement_cache_size(), factory=ObservedConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("PRAGMA journal_mode = WAL;")
+    apply_db_profile(conn, resolve_db_profile(profile))
     return conn
 
 
+# ---- 읽기 전용 커넥션 풀 ----
+# WAL에서는 읽기가 쓰기를 기다리지 않음 → 보고서/검색/목록은 풀에서 읽고, bot.conn은 쓰기 전용처럼 비워둠.
+# 풀 커넥션은 check_same_thread=False라 워커 스레드(asyncio.to_thread)에서도 사용 가능
+# (한 번에 한 스레드만 쓰도록 큐에서 빌려 쓰고 돌려줌).
+
+
+class ReadPool:
+    def __init__(self, db_path: str, size: int):
+        self.db_path = db_path
+        self.owner_thread = threading.get_ident()  # 쓰기 커넥션을 쓰는 스레드(이벤트 루프)
+        self.size = max(1, int(size))
+        self._free: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        self._waiting = 0  # 빌릴 커넥션이 없어 기다리는 스레드 수(지표용)
+        self._waiting_lock = threading.Lock()
+        for _ in range(self.size):
+            c = self._open()
+            self._all.append(c)
+            self._free.put(c)
+
+    def _open(self) -> sqlite3.Connection:
+        c = sqlite3.connect(
+            f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=statement_cache_size(),
+            factory=ObservedConnection,
+        )
+        c.row_factory = sqlite3.Row
+        c.execute("PRAGMA query_only = ON;")
+        profile = resolve_db_profile()
+        profile.pop("wal_autocheckpoint", None)  # 읽기 커넥션은 체크포인트 안 함
+        apply_db_profile(c, profile)
+        return c
+
+    @contextmanager
+    def connection(self, block: bool = True) -> Iterator[sqlite3.Connection | None]:
+        """
+        빈 커넥션 빌리기.
+        - block=False(이벤트 루프 스레드): 없으면 기다리지 않고 None → 호출 쪽이 쓰기 커넥션으로 읽음
+        - block=True(워커 스레드): DB_READ_POOL_WAIT_SEC(기본 30초)까지 기다리고 넘으면 TimeoutError
+        """
+        try:
+            c = self._free.get_nowait()
+        except queue.Empty:
+            if not block:
+                yield None
+                return
+            with self._waiting_lock:
+                self._waiting += 1
+            try:
+                c = self._free.get(timeout=_read_pool_wait_sec())
+            except queue.Empty:
+                raise TimeoutError(f"읽기 커넥션을 {_read_pool_wait_sec():g}초 안에 못 빌렸어요(풀 {self.size}개 사용 중).") from None
+            finally:
+                with self._waiting_lock:
+                    self._waiting -= 1
+        try:
+            yield c
+        finally:
+            if c.in_transaction:
+                c.rollback()
+            self._free.put(c)
+
+    def stats(self) -> dict[str, int]:
+        return {"size": self.size, "in_use": self.size - self._free.qsize(), "waiting": self._waiting}
+
+    def close(self) -> None:
+        for c in self._all:
+            c.close()
+        self._all.clear()
+
+
+# 쓰기 커넥션(id) → 그 DB의 읽기 풀
+_READ_POOLS: dict[int, ReadPool] = {}
+
+
+def _read_pool_size() -> int:
+    try:
+        return int(os.environ.get("DB_READ_POOL_SIZE", "4"))
+    except ValueError:
+        return 4
+
+
+def _read_pool_wait_sec() -> float:
+    try:
+        return max(0.1, float(os.environ.get("DB_READ_POOL_WAIT_SEC", "30")))
+    except ValueError:
+        return 30.0
+
+
+def attach_read_pool(conn: sqlite3.Connection, size: int | None = None) -> ReadPool | None:
+    """
+    쓰기 커넥션에 읽기 풀을 붙임(main에서 1회). 메모리 DB이거나 DB_READ_POOL_SIZE=0이면 풀 없음.
+    """
+    size = _read_pool_size() if size is None else int(size)
+    db_file = database_path(conn)
+    if size <= 0 or not db_file:
+        return None
+    close_read_pool(conn)
+    pool = ReadPool(db_file, size)
+    _READ_POOLS[id(conn)] = pool
+    return pool
+
+
+def close_read_pool(conn: sqlite3.Connection) -> None:
+    pool = _READ_POOLS.pop(id(conn), None)
+    if pool:
+        pool.close()
+
+
+def has_read_pool(conn: sqlite3.Connection) -> bool:
+    return id(conn) in _READ_POOLS
+
+
+def read_pool_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    """읽기 풀 크기/사용 중/대기 중(풀이 없으면 전부 0)."""
+    pool = _READ_POOLS.get(id(conn))
+    return pool.stats() if pool else {"size": 0, "in_use": 0, "waiting": 0}
+
+
+@contextmanager
+def read_conn(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    읽기용 커넥션 빌리기.
+    - 풀이 없으면(CLI/메모리 DB) conn 그대로
+    - 이벤트 루프 스레드에서 쓰기 트랜잭션 도중이면(커밋 안 된 변경을 봐야 함) conn 그대로
+    - 이벤트 루프 스레드는 풀이 다 쓰이고 있으면 기다리지 않고 conn 그대로(루프가 멈추지 않게),
+      워커 스레드만 빈 커넥션을 기다림(시간 제한 있음)
+    """
+    pool = _READ_POOLS.get(id(conn))
+    if pool is None:
+        yield conn
+        return
+    on_owner = threading.get_ident() == pool.owner_thread
+    if on_owner and conn.in_transaction:
+        yield conn
+        return
+    with pool.connection(block=not on_owner) as rc:
+        yield conn if rc is None else rc
+
+
+def wal_checkpoint_truncate(db_path: str) -> tuple[int, int, int]:
+    """
+    (워커 스레드용) 별도 커넥션으로 WAL 체크포인트 후 WAL 파일을 0으로 줄임.
+    반환값: (busy, WAL 프레임 수, 체크포인트된 프레임 수) - busy=1이면 읽는 중인 커넥션 때문에 일부만 처리
+    """
+    conn = sqlite3.connect(db_path, timeout=5.0)
+    try:
+        row = conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchone()
+        return int(row[0]), int(row[1]), int(row[2])
+    finally:
+        conn.close()
+
+
+def database_path(conn: sqlite3.Connection) -> str:
+    """커넥션이 열고 있는 main DB 파일 경로(메모리 DB면 빈 문자열)."""
+    for row in conn.execute("PRAGMA database_list;").fetchall():
+        if row[1] == "main":
+            return str(row[2] or "")
+    return ""
+
+
+def incremental_vacuum_step(conn: sqlite3.Connection, pages: int) -> int:
+    """
+    빈 페이지를 최대 pages개만 파일에서 반환(auto_vacuum=INCREMENTAL일 때만 효과).
+    반환값: 남은 freelist 페이지 수(INCREMENTAL이 아니면 0 → 호출 쪽 반복 종료)
+    """
+    if int(conn.execute("PRAGMA auto_vacuum;").fetchone()[0]) != 2:
+        return 0
+    conn.commit()
+    # execute()로는 sqlite3_step이 한 번만 돌아서 1페이지만 반환됨 → executescript로 끝까지 실행
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    return int(conn.execute("PRAGMA freelist_count;").fetchone()[0])
+
+
 def _is_ignorable_schema_error(e: sqlite3.OperationalError) -> bool:
     msg = str(e).lower()
     return (
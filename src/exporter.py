@@ -0,0 +1,285 @@
+# src/exporter.py
+"""
+길드 전체 내보내기(품목 / 카테고리 / 입출고 기록) - CSV(gzip) 또는 Parquet(pyarrow 설치 시).
+
+- 커서에서 EXPORT_BATCH_ROWS(기본 5000)행씩 읽어 바로 파일에 씀 → 기록이 수백만 건이어도 메모리 일정
+- 입출고 기록은 운영 테이블 + 분기 정리로 옮겨진 보관 파일까지(id 순, 옮기는 도중 중복 제거)
+- items 파일은 /품목가져오기(importer.py)로 그대로 다시 넣을 수 있음(영문 헤더, .csv.gz / .parquet)
+- Parquet: 열 단위 압축(zstd)이라 CSV보다 작고 pandas/duckdb에서 바로 읽힘. pyarrow 없으면 CSV만
+- 읽기 풀이 있으면 워커 스레드에서 실행(bot.conn은 건드리지 않음)
+- 디스코드에 올린 폴더는 바로 지우고, 남은 폴더(8MB 초과로 서버에만 저장 등)는
+  EXPORT_KEEP_DAYS(기본 7일) 지나면 정리(내보낼 때마다 + 일일 백업 때)
+
+CLI:
+  python src/exporter.py --guild 123                  # ./data/exports/guild_123_YYYYMMDD_HHMMSS/*.csv.gz
+  python src/exporter.py --guild 123 --format parquet --no-movements
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from archive import iter_archived_rows, movement_columns
+from db import has_read_pool, read_conn
+from utils.time_kst import KST
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성
+    pa = None
+    pq = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+FORMATS = ("csv", "parquet")
+
+# (열 이름, 타입) - 타입은 "int" / "text". 열 이름은 importer 헤더 별칭과 맞춤
+_ITEM_COLUMNS = [
+    ("item_id", "int"), ("category", "text"), ("name", "text"), ("code", "text"), ("qty", "int"),
+    ("warn_below", "int"), ("storage_location", "text"), ("note", "text"), ("is_active", "int"),
+    ("image_url", "text"), ("created_at", "text"), ("updated_at", "text"),
+]
+_ITEM_SQL = """
+    SELECT i.id, COALESCE(c.name, '기타'), i.name, i.code, i.qty,
+           i.warn_below, i.storage_location, i.note, i.is_active,
+           i.image_url, i.created_at, i.updated_at
+    FROM items i LEFT JOIN categories c ON c.id = i.category_id
+    WHERE i.guild_id = ?
+    ORDER BY i.id
+"""
+_CATEGORY_COLUMNS = [
+    ("category_id", "int"), ("name", "text"), ("is_active", "int"), ("sort_order", "int"),
+    ("created_at", "text"), ("updated_at", "text"),
+]
+_CATEGORY_SQL = """
+    SELECT id, name, is_active, sort_order, created_at, updated_at
+    FROM categories WHERE guild_id = ? ORDER BY id
+"""
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def _export_root() -> Path:
+    return Path(os.environ.get("EXPORT_DIR", "./data/exports"))
+
+
+def remove_export(out_dir: Path) -> None:
+    """업로드가 끝난 내보내기 폴더 삭제."""
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def export_keep_days() -> int:
+    return max(0, _env_int("EXPORT_KEEP_DAYS", 7))
+
+
+def cleanup_old_exports(keep_days: int | None = None) -> int:
+    """EXPORT_DIR 아래 keep_days(기본 EXPORT_KEEP_DAYS=7)보다 오래된 내보내기 폴더 삭제. 반환값: 지운 폴더 수."""
+    if keep_days is None:
+        keep_days = export_keep_days()
+    root = _export_root()
+    if not root.exists():
+        return 0
+    cutoff = time.time() - keep_days * 86400
+    n = 0
+    for p in root.glob("guild_*"):
+        try:
+            if p.is_dir() and p.stat().st_mtime < cutoff:
+                shutil.rmtree(p, ignore_errors=True)
+                n += 1
+        except OSError:
+            pass
+    if n:
+        print(f"[EXPORT] removed {n} old export dir(s) from {root}")
+    return n
+
+
+@dataclass
+class ExportResult:
+    guild_id: int
+    fmt: str
+    out_dir: Path
+    files: list[Path] = field(default_factory=list)
+    rows: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.files)
+
+
+class _CsvSink:
+    def __init__(self, path: Path, columns: list[tuple[str, str]]):
+        self.path = path.with_name(path.name + ".csv.gz")
+        self._f = gzip.open(self.path, "wt", encoding="utf-8", newline="", compresslevel=6)
+        self._w = csv.writer(self._f)
+        self._w.writerow([c[0] for c in columns])
+
+    def write(self, rows: list[tuple]) -> None:
+        self._w.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _ParquetSink:
+    """배치마다 row group 1개(메모리 = 배치 크기)."""
+
+    def __init__(self, path: Path, columns: list[tuple[str, str]]):
+        self.path = path.with_name(path.name + ".parquet")
+        self._schema = pa.schema([(n, pa.int64() if t == "int" else pa.string()) for n, t in columns])
+        self._w = pq.ParquetWriter(str(self.path), self._schema, compression="zstd")
+
+    def write(self, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        cols = list(zip(*rows))
+        arrays = [
+            pa.array([None if v is None else str(v) for v in col] if f.type == pa.string() else col, type=f.type)
+            for col, f in zip(cols, self._schema)
+        ]
+        self._w.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._w.close()
+
+
+def _sink(fmt: str, path: Path, columns: list[tuple[str, str]]):
+    if fmt == "parquet":
+        if pq is None:
+            raise RuntimeError("Parquet 내보내기는 pyarrow가 설치돼 있어야 해요.")
+        return _ParquetSink(path, columns)
+    return _CsvSink(path, columns)
+
+
+def _copy(cur: sqlite3.Cursor, sink, batch: int) -> int:
+    n = 0
+    while True:
+        rows = cur.fetchmany(batch)
+        if not rows:
+            return n
+        sink.write([tuple(r) for r in rows])
+        n += len(rows)
+
+
+def _column_type(decl: str) -> str:
+    return "int" if "INT" in (decl or "").upper() else "text"
+
+
+def _export_movements(conn: sqlite3.Connection, guild_id: int, sink, names: list[str], batch: int) -> int:
+    """보관 파일(오래된 분기 순, 예전 파일에 없는 열은 NULL) → 운영 테이블."""
+    n = 0
+    for rows in iter_archived_rows(conn, guild_id, 0, 2 ** 62, names, batch_size=batch):
+        sink.write(rows)
+        n += len(rows)
+
+    with read_conn(conn) as rc:
+        n += _copy(rc.execute(f"SELECT {', '.join(names)} FROM movements WHERE guild_id=? ORDER BY id", (int(guild_id),)), sink, batch)
+    return n
+
+
+def export_guild(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    fmt: str = "csv",
+    include_movements: bool = True,
+    out_dir: Path | None = None,
+) -> ExportResult:
+    """(워커 스레드용) 길드 데이터를 out_dir(기본 EXPORT_DIR/guild_<id>_<시각>)에 파일로."""
+    if fmt not in FORMATS:
+        raise ValueError(f"알 수 없는 형식: {fmt}")
+    started = time.perf_counter()
+    batch = max(100, _env_int("EXPORT_BATCH_ROWS", 5000))
+    stamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")
+    if out_dir is None:
+        cleanup_old_exports()
+        out_dir = _export_root() / f"guild_{int(guild_id)}_{stamp}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result = ExportResult(guild_id=int(guild_id), fmt=fmt, out_dir=out_dir)
+
+    tables = [("items", _ITEM_COLUMNS, _ITEM_SQL), ("categories", _CATEGORY_COLUMNS, _CATEGORY_SQL)]
+    for name, columns, sql in tables:
+        sink = _sink(fmt, out_dir / name, columns)
+        try:
+            with read_conn(conn) as rc:
+                result.rows[name] = _copy(rc.execute(sql, (int(guild_id),)), sink, batch)
+        finally:
+            sink.close()
+        result.files.append(sink.path)
+
+    if include_movements:
+        with read_conn(conn) as rc:
+            columns = [(n, _column_type(t)) for n, t in movement_columns(rc)]
+        sink = _sink(fmt, out_dir / "movements", columns)
+        try:
+            result.rows["movements"] = _export_movements(conn, guild_id, sink, [c[0] for c in columns], batch)
+        finally:
+            sink.close()
+        result.files.append(sink.path)
+
+    result.seconds = time.perf_counter() - started
+    print(
+        f"[EXPORT] guild={result.guild_id} fmt={fmt} rows={result.rows} "
+        f"bytes={result.total_bytes} {result.seconds:.1f}s → {out_dir}"
+    )
+    return result
+
+
+async def export_guild_off_loop(conn: sqlite3.Connection, guild_id: int, fmt: str, include_movements: bool) -> ExportResult:
+    """/내보내기: 읽기 풀이 있으면 워커 스레드에서(없으면 그대로)."""
+    if has_read_pool(conn):
+        return await asyncio.to_thread(export_guild, conn, guild_id, fmt, include_movements)
+    return export_guild(conn, guild_id, fmt, include_movements)
+
+
+def build_export_text(result: ExportResult) -> str:
+    names = {"items": "품목", "categories": "카테고리", "movements": "입출고 기록"}
+    parts = " · ".join(f"{names.get(k, k)} {v:,}행" for k, v in result.rows.items())
+    return (
+        f"📦 **내보내기 완료** ({result.fmt}, {result.total_bytes / (1024 * 1024):.2f}MB, {result.seconds:.1f}초)\n"
+        f"{parts}\n"
+        f"품목 파일은 `/품목가져오기`에 그대로 다시 넣을 수 있어요."
+    )
+
+
+def _main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="길드 데이터 내보내기(CSV / Parquet)")
+    ap.add_argument("--db", default=os.environ.get("DB_PATH", "./data/inventory.db"))
+    ap.add_argument("--guild", type=int, required=True)
+    ap.add_argument("--format", choices=FORMATS, default="csv")
+    ap.add_argument("--no-movements", action="store_true", help="입출고 기록 제외")
+    ap.add_argument("--out", default=None, help="저장 폴더(기본 EXPORT_DIR/guild_<id>_<시각>)")
+    args = ap.parse_args(argv)
+
+    from db import connect
+    conn = connect(args.db)
+    try:
+        result = export_guild(
+            conn, args.guild, args.format, not args.no_movements, Path(args.out) if args.out else None,
+        )
+    finally:
+        conn.close()
+    for p in result.files:
+        print(f"  {p} ({p.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    _main()
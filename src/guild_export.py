@@ -0,0 +1,268 @@
+# src/guild_export.py
+"""
+서버(길드) 단위 논리 백업/복원.
+
+파일 형식: gzip JSON Lines
+  1행: 헤더 {"format": "inventory-guild-export", "version": 1, "guild_id": ..., "created_at_kst_text": ...,
+             "max_movement_id": ..., "columns": {table: [col, ...]}}
+       - max_movement_id: 스냅샷 시점 movements id 발급 위치(시점 복원 시 이후 로그만 재생하는 기준)
+  이후: {"t": table, "r": [값, ...]}   (r은 헤더 columns 순서)
+
+- 내보내기는 해당 길드 행만 커서로 스트리밍 → 전체 DB 크기가 아니라 길드 크기에 비례
+- 다른 길드 데이터가 파일에 섞이지 않음(채널 업로드 안전)
+
+CLI:
+  python src/guild_export.py export --db ./data/inventory.db --guild 123 --out guild_123.jsonl.gz
+  python src/guild_export.py import --db ./data/inventory.db --file guild_123.jsonl.gz [--guild 456]
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from db import apply_db_profile, resolve_db_profile
+from utils.time_kst import now_kst
+
+
+EXPORT_FORMAT = "inventory-guild-export"
+EXPORT_VERSION = 1
+
+# 넣을 때는 이 순서(FK 순서), 지울 때는 역순
+GUILD_TABLES = ("settings", "categories", "items", "alert_state", "favorites", "movements")
+
+# 새 id를 받아야 하는 테이블(다른 DB/다른 길드로 가져와도 PK 충돌 없게 항상 재발급)
+_REMAP_TABLES = ("categories", "items", "movements")
+
+# 참조 컬럼 → id 매핑. movements만 참조가 NULL 가능(품목이 지워져도 기록은 남김)
+_REF_MAPS = {"category_id": "categories", "item_id": "items"}
+_NULLABLE_REF_TABLES = ("movements",)
+
+_BATCH = 1000
+
+
+def _open_readonly(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    apply_db_profile(conn, resolve_db_profile())
+    return conn
+
+
+def export_guild_file(db_path: str, guild_id: int, target_path: Path) -> dict[str, int]:
+    """
+    (워커 스레드에서 호출 가능) 길드 1개 데이터를 target_path로 내보낸다.
+    - 별도의 읽기 전용 커넥션 + 읽기 트랜잭션 1개 → 테이블 간 시점 일치
+    - 임시 파일에 쓰고 마지막에 rename(중간에 죽어도 반쪽 파일이 안 남음)
+    반환값: 테이블별 행 수
+    """
+    k = now_kst()
+    counts: dict[str, int] = {}
+    tmp_path = target_path.with_name(target_path.name + ".tmp")
+
+    src = _open_readonly(db_path)
+    try:
+        src.execute("BEGIN")  # 읽기 스냅샷 고정(WAL)
+
+        columns: dict[str, list[str]] = {}
+        for t in GUILD_TABLES:
+            cur = src.execute(f"SELECT * FROM {t} LIMIT 0")
+            columns[t] = [d[0] for d in cur.description]
+
+        row = src.execute("SELECT seq FROM sqlite_sequence WHERE name='movements'").fetchone()
+        max_movement_id = int(row[0]) if row and row[0] is not None else 0
+
+        header = {
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_VERSION,
+            "guild_id": int(guild_id),
+            "created_at_kst_text": k.kst_text,
+            "created_at_epoch": k.epoch,
+            "max_movement_id": max_movement_id,
+            "columns": columns,
+        }
+
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+
+            for t in GUILD_TABLES:
+                n = 0
+                cur = src.execute(f"SELECT * FROM {t} WHERE guild_id=? ORDER BY rowid", (int(guild_id),))
+                while True:
+                    rows = cur.fetchmany(_BATCH)
+                    if not rows:
+                        break
+                    f.write("".join(
+                        json.dumps({"t": t, "r": list(r)}, ensure_ascii=False, separators=(",", ":")) + "\n"
+                        for r in rows
+                    ))
+                    n += len(rows)
+                counts[t] = n
+
+        src.execute("ROLLBACK")
+    finally:
+        src.close()
+
+    os.replace(tmp_path, target_path)
+    return counts
+
+
+def read_export_header(path: Path) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+    if header.get("format") != EXPORT_FORMAT:
+        raise ValueError("길드 내보내기 파일이 아니에요.")
+    if int(header.get("version", 0)) > EXPORT_VERSION:
+        raise ValueError(f"지원하지 않는 파일 버전이에요: {header.get('version')}")
+    return header
+
+
+def count_export_rows(path: Path) -> dict[str, int]:
+    """(워커 스레드용) 파일을 끝까지 풀어서 테이블별 행 수 세기 - gzip 무결성 검증 겸용."""
+    counts = {t: 0 for t in GUILD_TABLES}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            t = json.loads(line)["t"]
+            counts[t] = counts.get(t, 0) + 1
+    return counts
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def import_guild_file(conn: sqlite3.Connection, src_path: Path, guild_id: int | None = None) -> dict[str, int]:
+    """
+    내보내기 파일을 길드 데이터로 복원(해당 길드의 기존 데이터는 교체).
+    - guild_id를 주면 그 길드로 가져옴(없으면 파일 헤더의 길드)
+    - 하나의 트랜잭션(BEGIN IMMEDIATE): 실패하면 기존 데이터 그대로
+    - categories/items/movements id는 새로 발급하고 참조(category_id/item_id)를 따라 바꿔줌
+    - 파일에 없는 품목/카테고리를 가리키는 참조: movements는 NULL로, alert_state/favorites/items 행은 건너뜀
+    - 파일을 줄 단위로 읽으며 배치로 넣으므로 메모리는 id 매핑 크기 정도만 사용
+    반환값: 테이블별 가져온 행 수(건너뛴 행이 있으면 "<테이블>_skipped"도)
+    """
+    header = read_export_header(src_path)
+    target = int(guild_id if guild_id is not None else header["guild_id"])
+    columns: dict[str, list[str]] = header["columns"]
+
+    id_maps: dict[str, dict[int, int]] = {"categories": {}, "items": {}}
+    counts = {t: 0 for t in GUILD_TABLES}
+
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        for t in reversed(GUILD_TABLES):
+            conn.execute(f"DELETE FROM {t} WHERE guild_id=?", (target,))
+
+        # 테이블별 INSERT 문/컬럼 위치(현재 스키마에 있는 컬럼만)
+        plans: dict[str, tuple[str, list[int], list[str]]] = {}
+        for t in GUILD_TABLES:
+            have = _table_columns(conn, t)
+            src_cols = columns.get(t, [])
+            keep = [
+                i for i, c in enumerate(src_cols)
+                if c in have and not (c == "id" and t in _REMAP_TABLES)
+            ]
+            names = [src_cols[i] for i in keep]
+            sql = f"INSERT INTO {t} ({', '.join(names)}) VALUES ({', '.join(['?'] * len(names))})"
+            plans[t] = (sql, keep, names)
+
+        def _convert(t: str, r: list) -> tuple | None:
+            # 참조 id → 새 id. 파일에 없는 대상이면 원래 id를 쓰지 않음(대상 DB에서는 다른 길드 행일 수 있음)
+            # → movements는 NULL, 그 외(NOT NULL 참조)는 None(건너뜀)
+            sql, keep, names = plans[t]
+            vals = [r[i] for i in keep]
+            for j, c in enumerate(names):
+                if c == "guild_id":
+                    vals[j] = target
+                elif c in _REF_MAPS and vals[j] is not None:
+                    new_id = id_maps[_REF_MAPS[c]].get(int(vals[j]))
+                    if new_id is None and t not in _NULLABLE_REF_TABLES:
+                        return None
+                    vals[j] = new_id
+            return tuple(vals)
+
+        def _skip(t: str) -> None:
+            counts[f"{t}_skipped"] = counts.get(f"{t}_skipped", 0) + 1
+
+        pending: list[tuple] = []
+        pending_table = ""
+
+        def _flush():
+            if pending:
+                conn.executemany(plans[pending_table][0], pending)
+                counts[pending_table] += len(pending)
+                pending.clear()
+
+        with gzip.open(src_path, "rt", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                rec = json.loads(line)
+                t = rec["t"]
+                if t not in plans:
+                    continue
+                r = rec["r"]
+
+                if t in id_maps:
+                    # 새 id가 필요(다음 테이블이 참조) → 한 줄씩 넣고 매핑 기록
+                    _flush()
+                    vals = _convert(t, r)
+                    if vals is None:
+                        _skip(t)
+                        continue
+                    old_id = int(r[columns[t].index("id")])
+                    cur = conn.execute(plans[t][0], vals)
+                    id_maps[t][old_id] = int(cur.lastrowid)
+                    counts[t] += 1
+                    continue
+
+                vals = _convert(t, r)
+                if vals is None:
+                    _skip(t)
+                    continue
+                if t != pending_table:
+                    _flush()
+                    pending_table = t
+                pending.append(vals)
+                if len(pending) >= _BATCH:
+                    _flush()
+            _flush()
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return counts
+
+
+def _main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="길드 단위 내보내기/가져오기")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ex = sub.add_parser("export")
+    ex.add_argument("--db", default=os.environ.get("DB_PATH", "./data/inventory.db"))
+    ex.add_argument("--guild", type=int, required=True)
+    ex.add_argument("--out", required=True)
+
+    im = sub.add_parser("import")
+    im.add_argument("--db", default=os.environ.get("DB_PATH", "./data/inventory.db"))
+    im.add_argument("--file", required=True)
+    im.add_argument("--guild", type=int, default=None, help="다른 길드로 가져올 때만 지정")
+
+    args = ap.parse_args(argv)
+    if args.cmd == "export":
+        counts = export_guild_file(args.db, args.guild, Path(args.out))
+    else:
+        from db import connect
+        conn = connect(args.db)
+        try:
+            counts = import_guild_file(conn, Path(args.file), args.guild)
+        finally:
+            conn.close()
+    print(json.dumps(counts, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,484 @@
+# src/importer.py
+"""
+품목 일괄 가져오기(XLSX / CSV) - 처음 도입하는 길드에 품목 수천 개를 한 번에 등록/수정.
+
+- 첫 줄은 헤더. 인식하는 열(한글/영문 둘 다, 순서 무관):
+    카테고리(category) · 품목명(name, 필수) · 코드(code) · 재고/현재재고(qty) · 경고기준(warn_below)
+    보관 위치(storage_location) · 메모(note) · 상태(status: 활성/비활성)
+  → 일일 재고 보고서 XLSX, /내보내기 items 파일(.csv.gz / .parquet)을 그대로 다시 넣을 수 있음
+- 스트리밍 파싱: XLSX는 openpyxl read_only(행 단위), CSV는 csv.reader(UTF-8 BOM / CP949 자동),
+  Parquet는 pyarrow 배치(설치돼 있을 때만)
+- 품목명 기준 upsert
+  · 없는 품목: 추가(재고는 초기 재고로, 기록 없음 - 품목 추가 모달과 같음)
+  · 있는 품목: 파일에 있는 값만 변경(빈 칸 = 기존 값 유지), 비활성 품목은 다시 활성화
+  · 재고가 바뀌면 ADJUST 기록을 남김 → 이력/스냅샷/시점 복원과 어긋나지 않음
+  · 상태=비활성 인 행은 건너뜀
+- 카테고리는 이름으로 찾고 없으면 생성(비활성 카테고리는 다시 활성화), 빈 칸은 '기타'
+- 검증 실패한 행은 행 번호와 이유를 모아서 보고, 나머지는 한 트랜잭션(executemany)으로 반영
+
+CLI:
+  python src/importer.py --guild 123 --file items.xlsx            # 미리보기(반영 안 함)
+  python src/importer.py --guild 123 --file items.csv --apply --actor 관리자
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from repo.category_repo import ETC_CATEGORY_NAME, ensure_categories_schema
+from repo.history_repo import invalidate_item_history
+from utils.time_kst import now_kst
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+# 헤더 → 필드. 공백/대소문자 무시하고 비교
+_HEADER_ALIASES = {
+    "category": ("카테고리", "category", "category_name"),
+    "name": ("품목명", "품목", "name", "item_name"),
+    "code": ("코드", "code"),
+    "qty": ("재고", "현재재고", "수량", "qty"),
+    "warn_below": ("경고기준", "경고 기준", "warn_below"),
+    "storage_location": ("보관 위치", "보관위치", "storage_location", "location"),
+    "note": ("메모", "note"),
+    "status": ("상태", "status", "is_active"),
+}
+_HEADER_LOOKUP = {a.replace(" ", "").lower(): f for f, aliases in _HEADER_ALIASES.items() for a in aliases}
+
+_MAX_LEN = {"name": 60, "code": 30, "note": 200, "storage_location": 120, "category": 50}
+_INACTIVE_WORDS = {"비활성", "inactive", "0", "false", "보관"}
+
+# 결과에 남기는 오류 상세 최대 개수(건수는 전부 셈)
+_MAX_ERROR_DETAILS = 500
+
+
+@dataclass
+class ImportRow:
+    row_no: int                      # 파일 기준 행 번호(헤더 = 1)
+    name: str
+    category: str | None = None      # None = 파일에 값 없음(기존 값 유지 / 새 품목은 '기타')
+    code: str | None = None
+    qty: int | None = None
+    warn_below: int | None = None
+    storage_location: str | None = None
+    note: str | None = None
+
+
+@dataclass
+class ImportResult:
+    total_rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    reactivated: int = 0
+    unchanged: int = 0
+    skipped: int = 0                 # 상태=비활성 / 빈 줄
+    adjusted: int = 0                # 재고 변경(ADJUST 기록) 수
+    categories_created: list[str] = field(default_factory=list)
+    error_count: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    applied: bool = False
+
+    def add_error(self, row_no: int, msg: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < _MAX_ERROR_DETAILS:
+            self.errors.append((row_no, msg))
+
+
+# ---- 파싱 ----
+
+def _iter_xlsx(data: bytes) -> Iterator[tuple]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _iter_csv(data: bytes) -> Iterator[list[str]]:
+    # 엑셀에서 저장한 한글 CSV는 CP949인 경우가 많음
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("cp949", errors="replace")
+    yield from csv.reader(io.StringIO(text, newline=""))
+
+
+def _iter_parquet(data: bytes) -> Iterator[tuple]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet 파일은 pyarrow가 설치돼 있어야 읽을 수 있어요.")
+
+    pf = pq.ParquetFile(io.BytesIO(data))
+    names = pf.schema_arrow.names
+    yield tuple(names)
+    for batch in pf.iter_batches(batch_size=5000):
+        cols = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+        yield from zip(*cols)
+
+
+def iter_table_rows(filename: str, data: bytes) -> Iterator[tuple]:
+    """확장자로 형식 판단(.xlsx / .csv / .csv.gz / .parquet)."""
+    lower = filename.lower()
+    if lower.endswith(".gz"):
+        import gzip
+
+        data = gzip.decompress(data)
+        lower = lower[:-3]
+    if lower.endswith(".xlsx") or lower.endswith(".xlsm"):
+        return _iter_xlsx(data)
+    if lower.endswith(".csv") or lower.endswith(".txt"):
+        return _iter_csv(data)
+    if lower.endswith(".parquet"):
+        return _iter_parquet(data)
+    raise ValueError("지원하지 않는 파일 형식이에요(.xlsx / .csv / .parquet).")
+
+
+def _cell_text(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)   # 엑셀 숫자 코드(49 → 49.0) 방지
+    return str(v).strip()
+
+
+def _parse_int(text: str, label: str) -> int:
+    s = text.replace(",", "")
+    try:
+        f = float(s)
+    except ValueError:
+        raise ValueError(f"{label} 값이 숫자가 아니에요: {text[:20]}")
+    if not f.is_integer():
+        raise ValueError(f"{label} 값은 정수여야 해요: {text[:20]}")
+    return int(f)
+
+
+def parse_rows(rows: Iterable[tuple], result: ImportResult, max_rows: int | None = None) -> list[ImportRow]:
+    """헤더 인식 + 행 검증. 잘못된 행은 result.errors에 모으고 빼서 반환."""
+    max_rows = max_rows or _env_int("IMPORT_MAX_ROWS", 20000)
+    it = iter(rows)
+    header = None
+    for header in it:
+        if any(_cell_text(c) for c in header):
+            break
+    if header is None:
+        raise ValueError("빈 파일이에요.")
+
+    cols: dict[str, int] = {}
+    for idx, h in enumerate(header):
+        f = _HEADER_LOOKUP.get(_cell_text(h).replace(" ", "").lower())
+        if f and f not in cols:
+            cols[f] = idx
+    if "name" not in cols:
+        raise ValueError("헤더에 '품목명'(name) 열이 없어요.")
+
+    out: list[ImportRow] = []
+    seen_names: dict[str, int] = {}
+    seen_codes: dict[str, int] = {}
+    row_no = 1
+    for raw in it:
+        row_no += 1
+        cells = {f: (_cell_text(raw[i]) if i < len(raw) else "") for f, i in cols.items()}
+        if not any(cells.values()):
+            continue
+        result.total_rows += 1
+        if result.total_rows > max_rows:
+            raise ValueError(f"한 번에 {max_rows}행까지만 가져올 수 있어요.")
+
+        if cells.get("status", "").lower() in _INACTIVE_WORDS:
+            result.skipped += 1
+            continue
+        try:
+            name = cells["name"]
+            if not name:
+                raise ValueError("품목명이 비어 있어요.")
+            for f, limit in _MAX_LEN.items():
+                if len(cells.get(f, "")) > limit:
+                    raise ValueError(f"{f} 길이는 {limit}자까지예요.")
+            if name in seen_names:
+                raise ValueError(f"품목명이 {seen_names[name]}행과 중복이에요.")
+            r = ImportRow(row_no=row_no, name=name)
+            if cells.get("category"):
+                r.category = cells["category"]
+            if cells.get("code"):
+                r.code = cells["code"]
+                if r.code in seen_codes:
+                    raise ValueError(f"코드 {r.code}가 {seen_codes[r.code]}행과 중복이에요.")
+            if cells.get("qty"):
+                r.qty = _parse_int(cells["qty"], "재고")
+                if r.qty < 0:
+                    raise ValueError("재고는 0 이상이어야 해요.")
+            if cells.get("warn_below"):
+                r.warn_below = _parse_int(cells["warn_below"], "경고기준")
+                if r.warn_below < 0:
+                    raise ValueError("경고기준은 0 이상이어야 해요.")
+            if "storage_location" in cells and cells["storage_location"]:
+                r.storage_location = cells["storage_location"]
+            if "note" in cells and cells["note"]:
+                r.note = cells["note"]
+        except ValueError as e:
+            result.add_error(row_no, str(e))
+            continue
+        seen_names[name] = row_no
+        if r.code:
+            seen_codes[r.code] = row_no
+        out.append(r)
+    return out
+
+
+def parse_import_file(filename: str, data: bytes) -> tuple[list[ImportRow], ImportResult]:
+    """(워커 스레드용) 파일 → 검증된 행 + 결과(오류/건너뜀 집계)."""
+    result = ImportResult()
+    rows = parse_rows(iter_table_rows(filename, data), result)
+    return rows, result
+
+
+# ---- 반영 ----
+
+def _resolve_categories(conn: sqlite3.Connection, guild_id: int, names: set[str], k, dry_run: bool) -> tuple[dict[str, int], list[str]]:
+    """카테고리 이름 → id (없으면 생성, 비활성은 재활성화). dry_run이면 새 카테고리는 id 0."""
+    existing = {
+        str(r[1]): (int(r[0]), int(r[2]))
+        for r in conn.execute("SELECT id, name, is_active FROM categories WHERE guild_id=?", (int(guild_id),))
+    }
+    ids: dict[str, int] = {}
+    created: list[str] = []
+    reactivate: list[int] = []
+    for name in sorted(names):
+        if name in existing:
+            cid, active = existing[name]
+            ids[name] = cid
+            if not active:
+                reactivate.append(cid)
+        else:
+            created.append(name)
+    if dry_run:
+        ids.update({n: 0 for n in created})
+        return ids, created
+
+    if reactivate:
+        conn.executemany(
+            "UPDATE categories SET is_active=1, deactivated_at=NULL, updated_at=? WHERE id=?",
+            [(k.kst_text, cid) for cid in reactivate],
+        )
+    if created:
+        conn.executemany(
+            "INSERT INTO categories (guild_id, name, is_active, sort_order, created_at, updated_at) VALUES (?,?,1,999,?,?)",
+            [(int(guild_id), n, k.kst_text, k.kst_text) for n in created],
+        )
+        for r in conn.execute(
+            f"SELECT id, name FROM categories WHERE guild_id=? AND name IN ({','.join('?' * len(created))})",
+            (int(guild_id), *created),
+        ):
+            ids[str(r[1])] = int(r[0])
+    return ids, created
+
+
+def apply_import(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    rows: list[ImportRow],
+    result: ImportResult,
+    actor_name: str,
+    actor_id: int | None = None,
+    dry_run: bool = False,
+) -> ImportResult:
+    """
+    검증된 행을 한 트랜잭션으로 upsert. dry_run=True면 집계만 하고 되돌림.
+    DB 기준 검증(다른 품목이 이미 쓰는 코드 등)에 걸린 행은 오류로 빼고 나머지만 반영.
+    """
+    gid = int(guild_id)
+    k = now_kst()
+    reason = "일괄 가져오기"
+    ensure_categories_schema(conn)
+
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        current = {
+            str(r[1]): r
+            for r in conn.execute(
+                """
+                SELECT i.id, i.name, i.code, i.qty, i.warn_below, i.storage_location, i.note,
+                       i.is_active, i.category_id, i.image_url, COALESCE(c.name, '기타')
+                FROM items i LEFT JOIN categories c ON c.id = i.category_id
+                WHERE i.guild_id=?
+                """,
+                (gid,),
+            )
+        }
+        code_owner = {str(r[2]): str(r[1]) for r in current.values() if r[2]}
+
+        ok_rows: list[ImportRow] = []
+        for r in rows:
+            owner = code_owner.get(r.code) if r.code else None
+            if owner is not None and owner != r.name:
+                result.add_error(r.row_no, f"코드 {r.code}는 이미 '{owner}' 품목이 쓰고 있어요.")
+                continue
+            ok_rows.append(r)
+
+        cat_names = {r.category for r in ok_rows if r.category}
+        if any(r.category is None and r.name not in current for r in ok_rows):
+            cat_names.add(ETC_CATEGORY_NAME)
+        cat_ids, result.categories_created = _resolve_categories(conn, gid, cat_names, k, dry_run)
+
+        inserts: list[tuple] = []
+        updates: list[tuple] = []
+        logs: list[tuple] = []
+        touched: list[int] = []
+        for r in ok_rows:
+            cur = current.get(r.name)
+            if cur is None:
+                inserts.append((
+                    gid, cat_ids[r.category or ETC_CATEGORY_NAME], r.name, r.code, r.qty or 0, r.warn_below or 0,
+                    r.note or "", r.storage_location or "", k.kst_text, k.kst_text,
+                ))
+                continue
+
+            item_id, _, code, qty, warn, loc, note, active, cat_id, image_url, cat_name = cur
+            new = (
+                cat_ids[r.category] if r.category else int(cat_id),
+                r.code if r.code is not None else code,
+                r.qty if r.qty is not None else int(qty),
+                r.warn_below if r.warn_below is not None else int(warn),
+                r.storage_location if r.storage_location is not None else loc,
+                r.note if r.note is not None else note,
+            )
+            old = (int(cat_id), code, int(qty), int(warn), loc, note)
+            if new == old and int(active) == 1:
+                result.unchanged += 1
+                continue
+            if int(active) != 1:
+                result.reactivated += 1
+            else:
+                result.updated += 1
+            updates.append((*new, k.kst_text, gid, int(item_id)))
+            if new[2] != int(qty):
+                logs.append((
+                    gid, int(item_id), r.name, new[1] or "", r.category or cat_name, image_url or "",
+                    "ADJUST", new[2] - int(qty), int(qty), new[2],
+                    reason, 1, "", actor_name, actor_id, k.kst_text, k.epoch,
+                ))
+                touched.append(int(item_id))
+        result.inserted = len(inserts)
+        result.adjusted = len(logs)
+
+        if dry_run:
+            conn.rollback()
+            return result
+
+        conn.executemany(
+            """
+            INSERT INTO items (
+                guild_id, category_id, name, code, qty, warn_below, note, storage_location,
+                is_active, created_at, updated_at
+            ) VALUES (?,?,?,?,?,?,?,?,1,?,?)
+            """,
+            inserts,
+        )
+        conn.executemany(
+            """
+            UPDATE items SET category_id=?, code=?, qty=?, warn_below=?, storage_location=?, note=?,
+                             is_active=1, deactivated_at=NULL, updated_at=?
+            WHERE guild_id=? AND id=?
+            """,
+            updates,
+        )
+        conn.executemany(
+            """
+            INSERT INTO movements (
+                guild_id, item_id,
+                item_name_snapshot, item_code_snapshot, category_name_snapshot, image_url,
+                action, qty_change, before_qty, after_qty,
+                reason, success, error_message,
+                discord_name, discord_id,
+                created_at_kst_text, created_at_epoch
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            logs,
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    for item_id in touched:
+        invalidate_item_history(gid, item_id)
+    result.applied = True
+    print(
+        f"[IMPORT] guild={gid} inserted={result.inserted} updated={result.updated} "
+        f"reactivated={result.reactivated} adjusted={result.adjusted} errors={result.error_count}"
+    )
+    return result
+
+
+def build_import_text(result: ImportResult, n_errors: int = 10) -> str:
+    head = "✅ **품목 가져오기 완료**" if result.applied else "🔎 **품목 가져오기 미리보기**(아직 반영 안 함)"
+    lines = [
+        head,
+        f"- 읽은 행: {result.total_rows}",
+        f"- 추가: {result.inserted} · 수정: {result.updated} · 재활성화: {result.reactivated} · 변경 없음: {result.unchanged}",
+        f"- 건너뜀(비활성 행): {result.skipped} · 오류: {result.error_count}",
+    ]
+    if result.adjusted:
+        lines.append(f"- 재고가 바뀐 품목 {result.adjusted}개는 정정(ADJUST) 기록을 남겼어요." if result.applied
+                     else f"- 재고가 바뀌는 품목 {result.adjusted}개(정정 기록이 남아요)")
+    if result.categories_created:
+        names = ", ".join(result.categories_created[:10])
+        more = f" 외 {len(result.categories_created) - 10}개" if len(result.categories_created) > 10 else ""
+        lines.append(f"- 새 카테고리: {names}{more}")
+    if result.errors:
+        result.errors.sort()
+        lines.append("오류 행:")
+        for row_no, msg in result.errors[:n_errors]:
+            lines.append(f"  · {row_no}행: {msg}")
+        if result.error_count > n_errors:
+            lines.append(f"  · … 외 {result.error_count - n_errors}건(첨부 파일 참고)")
+    return "\n".join(lines)[:1990]
+
+
+def errors_csv_bytes(result: ImportResult) -> bytes:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["행", "오류"])
+    w.writerows(sorted(result.errors))
+    return buf.getvalue().encode("utf-8-sig")
+
+
+def _main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="품목 일괄 가져오기(XLSX / CSV)")
+    ap.add_argument("--db", default=os.environ.get("DB_PATH", "./data/inventory.db"))
+    ap.add_argument("--guild", type=int, required=True)
+    ap.add_argument("--file", required=True)
+    ap.add_argument("--apply", action="store_true", help="운영 DB에 반영(없으면 미리보기)")
+    ap.add_argument("--actor", default="일괄 가져오기", help="재고 정정 기록에 남길 이름")
+    args = ap.parse_args(argv)
+
+    path = Path(args.file)
+    rows, result = parse_import_file(path.name, path.read_bytes())
+
+    from db import connect
+    conn = connect(args.db)
+    try:
+        apply_import(conn, args.guild, rows, result, args.actor, dry_run=not args.apply)
+    finally:
+        conn.close()
+    print(build_import_text(result, n_errors=50))
+
+
+if __name__ == "__main__":
+    _main()
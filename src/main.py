@@ -1,17 +1,22 @@
 # src/main.py
 from __future__ import annotations
 
+import asyncio
+import io
 import os
 import traceback
+from datetime import datetime
 
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
-from db import connect, apply_schema
+from db import connect, apply_schema, attach_read_pool, has_read_pool, read_conn, read_pool_stats
 from utils.time_kst import now_kst
 from utils.perm import is_admin
+from utils import instrument, loop_watchdog, metrics, sampling_profiler
+import sql_profiler
 
 from repo.bootstrap_repo import ensure_initialized
 from repo.settings_repo import get_settings, ensure_settings_schema
@@ -21,14 +26,28 @@ from ui.settings_view import SettingsView
 from ui.dashboard_view import DashboardView
 
 from reporting import (
+    build_consumption_reply,
+    build_warn_suggestions,
     force_send_daily_reports,
     force_send_monthly_prev_month,
 )
 
 from ui.category_manage import CategoryManageView
+from ui.warn_suggest import WarnSuggestView
 from repo.category_repo import list_categories
 
-from backup import run_daily_backup, run_monthly_archive, force_backup_now, list_backup_files
+from backup import (
+    run_daily_backup,
+    run_monthly_archive,
+    force_backup_now,
+    list_backup_files,
+    migrate_legacy_backup_state,
+)
+from repo.backup_repo import ensure_backup_catalog_schema
+from repo.version_repo import ensure_data_version_triggers
+import exporter
+import importer
+from maintenance import migrate_auto_vacuum, run_db_maintenance, build_db_status_text
 
 
 load_dotenv()
@@ -55,6 +74,11 @@ class InventoryBot(commands.Bot):
         ensure_settings_schema(self.conn)
         ensure_items_schema(self.conn)
         ensure_categories_schema(self.conn)
+        ensure_backup_catalog_schema(self.conn)
+        ensure_data_version_triggers(self.conn)
+
+        # ✅ (1회) 백업 마커 파일 → 백업 카탈로그 이관
+        migrate_legacy_backup_state(self.conn)
 
         # ✅ persistent view 등록 (재시작 후에도 대시보드 버튼 살아있게)
         self.add_view(DashboardView())
@@ -63,6 +87,16 @@ class InventoryBot(commands.Bot):
         if not self._report_loop.is_running():
             self._report_loop.start()
 
+        # ✅ 지표 엔드포인트(METRICS_PORT > 0일 때만) + 이벤트 루프 지연 측정
+        _register_bot_metrics(self)
+        await metrics.start_http_server()
+
+        # ✅ 이벤트 루프 멈춤 감지([LOOP_STALL] 로그, /상태 하단 집계). LOOP_WATCHDOG=0 이면 끔
+        loop_watchdog.start()
+
+        # ✅ SIGUSR2 → 샘플링 프로파일 저장(PROFILE_DIR)
+        sampling_profiler.install_signal_handler(asyncio.get_running_loop())
+
         # ✅ 길드 커맨드 잔재 정리(필요 시) + 빠른 반영(선택)
         if CLEANUP_GUILD_OBJ:
             # 1) 잔재 삭제
@@ -84,17 +118,32 @@ class InventoryBot(commands.Bot):
     @tasks.loop(minutes=1)
     async def _report_loop(self):
         # 순환 import/의존성 꼬임 방지: 여기서 import
-        from reporting import run_daily_reports, run_quarterly_cleanup
+        from reporting import (
+            run_daily_reports, run_daily_snapshot, run_quarterly_cleanup, run_weekly_consumption_report, cleanup_running,
+        )
 
         for g in list(self.guilds):
             try:
+                await run_daily_snapshot(self, g)
                 await run_daily_reports(self, g)
+                await run_weekly_consumption_report(self, g)
                 await run_quarterly_cleanup(self, g)
                 await run_daily_backup(self, g)      # 기본 18:40 KST
                 await run_monthly_archive(self, g)
             except Exception as e:
                 print("[REPORT_LOOP_ERROR]", repr(e))
 
+        try:
+            await _refresh_low_stock(self)
+        except Exception as e:
+            print("[METRICS] low stock refresh failed:", repr(e))
+
+        # DB 파일 유지보수(길드와 무관, 한가할 때만 빈 페이지 반환/optimize/ANALYZE)
+        try:
+            await run_db_maintenance(self, busy=cleanup_running())
+        except Exception as e:
+            print("[DB_MAINTENANCE_ERROR]", repr(e))
+
     @_report_loop.before_loop
     async def _before_report_loop(self):
         await self.wait_until_ready()
@@ -103,6 +152,45 @@ class InventoryBot(commands.Bot):
 bot = InventoryBot()
 
 
+def _register_bot_metrics(b: InventoryBot) -> None:
+    """긁어갈 때 계산하는 게이지(핫패스 비용 없음)."""
+    metrics.REGISTRY.gauge("inventory_guilds", "봇이 들어가 있는 서버 수").set_function(lambda: len(b.guilds))
+
+    def _pool() -> dict[tuple, float]:
+        st = read_pool_stats(b.conn)
+        return {(k,): v for k, v in st.items()}
+
+    metrics.REGISTRY.gauge(
+        "inventory_db_read_pool", "읽기 풀 커넥션(state=size/in_use/waiting)", ("state",),
+    ).set_function(_pool)
+
+    # DB 조회가 필요한 값은 긁어갈 때 계산하지 않고 보고서 루프가 갱신한 값을 그대로(_refresh_low_stock)
+    metrics.REGISTRY.gauge(
+        "inventory_low_stock_items", "재고 경고 상태인 품목 수(1분마다 갱신)", ("guild_id",),
+    ).set_function(lambda: _low_stock_counts)
+
+
+_low_stock_counts: dict[tuple, float] = {}
+
+
+def _count_low_stock(conn) -> dict[tuple, float]:
+    with read_conn(conn) as c:
+        rows = c.execute(
+            "SELECT guild_id, COUNT(*) FROM items "
+            "WHERE is_active=1 AND warn_below > 0 AND qty <= warn_below GROUP BY guild_id"
+        ).fetchall()
+    return {(r[0],): r[1] for r in rows}
+
+
+async def _refresh_low_stock(b: InventoryBot) -> None:
+    """보고서 루프(1분)에서: 경고 품목 수 집계(읽기 풀이 있으면 워커 스레드)."""
+    global _low_stock_counts
+    if has_read_pool(b.conn):
+        _low_stock_counts = await asyncio.to_thread(_count_low_stock, b.conn)
+    else:
+        _low_stock_counts = _count_low_stock(b.conn)
+
+
 @bot.event
 async def on_ready():
     print(f"[READY] Logged in as {bot.user} (id={bot.user.id})")
@@ -147,24 +235,34 @@ async def settings_cmd(inter: discord.Interaction):
         app_commands.Choice(name="월간(지난달) - 누적 로그", value="monthly_prev"),
     ]
 )
-async def report_cmd(inter: discord.Interaction, 종류: app_commands.Choice[str]):
+@app_commands.describe(날짜="일일 보고서를 다시 만들 날짜(YYYY-MM-DD, 비우면 오늘)")
+async def report_cmd(inter: discord.Interaction, 종류: app_commands.Choice[str], 날짜: str | None = None):
     if not inter.guild:
         return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
 
     if not is_admin(inter, bot.conn):
         return await inter.response.send_message("권한이 없어요.", ephemeral=True)
 
+    day = (날짜 or "").strip() or None
+    if day:
+        try:
+            day = datetime.strptime(day.replace("/", "-"), "%Y-%m-%d").strftime("%Y-%m-%d")
+        except ValueError:
+            return await inter.response.send_message("날짜는 YYYY-MM-DD 형식으로 입력해 주세요.", ephemeral=True)
+        if day > now_kst().dt.strftime("%Y-%m-%d"):
+            return await inter.response.send_message("미래 날짜는 만들 수 없어요.", ephemeral=True)
+
     await inter.response.defer(ephemeral=True)
 
     try:
         if 종류.value == "daily":
-            ok = await force_send_daily_reports(bot, inter.guild, mark_done=True)
+            ok = await force_send_daily_reports(bot, inter.guild, mark_done=True, day=day)
             if not ok:
                 return await inter.followup.send(
                     "리포트 채널이 설정되지 않았어요. `/설정`에서 재고_알림(리포트) 채널을 먼저 지정해 주세요.",
                     ephemeral=True,
                 )
-            return await inter.followup.send("✅ 일일 리포트를 업로드했어요.", ephemeral=True)
+            return await inter.followup.send(f"✅ 일일 리포트({day or '오늘'})를 업로드했어요.", ephemeral=True)
 
         if 종류.value == "monthly_prev":
             ok = await force_send_monthly_prev_month(bot, inter.guild, mark_done=True)
@@ -212,16 +310,222 @@ async def backup_list_cmd(inter: discord.Interaction, 개수: int = 20):
         return await inter.response.send_message("권한이 없어요.", ephemeral=True)
 
     n = max(1, min(int(개수), 50))
-    files = list_backup_files(limit=n)
+    files = list_backup_files(bot.conn, limit=n, guild_id=inter.guild_id)
 
     if not files:
         return await inter.response.send_message("백업 파일이 아직 없어요.", ephemeral=True)
 
-    lines = [f"- `{name}` ({size_mb:.2f}MB)" for (name, size_mb, _mtime) in files]
-    text = "🗂️ **백업 목록(최신순)**\n" + "\n".join(lines)
+    lines = []
+    for e in files:
+        size_mb = int(e.get("size_bytes") or 0) / (1024 * 1024)
+        line = f"- `{e['file_name']}` ({size_mb:.2f}MB)"
+        st = e.get("verify_status")
+        if st == "ok":
+            line += f" ✅ 검증됨 · sha256 `{str(e.get('sha256') or '')[:12]}`"
+        elif st == "failed":
+            line += f" ❌ 검증 실패 · {e.get('verify_detail') or ''}"
+        elif st == "pending":
+            line += " ⏳ 검증 중"
+        else:
+            line += " · 검증 기록 없음"
+        lines.append(line)
+    text = ("🗂️ **백업 목록(최신순)**\n" + "\n".join(lines))[:1990]
+    await inter.response.send_message(text, ephemeral=True)
+
+
+# ---- Slash command: /db상태 ----
+@bot.tree.command(name="db상태", description="DB 파일 크기/빈 페이지/유지보수 기록을 보여줍니다(관리자 전용).")
+async def db_status_cmd(inter: discord.Interaction):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    await inter.response.send_message(build_db_status_text(bot.conn), ephemeral=True)
+
+
+# ---- Slash command: /상태 ----
+@bot.tree.command(name="상태", description="버튼/명령 응답 시간(p50/p95/p99)과 이벤트 루프 멈춤을 보여줍니다(관리자 전용).")
+async def status_cmd(inter: discord.Interaction):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    text = instrument.build_status_text(inter.guild_id)
+    stalls = loop_watchdog.build_summary_text()
+    if stalls:
+        text = text + "\n\n" + stalls
+    await inter.response.send_message(text[:1990], ephemeral=True)
+
+
+# ---- Slash command: /쿼리통계 ----
+@bot.tree.command(name="쿼리통계", description="시간이 오래 걸린 SQL 상위 목록(SQL_PROFILE=1일 때, 관리자 전용).")
+@app_commands.describe(개수="표시할 개수(최대 15)", 초기화="보여준 뒤 통계를 비울지")
+async def sql_profile_cmd(inter: discord.Interaction, 개수: int = 8, 초기화: bool = False):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    text = sql_profiler.build_top_text(bot.conn, max(1, min(15, 개수)))
+    if 초기화:
+        sql_profiler.reset()
     await inter.response.send_message(text, ephemeral=True)
 
 
+# ---- Slash command: /프로파일 ----
+@bot.tree.command(name="프로파일", description="N초 동안 전체 스레드를 샘플링해 flamegraph용 파일을 올립니다(관리자 전용).")
+@app_commands.describe(초="측정 시간(초, 최대 300)", 간격="샘플 간격(ms, 기본 10)")
+async def profile_cmd(inter: discord.Interaction, 초: int = 30, 간격: int = 10):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    if sampling_profiler.is_running():
+        return await inter.response.send_message("이미 프로파일링 중이에요. 끝난 뒤 다시 시도해 주세요.", ephemeral=True)
+
+    seconds = max(1, min(300, int(초)))
+    await inter.response.send_message(f"⏱️ {seconds}초 동안 샘플링할게요...", ephemeral=True)
+
+    try:
+        res, path = await sampling_profiler.profile_for(seconds, max(1, min(1000, int(간격))), "profile")
+    except Exception as e:
+        traceback.print_exc()
+        return await inter.followup.send(f"프로파일 실패: `{type(e).__name__}: {e}`", ephemeral=True)
+
+    text = sampling_profiler.build_summary_text(res)
+    if path.stat().st_size <= 8 * 1024 * 1024:
+        await inter.followup.send(text, file=discord.File(fp=str(path), filename=path.name), ephemeral=True)
+    else:
+        await inter.followup.send(f"{text}\n(파일이 8MB를 넘어 서버에만 저장: `{path}`)"[:1990], ephemeral=True)
+
+
+# ---- Slash command: /소모분석 ----
+@bot.tree.command(name="소모분석", description="품목별 소모 속도/예상 소진일/발주 제안을 보여줍니다(관리자 전용).")
+@app_commands.describe(개수="표시할 품목 수(최대 25)", 엑셀="전체 결과를 엑셀로 받을지")
+async def consumption_cmd(inter: discord.Interaction, 개수: int = 10, 엑셀: bool = False):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    await inter.response.defer(ephemeral=True, thinking=True)
+    try:
+        text, file = await build_consumption_reply(bot.conn, inter.guild_id, max(1, min(25, int(개수))), 엑셀)
+    except Exception as e:
+        traceback.print_exc()
+        return await inter.followup.send(f"소모 분석 실패: `{type(e).__name__}: {e}`", ephemeral=True)
+
+    if file is None:
+        await inter.followup.send(text, ephemeral=True)
+    else:
+        await inter.followup.send(text, file=file, ephemeral=True)
+
+
+# ---- Slash command: /경고기준제안 ----
+@bot.tree.command(name="경고기준제안", description="출고 기록으로 계산한 경고 기준을 검토하고 한 번에 적용합니다(관리자 전용).")
+async def warn_suggest_cmd(inter: discord.Interaction):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    await inter.response.defer(ephemeral=True, thinking=True)
+    try:
+        suggestions, basis = await build_warn_suggestions(bot.conn, inter.guild_id)
+    except Exception as e:
+        traceback.print_exc()
+        return await inter.followup.send(f"계산 실패: `{type(e).__name__}: {e}`", ephemeral=True)
+
+    await WarnSuggestView(bot.conn, inter.guild_id, suggestions, basis).send(inter)
+
+
+# ---- Slash command: /품목가져오기 ----
+@bot.tree.command(name="품목가져오기", description="XLSX/CSV 파일로 품목을 한 번에 추가/수정합니다(관리자 전용).")
+@app_commands.describe(파일="첫 줄이 헤더(품목명 필수, 카테고리/코드/재고/경고기준/보관 위치/메모)인 .xlsx 또는 .csv", 미리보기="반영하지 않고 결과만 볼지")
+async def item_import_cmd(inter: discord.Interaction, 파일: discord.Attachment, 미리보기: bool = False):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    max_bytes = int(os.getenv("IMPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+    if 파일.size > max_bytes:
+        return await inter.response.send_message(f"파일이 너무 커요(최대 {max_bytes // (1024 * 1024)}MB).", ephemeral=True)
+
+    await inter.response.defer(ephemeral=True, thinking=True)
+    try:
+        data = await 파일.read()
+        # 파싱(엑셀 읽기)은 워커 스레드, DB 반영은 한 트랜잭션이라 짧아서 루프에서
+        rows, result = await asyncio.to_thread(importer.parse_import_file, 파일.filename, data)
+        importer.apply_import(
+            bot.conn, inter.guild_id, rows, result,
+            actor_name=inter.user.display_name, actor_id=inter.user.id, dry_run=미리보기,
+        )
+    except ValueError as e:
+        return await inter.followup.send(f"가져오기 실패: {e}", ephemeral=True)
+    except Exception as e:
+        traceback.print_exc()
+        return await inter.followup.send(f"가져오기 실패: `{type(e).__name__}: {e}`", ephemeral=True)
+
+    text = importer.build_import_text(result)
+    if result.error_count > 10:
+        f = discord.File(fp=io.BytesIO(importer.errors_csv_bytes(result)), filename="가져오기_오류.csv")
+        await inter.followup.send(text, file=f, ephemeral=True)
+    else:
+        await inter.followup.send(text, ephemeral=True)
+
+
+# ---- Slash command: /내보내기 ----
+@bot.tree.command(name="내보내기", description="품목/카테고리/입출고 기록 전체를 CSV(또는 Parquet) 파일로 내보냅니다(관리자 전용).")
+@app_commands.choices(
+    형식=[
+        app_commands.Choice(name="CSV (gzip)", value="csv"),
+        app_commands.Choice(name="Parquet (pyarrow 필요)", value="parquet"),
+    ]
+)
+@app_commands.describe(기록포함="입출고 기록(보관된 분기 포함)도 내보낼지")
+async def export_cmd(inter: discord.Interaction, 형식: app_commands.Choice[str] | None = None, 기록포함: bool = True):
+    if not inter.guild:
+        return await inter.response.send_message("서버에서만 사용할 수 있어요.", ephemeral=True)
+
+    if not is_admin(inter, bot.conn):
+        return await inter.response.send_message("권한이 없어요.", ephemeral=True)
+
+    fmt = 형식.value if 형식 else "csv"
+    if fmt == "parquet" and not exporter.parquet_available():
+        return await inter.response.send_message("Parquet 내보내기는 서버에 pyarrow가 설치돼 있어야 해요. CSV를 써 주세요.", ephemeral=True)
+
+    await inter.response.defer(ephemeral=True, thinking=True)
+    try:
+        result = await exporter.export_guild_off_loop(bot.conn, inter.guild_id, fmt, 기록포함)
+    except Exception as e:
+        traceback.print_exc()
+        return await inter.followup.send(f"내보내기 실패: `{type(e).__name__}: {e}`", ephemeral=True)
+
+    text = exporter.build_export_text(result)
+    if result.total_bytes <= 8 * 1024 * 1024:
+        files = [discord.File(fp=str(p), filename=f"{result.out_dir.name}_{p.name}") for p in result.files]
+        try:
+            await inter.followup.send(text, files=files, ephemeral=True)
+        finally:
+            for f in files:
+                f.close()
+        # 올렸으면 서버 사본은 필요 없음(실패하면 남겨 두고 EXPORT_KEEP_DAYS 뒤 정리)
+        await asyncio.to_thread(exporter.remove_export, result.out_dir)
+    else:
+        await inter.followup.send(f"{text}\n(파일이 8MB를 넘어 서버에만 저장: `{result.out_dir}`, {exporter.export_keep_days()}일 뒤 자동 삭제)"[:1990], ephemeral=True)
+
+
 # ---- Slash command: /카테고리관리 ----
 @bot.tree.command(name="카테고리관리", description="카테고리 추가/비활성화(삭제)를 관리합니다.")
 async def category_manage_cmd(inter: discord.Interaction):
@@ -234,8 +538,8 @@ async def category_manage_cmd(inter: discord.Interaction):
     cats = list_categories(bot.conn, inter.guild_id, include_inactive=True)
     emb = discord.Embed(title="카테고리 관리", description="추가/비활성화(삭제 대체)를 할 수 있어요.")
 
-    act = [c["name"] for c in cats if c["is_active"] == 1]
-    ina = [c["name"] for c in cats if c["is_active"] == 0]
+    act = [c.name for c in cats if c.is_active == 1]
+    ina = [c.name for c in cats if c.is_active == 0]
     emb.add_field(name=f"활성({len(act)})", value="\n".join([f"- {n}" for n in act]) or "- 없음", inline=False)
     emb.add_field(name=f"비활성({len(ina)})", value="\n".join([f"- {n}" for n in ina]) or "- 없음", inline=False)
 
@@ -277,6 +581,18 @@ def main():
     bot.conn = connect(db_path)
     apply_schema(bot.conn, "./src/schema.sql")
 
+    # (1회) auto_vacuum=INCREMENTAL 전환 - 봇이 DB를 쓰기 전에
+    migrate_auto_vacuum(bot.conn)
+
+    # 보고서/검색/목록용 읽기 전용 커넥션 풀(DB_READ_POOL_SIZE, 0이면 끔)
+    attach_read_pool(bot.conn)
+
+    # 인터랙션 지연 계측(/상태, [SLOW] 로그). INSTRUMENT=0 이면 끔
+    instrument.install()
+
+    # SQL 프로파일러(SQL_PROFILE=1일 때만): [SLOW_SQL] 로그, /쿼리통계, 종료 시 상위 문장 저장
+    sql_profiler.enable_from_env()
+
     bot.run(token)
 
 
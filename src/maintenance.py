@@ -0,0 +1,239 @@
+# src/maintenance.py
+"""
+DB 파일 유지보수.
+
+- auto_vacuum=INCREMENTAL 1회 전환(VACUUM 재작성, 봇 시작 전)
+- 리포트 루프(1분)마다:
+  1) 1시간마다 page_count / freelist_count 기록(db_stats) → /db상태 에서 추이 확인
+  *) WAL 체크포인트(TRUNCATE): 일정 간격 또는 WAL이 커지면, 워커 스레드의 별도 커넥션에서
+  2) 한가할 때(최근 입출고 없음)만 빈 페이지를 조금씩 반환(PRAGMA incremental_vacuum)
+  3) 주기적으로 PRAGMA optimize, 하루 1번 ANALYZE
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from db import database_path, incremental_vacuum_step, wal_checkpoint_truncate
+from repo.db_stats_repo import get_last_db_stats, insert_db_stats, list_db_stats_since, read_page_stats
+from utils.time_kst import now_kst
+
+
+_AUTO_VACUUM_NAMES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def vacuum_pages_per_step() -> int:
+    return max(16, _env_int("VACUUM_PAGES_PER_STEP", 256))
+
+
+def migrate_auto_vacuum(conn: sqlite3.Connection) -> bool:
+    """
+    auto_vacuum을 INCREMENTAL로 1회 전환(이미 전환됐으면 아무것도 안 함).
+    - 전환에는 VACUUM(파일 전체 재작성)이 필요 → 봇이 커넥션을 쓰기 전 main()에서 호출
+    - DB 크기의 2배 이상 여유 공간이 없으면 건너뜀
+    - DB_AUTO_VACUUM_MIGRATE=0 이면 끔
+    """
+    if os.environ.get("DB_AUTO_VACUUM_MIGRATE", "1") == "0":
+        return False
+
+    before = read_page_stats(conn)
+    if before["auto_vacuum"] == 2:
+        return False
+
+    db_file = database_path(conn)
+    if db_file:
+        need = before["page_size"] * before["page_count"] * 2
+        free = shutil.disk_usage(Path(db_file).resolve().parent).free
+        if free < need:
+            print(f"[DB] auto_vacuum 전환 건너뜀: 여유 공간 부족(필요 {need} bytes, 남음 {free} bytes)")
+            return False
+
+    size_mb = before["page_size"] * before["page_count"] / (1024 * 1024)
+    print(f"[DB] auto_vacuum=INCREMENTAL 전환 시작(VACUUM, {size_mb:.1f}MB)")
+
+    started = time.monotonic()
+    last_print = started
+
+    def _progress() -> int:
+        nonlocal last_print
+        now = time.monotonic()
+        if now - last_print >= 2.0:
+            print(f"[DB] VACUUM 진행 중... {now - started:.0f}초 경과")
+            last_print = now
+        return 0
+
+    conn.set_progress_handler(_progress, 100_000)
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.execute("VACUUM;")
+    finally:
+        conn.set_progress_handler(None, 0)
+
+    after = read_page_stats(conn)
+    elapsed = time.monotonic() - started
+    k = now_kst()
+    insert_db_stats(
+        conn, "migrate", after,
+        f"pages {before['page_count']}→{after['page_count']}, {elapsed:.1f}s",
+        k.kst_text, k.epoch,
+    )
+    print(f"[DB] auto_vacuum 전환 완료: {before['page_count']} → {after['page_count']} pages ({elapsed:.1f}s)")
+    return True
+
+
+def _is_idle(conn: sqlite3.Connection, now_epoch: int) -> bool:
+    """최근 DB_IDLE_SEC초 동안 입출고 기록이 없으면 한가한 것으로 봄."""
+    row = conn.execute("SELECT created_at_epoch FROM movements ORDER BY id DESC LIMIT 1").fetchone()
+    if not row:
+        return True
+    return now_epoch - int(row[0]) >= _env_int("DB_IDLE_SEC", 300)
+
+
+async def reclaim_free_pages(conn: sqlite3.Connection, max_steps: int = 1000) -> int:
+    """빈 페이지를 조금씩 반환(한 번에 길게 잠그지 않게). 반환값: 반환한 페이지 수."""
+    if int(conn.execute("PRAGMA auto_vacuum;").fetchone()[0]) != 2:
+        return 0  # INCREMENTAL이 아니면 빈 페이지는 파일 안에서 재사용만 됨
+    pages = vacuum_pages_per_step()
+    before = int(conn.execute("PRAGMA freelist_count;").fetchone()[0])
+    remain = before
+    for _ in range(max_steps):
+        if remain <= 0:
+            break
+        left = incremental_vacuum_step(conn, pages)
+        if left >= remain:
+            break
+        remain = left
+        await asyncio.sleep(0.05)
+    return max(0, before - remain)
+
+
+def _wal_size_bytes(db_file: str) -> int:
+    try:
+        return os.path.getsize(db_file + "-wal")
+    except OSError:
+        return 0
+
+
+async def checkpoint_wal_if_due(conn: sqlite3.Connection, now_epoch: int, now_kst_text: str) -> bool:
+    """
+    WAL이 백업 사이에 계속 커지지 않게 체크포인트(TRUNCATE).
+    - DB_CHECKPOINT_MIN분마다, 또는 WAL이 DB_WAL_MAX_MB를 넘으면
+    - 봇 커넥션(이벤트 루프)이 아니라 워커 스레드의 별도 커넥션에서 실행
+    """
+    db_file = database_path(conn)
+    if not db_file:
+        return False
+
+    wal_bytes = _wal_size_bytes(db_file)
+    if wal_bytes == 0:
+        return False
+
+    last = get_last_db_stats(conn, "checkpoint")
+    due = not last or now_epoch - int(last["created_at_epoch"]) >= _env_int("DB_CHECKPOINT_MIN", 30) * 60
+    if not due and wal_bytes < _env_int("DB_WAL_MAX_MB", 64) * 1024 * 1024:
+        return False
+
+    busy, _, _ = await asyncio.to_thread(wal_checkpoint_truncate, db_file)
+    insert_db_stats(
+        conn, "checkpoint", read_page_stats(conn),
+        f"wal={wal_bytes // 1024}KB{' (busy)' if busy else ''}",
+        now_kst_text, now_epoch,
+    )
+    return True
+
+
+async def run_db_maintenance(client, busy: bool = False) -> None:
+    """
+    리포트 루프에서 매분 호출(길드와 무관한 DB 전체 작업).
+    busy=True(분기 정리 작업 진행 중 등)면 기록만 하고 나머지는 다음 기회로.
+    """
+    conn = client.conn
+    k = now_kst()
+
+    last = get_last_db_stats(conn, "hourly")
+    if not last or k.epoch - int(last["created_at_epoch"]) >= 3600 - 30:
+        insert_db_stats(conn, "hourly", read_page_stats(conn), "", k.kst_text, k.epoch)
+
+    await checkpoint_wal_if_due(conn, k.epoch, k.kst_text)
+
+    if busy or not _is_idle(conn, k.epoch):
+        return
+
+    # 빈 페이지 반환(1회 호출당 몇 조각만)
+    steps = max(1, _env_int("DB_VACUUM_STEPS_PER_TICK", 4))
+    freed = await reclaim_free_pages(conn, max_steps=steps)
+    if freed:
+        insert_db_stats(conn, "vacuum", read_page_stats(conn), f"freed_pages={freed}", k.kst_text, k.epoch)
+
+    # PRAGMA optimize(가벼움): DB_OPTIMIZE_HOURS마다
+    last_opt = get_last_db_stats(conn, "optimize")
+    if not last_opt or k.epoch - int(last_opt["created_at_epoch"]) >= _env_int("DB_OPTIMIZE_HOURS", 6) * 3600:
+        conn.execute("PRAGMA optimize;")
+        insert_db_stats(conn, "optimize", read_page_stats(conn), "", k.kst_text, k.epoch)
+
+    # ANALYZE: 하루 1번, DB_ANALYZE_HOUR(KST) 이후
+    today = k.dt.strftime("%Y/%m/%d")
+    last_an = get_last_db_stats(conn, "analyze")
+    if k.dt.hour >= _env_int("DB_ANALYZE_HOUR", 4) and (not last_an or not str(last_an["created_at_kst_text"]).startswith(today)):
+        started = time.monotonic()
+        conn.execute("PRAGMA analysis_limit = 1000;")  # 큰 테이블도 짧게(근사 통계)
+        conn.execute("ANALYZE;")
+        conn.commit()
+        insert_db_stats(
+            conn, "analyze", read_page_stats(conn),
+            f"{time.monotonic() - started:.2f}s", k.kst_text, k.epoch,
+        )
+
+
+def build_db_status_text(conn: sqlite3.Connection) -> str:
+    """/db상태 출력."""
+    st = read_page_stats(conn)
+
+    def mb(pages: int) -> float:
+        return pages * st["page_size"] / (1024 * 1024)
+
+    free_pct = (st["freelist_count"] / st["page_count"] * 100) if st["page_count"] else 0.0
+
+    lines = [
+        "🗄️ **DB 상태**",
+        f"- 크기: {mb(st['page_count']):.2f}MB ({st['page_count']} pages × {st['page_size']}B)",
+        f"- 빈 페이지: {st['freelist_count']} ({mb(st['freelist_count']):.2f}MB, {free_pct:.1f}%)",
+        f"- auto_vacuum: {_AUTO_VACUUM_NAMES.get(st['auto_vacuum'], st['auto_vacuum'])}",
+    ]
+
+    for event, label in (
+        ("vacuum", "마지막 빈 페이지 반환"),
+        ("checkpoint", "마지막 WAL 체크포인트"),
+        ("optimize", "마지막 optimize"),
+        ("analyze", "마지막 ANALYZE"),
+    ):
+        e = get_last_db_stats(conn, event)
+        if e:
+            detail = f" ({e['detail']})" if e.get("detail") else ""
+            lines.append(f"- {label}: {e['created_at_kst_text']}{detail}")
+
+    k = now_kst()
+    samples = list_db_stats_since(conn, k.epoch - 7 * 86400)
+    if samples:
+        first = samples[0]
+        lines.append(
+            f"- 7일 추이: {first['page_count']} → {st['page_count']} pages, "
+            f"빈 페이지 {first['freelist_count']} → {st['freelist_count']}"
+        )
+        lines.append("")
+        lines.append("최근 기록(시간 · pages · 빈 페이지)")
+        for s in samples[-8:]:
+            lines.append(f"`{s['created_at_kst_text']}` · {s['page_count']} · {s['freelist_count']}")
+
+    return "\n".join(lines)[:1990]
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import sqlite3
+from utils.metrics import LOW_STOCK_ALERTS
 from utils.time_kst import now_kst
 
 
@@ -69,4 +70,6 @@ def should_send_low_stock_alert(conn: sqlite3.Connection, guild_id: int, item_id
             conn.execute(f"UPDATE alert_state SET {', '.join(sets)} WHERE guild_id=? AND item_id=?", tuple(vals))
 
     conn.commit()
+    if send:
+        LOW_STOCK_ALERTS.inc(guild_id)
     return send
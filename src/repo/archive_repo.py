@@ -0,0 +1,56 @@
+# src/repo/archive_repo.py
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+from db import read_conn
+
+
+def upsert_archive_entry(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    quarter_key: str,
+    file_name: str,
+    start_epoch: int,
+    end_epoch: int,
+    row_count: int,
+    updated_at_kst_text: str,
+    updated_at_epoch: int,
+) -> None:
+    """길드 x 분기 보관 파일 기록(row_count는 보관 파일에서 센 값으로 덮어씀 → 재실행해도 정확)."""
+    conn.execute(
+        """
+        INSERT INTO movement_archives (
+            guild_id, quarter_key, file_name, start_epoch, end_epoch,
+            row_count, updated_at_kst_text, updated_at_epoch
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(guild_id, quarter_key) DO UPDATE SET
+            file_name=excluded.file_name,
+            row_count=excluded.row_count,
+            updated_at_kst_text=excluded.updated_at_kst_text,
+            updated_at_epoch=excluded.updated_at_epoch
+        """,
+        (
+            int(guild_id), quarter_key, file_name, int(start_epoch), int(end_epoch),
+            int(row_count), updated_at_kst_text, int(updated_at_epoch),
+        ),
+    )
+
+
+def list_archives_in_range(conn: sqlite3.Connection, guild_id: int, start_epoch: int, end_epoch: int) -> list[dict[str, Any]]:
+    """[start_epoch, end_epoch) 와 겹치는 보관 파일(오래된 순)."""
+    with read_conn(conn) as rc:
+        rows = rc.execute(
+            """
+            SELECT guild_id, quarter_key, file_name, start_epoch, end_epoch, row_count
+            FROM movement_archives
+            WHERE guild_id = ?
+              AND start_epoch < ?
+              AND end_epoch > ?
+              AND row_count > 0
+            ORDER BY start_epoch ASC
+            """,
+            (int(guild_id), int(end_epoch), int(start_epoch)),
+        ).fetchall()
+    return [dict(r) for r in rows]
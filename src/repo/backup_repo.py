@@ -0,0 +1,271 @@
+# src/repo/backup_repo.py
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+
+# 보관 기간이 지나면 정리되는 종류(월간 ZIP은 계속 보관)
+EXPIRING_KINDS = ("daily", "manual", "upload_zip", "guild_export")
+
+# 스냅샷(DB 파일) 종류
+SNAPSHOT_KINDS = ("daily", "manual")
+
+
+def _has_column(conn: sqlite3.Connection, table: str, col: str) -> bool:
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return any(r[1] == col for r in rows)
+
+
+def ensure_backup_catalog_schema(conn: sqlite3.Connection) -> None:
+    """
+    백업 카탈로그 컬럼/인덱스 보강(초기 버전 카탈로그 호환).
+    - snapshot_key: 일일=YYYY-MM-DD, 월간=YYYY-MM (스케줄/월간 묶음 조회용)
+    - deleted_at_epoch: 보관기간 정리로 파일을 지운 시각(행은 이력으로 남김)
+    - guild_id: 길드 단위 내보내기 파일의 길드(전체 DB 스냅샷은 NULL)
+    """
+    if not _has_column(conn, "backup_catalog", "snapshot_key"):
+        conn.execute("ALTER TABLE backup_catalog ADD COLUMN snapshot_key TEXT NOT NULL DEFAULT ''")
+    if not _has_column(conn, "backup_catalog", "deleted_at_epoch"):
+        conn.execute("ALTER TABLE backup_catalog ADD COLUMN deleted_at_epoch INTEGER")
+    if not _has_column(conn, "backup_catalog", "guild_id"):
+        conn.execute("ALTER TABLE backup_catalog ADD COLUMN guild_id INTEGER")
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_backup_catalog_kind_key "
+        "ON backup_catalog(kind, snapshot_key, guild_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_backup_catalog_live_epoch "
+        "ON backup_catalog(deleted_at_epoch, created_at_epoch DESC)"
+    )
+    conn.commit()
+
+
+def upsert_backup_entry(
+    conn: sqlite3.Connection,
+    file_name: str,
+    kind: str,
+    size_bytes: int,
+    src_counts: dict[str, int] | None,
+    created_at_kst_text: str,
+    created_at_epoch: int,
+    snapshot_key: str = "",
+    guild_id: int | None = None,
+) -> int:
+    """
+    백업 파일 1개를 카탈로그에 기록(같은 파일명이면 덮어쓰기 = 같은 날 재백업).
+    - 검증 상태는 항상 pending으로 초기화
+    - 스케줄 백업(daily) 파일을 수동 백업이 덮어써도 kind는 daily 유지(그날 스케줄 완료 판단용)
+    반환값: backup_catalog.id
+    """
+    src_counts = src_counts or {}
+    conn.execute(
+        """
+        INSERT INTO backup_catalog (
+            file_name, kind, guild_id, snapshot_key, size_bytes, sha256,
+            src_items, src_movements, src_categories,
+            verify_status, verify_detail, verified_at_epoch,
+            created_at_kst_text, created_at_epoch, deleted_at_epoch
+        ) VALUES (?, ?, ?, ?, ?, '', ?, ?, ?, 'pending', '', NULL, ?, ?, NULL)
+        ON CONFLICT(file_name) DO UPDATE SET
+            kind=CASE WHEN backup_catalog.kind='daily' THEN 'daily' ELSE excluded.kind END,
+            snapshot_key=excluded.snapshot_key,
+            size_bytes=excluded.size_bytes,
+            sha256='',
+            src_items=excluded.src_items,
+            src_movements=excluded.src_movements,
+            src_categories=excluded.src_categories,
+            verify_status='pending',
+            verify_detail='',
+            verified_at_epoch=NULL,
+            created_at_kst_text=excluded.created_at_kst_text,
+            created_at_epoch=excluded.created_at_epoch,
+            deleted_at_epoch=NULL
+        """,
+        (
+            file_name, kind, guild_id, snapshot_key, int(size_bytes),
+            src_counts.get("items"), src_counts.get("movements"), src_counts.get("categories"),
+            created_at_kst_text, int(created_at_epoch),
+        ),
+    )
+    row = conn.execute("SELECT id FROM backup_catalog WHERE file_name=?", (file_name,)).fetchone()
+    conn.commit()
+    return int(row[0])
+
+
+def insert_legacy_backup_entry(
+    conn: sqlite3.Connection,
+    file_name: str,
+    kind: str,
+    snapshot_key: str,
+    size_bytes: int,
+    created_at_kst_text: str,
+    created_at_epoch: int,
+) -> None:
+    """카탈로그 도입 전에 만들어진 파일 등록(이미 있으면 그대로 둠, 검증 이력 없음=unverified)."""
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO backup_catalog (
+            file_name, kind, snapshot_key, size_bytes, sha256,
+            verify_status, verify_detail,
+            created_at_kst_text, created_at_epoch
+        ) VALUES (?, ?, ?, ?, '', 'unverified', '', ?, ?)
+        """,
+        (file_name, kind, snapshot_key, int(size_bytes), created_at_kst_text, int(created_at_epoch)),
+    )
+
+
+def record_backup_skip(
+    conn: sqlite3.Connection,
+    file_name: str,
+    kind: str,
+    snapshot_key: str,
+    reason: str,
+    created_at_kst_text: str,
+    created_at_epoch: int,
+    guild_id: int | None = None,
+) -> None:
+    """
+    파일은 안 만들었지만 '이 회차는 처리 끝'을 남길 때(예: 지난달 일일 백업이 없어 월간 ZIP 생략).
+    목록에는 안 보이도록 deleted_at_epoch를 같이 채운다.
+    """
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO backup_catalog (
+            file_name, kind, guild_id, snapshot_key, size_bytes, sha256,
+            verify_status, verify_detail,
+            created_at_kst_text, created_at_epoch, deleted_at_epoch
+        ) VALUES (?, ?, ?, ?, 0, '', 'skipped', ?, ?, ?, ?)
+        """,
+        (
+            file_name, kind, guild_id, snapshot_key, reason,
+            created_at_kst_text, int(created_at_epoch), int(created_at_epoch),
+        ),
+    )
+    conn.commit()
+
+
+def mark_backup_verified(
+    conn: sqlite3.Connection,
+    backup_id: int,
+    status: str,
+    detail: str,
+    sha256: str,
+    size_bytes: int,
+    verified_at_epoch: int,
+) -> None:
+    conn.execute(
+        """
+        UPDATE backup_catalog
+           SET verify_status=?, verify_detail=?, sha256=?, size_bytes=?, verified_at_epoch=?
+         WHERE id=?
+        """,
+        (status, (detail or "")[:500], sha256 or "", int(size_bytes), int(verified_at_epoch), int(backup_id)),
+    )
+    conn.commit()
+
+
+def has_backup(conn: sqlite3.Connection, kind: str, snapshot_key: str, guild_id: int | None = None) -> bool:
+    """해당 회차(kind + snapshot_key [+ guild])가 이미 처리됐는지(정리된 파일 포함)."""
+    row = conn.execute(
+        "SELECT 1 FROM backup_catalog WHERE kind=? AND snapshot_key=? AND guild_id IS ? LIMIT 1",
+        (kind, snapshot_key, guild_id),
+    ).fetchone()
+    return row is not None
+
+
+def list_backup_entries(conn: sqlite3.Connection, limit: int = 20, guild_id: int | None = None) -> list[dict[str, Any]]:
+    """
+    현재 남아있는 백업 파일 목록(최신순).
+    guild_id를 주면 전체 DB 파일 + 그 길드 파일만(다른 길드 내보내기는 제외).
+    """
+    rows = conn.execute(
+        """
+        SELECT id, file_name, kind, guild_id, snapshot_key, size_bytes, sha256,
+               verify_status, verify_detail, verified_at_epoch,
+               created_at_kst_text, created_at_epoch
+        FROM backup_catalog
+        WHERE deleted_at_epoch IS NULL
+          AND (? IS NULL OR guild_id IS NULL OR guild_id = ?)
+        ORDER BY created_at_epoch DESC, id DESC
+        LIMIT ?
+        """,
+        (guild_id, guild_id, int(limit)),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def list_snapshots_for_month(
+    conn: sqlite3.Connection,
+    ym: str,
+    kinds: tuple[str, ...] = SNAPSHOT_KINDS,
+    guild_id: int | None = None,
+) -> list[dict[str, Any]]:
+    """해당 월(YYYY-MM)의 스냅샷 파일(남아있는 것만, 날짜순). 기본은 전체 DB 일일/수동 스냅샷."""
+    qs = ",".join(["?"] * len(kinds))
+    rows = conn.execute(
+        f"""
+        SELECT id, file_name, kind, guild_id, snapshot_key, size_bytes
+        FROM backup_catalog
+        WHERE kind IN ({qs})
+          AND snapshot_key >= ? AND snapshot_key < ?
+          AND guild_id IS ?
+          AND deleted_at_epoch IS NULL
+        ORDER BY snapshot_key ASC, id ASC
+        """,
+        (*kinds, f"{ym}-", f"{ym}-~", guild_id),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def list_expired_backups(conn: sqlite3.Connection, before_epoch: int) -> list[dict[str, Any]]:
+    """보관 기간이 지난(정리 대상) 파일들."""
+    qs = ",".join(["?"] * len(EXPIRING_KINDS))
+    rows = conn.execute(
+        f"""
+        SELECT id, file_name, kind
+        FROM backup_catalog
+        WHERE deleted_at_epoch IS NULL
+          AND created_at_epoch < ?
+          AND kind IN ({qs})
+        """,
+        (int(before_epoch), *EXPIRING_KINDS),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def mark_backups_deleted(conn: sqlite3.Connection, backup_ids: list[int], deleted_at_epoch: int) -> None:
+    if not backup_ids:
+        return
+    conn.executemany(
+        "UPDATE backup_catalog SET deleted_at_epoch=? WHERE id=?",
+        [(int(deleted_at_epoch), int(i)) for i in backup_ids],
+    )
+    conn.commit()
+
+
+def find_restore_bases(conn: sqlite3.Connection, guild_id: int, at_epoch: int) -> list[dict[str, Any]]:
+    """
+    시점 복원 기준 후보(at_epoch 이전에 만든 스냅샷, 가까운 순).
+    - 전체 DB 일일/수동 스냅샷 + 해당 길드 내보내기 파일
+    - 검증 실패 파일은 제외(파일 존재 여부는 호출 쪽에서 확인)
+    """
+    qs = ",".join(["?"] * len(SNAPSHOT_KINDS))
+    rows = conn.execute(
+        f"""
+        SELECT id, file_name, kind, guild_id, snapshot_key, verify_status,
+               created_at_kst_text, created_at_epoch
+        FROM backup_catalog
+        WHERE deleted_at_epoch IS NULL
+          AND created_at_epoch <= ?
+          AND verify_status != 'failed'
+          AND (
+                (kind IN ({qs}) AND guild_id IS NULL)
+             OR (kind = 'guild_export' AND guild_id = ?)
+          )
+        ORDER BY created_at_epoch DESC, id DESC
+        """,
+        (int(at_epoch), *SNAPSHOT_KINDS, int(guild_id)),
+    ).fetchall()
+    return [dict(r) for r in rows]
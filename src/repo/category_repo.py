@@ -4,6 +4,8 @@ from __future__ import annotations
 import sqlite3
 from typing import Any
 
+from db import read_conn
+from repo.records import Category, fetch_records
 from utils.time_kst import now_kst
 
 ETC_CATEGORY_NAME = "기타"
@@ -65,52 +67,37 @@ def ensure_categories_schema(conn: sqlite3.Connection):
     conn.commit()
 
 
-def list_categories(conn: sqlite3.Connection, guild_id: int, include_inactive: bool = False) -> list[dict]:
+def list_categories(conn: sqlite3.Connection, guild_id: int, include_inactive: bool = False) -> list[Category]:
     # 스키마 보강(안전장치)
     ensure_categories_schema(conn)
 
-    has_deact = _has_column(conn, "categories", "deactivated_at")
-    has_sort = _has_column(conn, "categories", "sort_order")
-    has_created = _has_column(conn, "categories", "created_at")
-    has_updated = _has_column(conn, "categories", "updated_at")
-
-    cols = ["id", "name", "is_active"]
-    cols.append("deactivated_at" if has_deact else "NULL AS deactivated_at")
-    cols.append("sort_order" if has_sort else "999 AS sort_order")
-    cols.append("created_at" if has_created else "NULL AS created_at")
-    cols.append("updated_at" if has_updated else "NULL AS updated_at")
-
-    sql = f"SELECT {', '.join(cols)} FROM categories WHERE guild_id=? "
-    params: list[Any] = [guild_id]
-    if not include_inactive:
-        sql += "AND is_active=1 "
-    sql += "ORDER BY sort_order ASC, name ASC"
-
-    rows = conn.execute(sql, params).fetchall()
-    out = []
-    for r in rows:
-        out.append(
-            {
-                "id": r[0],
-                "name": r[1],
-                "is_active": r[2],
-                "deactivated_at": r[3],
-                "sort_order": r[4],
-                "created_at": r[5],
-                "updated_at": r[6],
-            }
-        )
-    return out
+    with read_conn(conn) as rc:
+        has_deact = _has_column(rc, "categories", "deactivated_at")
+        has_sort = _has_column(rc, "categories", "sort_order")
+        has_created = _has_column(rc, "categories", "created_at")
+        has_updated = _has_column(rc, "categories", "updated_at")
+
+        cols = ["id", "name", "is_active"]
+        cols.append("deactivated_at" if has_deact else "NULL AS deactivated_at")
+        cols.append("sort_order" if has_sort else "999 AS sort_order")
+        cols.append("created_at" if has_created else "NULL AS created_at")
+        cols.append("updated_at" if has_updated else "NULL AS updated_at")
+
+        sql = f"SELECT {', '.join(cols)} FROM categories WHERE guild_id=? "
+        params: list[Any] = [guild_id]
+        if not include_inactive:
+            sql += "AND is_active=1 "
+        sql += "ORDER BY sort_order ASC, name ASC"
+
+        return fetch_records(rc, Category, sql, params)
 
 
-def list_active_categories(conn: sqlite3.Connection, guild_id: int) -> list[dict]:
+def list_active_categories(conn: sqlite3.Connection, guild_id: int) -> list[Category]:
     """
     ✅ item_add.py에서 필요로 하는 함수
-    - active 카테고리만
-    - {id, name} 최소 형태
+    - active 카테고리만(c.id / c.name)
     """
-    cats = list_categories(conn, guild_id, include_inactive=False)
-    return [{"id": c["id"], "name": c["name"]} for c in cats]
+    return list_categories(conn, guild_id, include_inactive=False)
 
 
 def get_or_create_etc_category(conn: sqlite3.Connection, guild_id: int) -> int:
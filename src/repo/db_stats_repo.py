@@ -0,0 +1,57 @@
+# src/repo/db_stats_repo.py
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+
+def read_page_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    return {
+        "page_size": int(conn.execute("PRAGMA page_size;").fetchone()[0]),
+        "page_count": int(conn.execute("PRAGMA page_count;").fetchone()[0]),
+        "freelist_count": int(conn.execute("PRAGMA freelist_count;").fetchone()[0]),
+        "auto_vacuum": int(conn.execute("PRAGMA auto_vacuum;").fetchone()[0]),
+    }
+
+
+def insert_db_stats(
+    conn: sqlite3.Connection,
+    event: str,
+    stats: dict[str, int],
+    detail: str,
+    created_at_kst_text: str,
+    created_at_epoch: int,
+) -> None:
+    conn.execute(
+        """
+        INSERT INTO db_stats (
+            event, page_size, page_count, freelist_count, auto_vacuum, detail,
+            created_at_kst_text, created_at_epoch
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            event, stats["page_size"], stats["page_count"], stats["freelist_count"], stats["auto_vacuum"],
+            (detail or "")[:500], created_at_kst_text, int(created_at_epoch),
+        ),
+    )
+    conn.commit()
+
+
+def get_last_db_stats(conn: sqlite3.Connection, event: str) -> dict[str, Any] | None:
+    row = conn.execute(
+        "SELECT * FROM db_stats WHERE event=? ORDER BY created_at_epoch DESC, id DESC LIMIT 1",
+        (event,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def list_db_stats_since(conn: sqlite3.Connection, since_epoch: int, event: str = "hourly") -> list[dict[str, Any]]:
+    rows = conn.execute(
+        """
+        SELECT * FROM db_stats
+        WHERE event=? AND created_at_epoch >= ?
+        ORDER BY created_at_epoch ASC, id ASC
+        """,
+        (event, int(since_epoch)),
+    ).fetchall()
+    return [dict(r) for r in rows]
@@ -0,0 +1,96 @@
+# src/repo/history_repo.py
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from db import read_conn
+from repo.records import Movement, fetch_records
+from utils.metrics import cache_lookup
+
+_MOVEMENT_SELECT = ", ".join(Movement.__slots__)
+
+
+def _cache_items() -> int:
+    try:
+        return max(0, int(os.environ.get("HISTORY_CACHE_ITEMS", "256")))
+    except ValueError:
+        return 256
+
+
+# (guild_id, item_id) → (limit, 최신 페이지). 입출고 시 invalidate_item_history로 비움
+_newest: OrderedDict[tuple[int, int], tuple[int, list[Movement]]] = OrderedDict()
+# 비운 횟수: 조회 도중 입출고가 끼면(읽기 풀은 다른 스레드) 옛 결과를 캐시에 넣지 않도록 비교
+_versions: dict[tuple[int, int], int] = {}
+_lock = threading.Lock()
+
+
+def invalidate_item_history(guild_id: int, item_id: int | None) -> None:
+    if item_id is None:
+        return
+    key = (int(guild_id), int(item_id))
+    with _lock:
+        _newest.pop(key, None)
+        _versions[key] = _versions.get(key, 0) + 1
+
+
+def list_item_movements_page(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    item_id: int,
+    before: tuple[int, int] | None = None,
+    limit: int = 10,
+) -> list[Movement]:
+    """
+    품목 1개 이력(최신순) 한 페이지.
+    - keyset: before=(created_at_epoch, id) 보다 오래된 것만 → 깊은 페이지도 OFFSET 없이
+      idx_movements_item_epoch에서 바로 시작 위치를 찾음(같은 시각 안에서만 정렬)
+    - 다음 페이지 여부 판단용으로 limit+1개까지 반환할 수 있음(호출 쪽에서 자름)
+    - 첫 페이지(before=None)는 품목별로 캐시
+    """
+    key = (int(guild_id), int(item_id))
+    fetch_n = int(limit) + 1
+
+    if before is None:
+        with _lock:
+            hit = _newest.get(key)
+            if hit is not None and hit[0] == fetch_n:
+                _newest.move_to_end(key)
+            else:
+                hit = None
+            version = _versions.get(key, 0)
+        cache_lookup("item_history", hit is not None)
+        if hit is not None:
+            return list(hit[1])
+
+    if before is None:
+        sql = f"""
+            SELECT {_MOVEMENT_SELECT} FROM movements
+            WHERE item_id = ? AND guild_id = ?
+            ORDER BY created_at_epoch DESC, id DESC
+            LIMIT ?
+        """
+        params: tuple = (key[1], key[0], fetch_n)
+    else:
+        sql = f"""
+            SELECT {_MOVEMENT_SELECT} FROM movements
+            WHERE item_id = ? AND guild_id = ? AND (created_at_epoch, id) < (?, ?)
+            ORDER BY created_at_epoch DESC, id DESC
+            LIMIT ?
+        """
+        params = (key[1], key[0], int(before[0]), int(before[1]), fetch_n)
+
+    with read_conn(conn) as rc:
+        rows = fetch_records(rc, Movement, sql, params)
+
+    if before is None and _cache_items() > 0:
+        with _lock:
+            if _versions.get(key, 0) == version:
+                _newest[key] = (fetch_n, rows)
+                _newest.move_to_end(key)
+                while len(_newest) > _cache_items():
+                    _newest.popitem(last=False)
+        rows = list(rows)
+    return rows
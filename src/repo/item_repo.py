@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 import sqlite3
+
+from db import read_conn
+from repo.records import Item, fetch_records
 from utils.time_kst import now_kst
 
 
@@ -63,24 +66,25 @@ def count_active_items(conn: sqlite3.Connection, guild_id: int, category_id: int
     - category_id가 주어지면 해당 카테고리만 카운트
     - None이면 서버 전체 카운트
     """
-    if category_id is None:
-        row = conn.execute(
-            """
-            SELECT COUNT(*)
-            FROM items
-            WHERE guild_id=? AND is_active=1
-            """,
-            (guild_id,),
-        ).fetchone()
-    else:
-        row = conn.execute(
-            """
-            SELECT COUNT(*)
-            FROM items
-            WHERE guild_id=? AND category_id=? AND is_active=1
-            """,
-            (guild_id, category_id),
-        ).fetchone()
+    with read_conn(conn) as rc:
+        if category_id is None:
+            row = rc.execute(
+                """
+                SELECT COUNT(*)
+                FROM items
+                WHERE guild_id=? AND is_active=1
+                """,
+                (guild_id,),
+            ).fetchone()
+        else:
+            row = rc.execute(
+                """
+                SELECT COUNT(*)
+                FROM items
+                WHERE guild_id=? AND category_id=? AND is_active=1
+                """,
+                (guild_id, category_id),
+            ).fetchone()
     return int(row[0] if row else 0)
 
 def list_active_items(
@@ -90,47 +94,34 @@ def list_active_items(
     *,
     offset: int = 0,
     limit: int = 20,
-) -> list[dict]:
+) -> list[Item]:
     """특정 카테고리의 활성 품목 목록(페이지네이션)"""
-    rows = conn.execute(
-        """
-        SELECT
-            i.id, i.name, i.code, i.image_url,
-            i.qty, i.warn_below,
-            i.note, i.storage_location,
-            COALESCE(c.name,'기타') AS category_name
-        FROM items i
-        LEFT JOIN categories c ON c.id=i.category_id
-        WHERE i.guild_id=? AND i.category_id=? AND i.is_active=1
-        ORDER BY i.name ASC
-        LIMIT ? OFFSET ?
-        """,
-        (guild_id, category_id, int(limit), int(offset)),
-    ).fetchall()
-
-    out: list[dict] = []
-    for r in rows:
-        out.append(
-            {
-                "id": r[0],
-                "name": r[1],
-                "code": r[2],
-                "image_url": r[3],
-                "qty": r[4],
-                "warn_below": r[5],
-                "note": r[6],
-                "storage_location": r[7],
-                "category_name": r[8],
-            }
+    with read_conn(conn) as rc:
+        return fetch_records(
+            rc,
+            Item,
+            """
+            SELECT
+                i.id, i.name, i.code, i.image_url,
+                i.qty, i.warn_below,
+                i.note, i.storage_location,
+                COALESCE(c.name,'기타') AS category_name
+            FROM items i
+            LEFT JOIN categories c ON c.id=i.category_id
+            WHERE i.guild_id=? AND i.category_id=? AND i.is_active=1
+            ORDER BY i.name ASC
+            LIMIT ? OFFSET ?
+            """,
+            (guild_id, category_id, int(limit), int(offset)),
         )
-    return out
 
 def count_items_by_category(conn: sqlite3.Connection, guild_id: int, category_id: int) -> int:
-    row = conn.execute(
-        """SELECT COUNT(1) FROM items
-           WHERE guild_id=? AND category_id=? AND is_active=1""",
-        (guild_id, category_id),
-    ).fetchone()
+    with read_conn(conn) as rc:
+        row = rc.execute(
+            """SELECT COUNT(1) FROM items
+               WHERE guild_id=? AND category_id=? AND is_active=1""",
+            (guild_id, category_id),
+        ).fetchone()
     return int(row[0] if row else 0)
 
 
@@ -140,39 +131,25 @@ def list_items_by_category(
     category_id: int,
     offset: int = 0,
     limit: int = 20,
-) -> list[dict]:
-    rows = conn.execute(
-        """
-        SELECT
-            i.id, i.name, i.code, i.image_url,
-            i.qty, i.warn_below,
-            COALESCE(c.name,'기타') AS category_name,
-            i.note, i.storage_location
-        FROM items i
-        LEFT JOIN categories c ON c.id=i.category_id
-        WHERE i.guild_id=? AND i.category_id=? AND i.is_active=1
-        ORDER BY i.name ASC
-        LIMIT ? OFFSET ?
-        """,
-        (guild_id, category_id, int(limit), int(offset)),
-    ).fetchall()
-
-    out: list[dict] = []
-    for r in rows:
-        out.append(
-            {
-                "id": r[0],
-                "name": r[1],
-                "code": r[2],
-                "image_url": r[3],
-                "qty": r[4],
-                "warn_below": r[5],
-                "category_name": r[6],
-                "note": r[7],
-                "storage_location": r[8],
-            }
+) -> list[Item]:
+    with read_conn(conn) as rc:
+        return fetch_records(
+            rc,
+            Item,
+            """
+            SELECT
+                i.id, i.name, i.code, i.image_url,
+                i.qty, i.warn_below,
+                i.note, i.storage_location,
+                COALESCE(c.name,'기타') AS category_name
+            FROM items i
+            LEFT JOIN categories c ON c.id=i.category_id
+            WHERE i.guild_id=? AND i.category_id=? AND i.is_active=1
+            ORDER BY i.name ASC
+            LIMIT ? OFFSET ?
+            """,
+            (guild_id, category_id, int(limit), int(offset)),
         )
-    return out
 
 
 # 과거 코드 호환: UI/다른 모듈이 create_item을 import하는 경우가 있어 alias 제공
@@ -202,40 +179,28 @@ def create_item(
     )
 
 
-def search_items(conn: sqlite3.Connection, guild_id: int, keyword: str, limit: int = 20) -> list[dict]:
+def search_items(conn: sqlite3.Connection, guild_id: int, keyword: str, limit: int = 20) -> list[Item]:
     kw = f"%{(keyword or '').strip()}%"
-    rows = conn.execute(
-        """
-        SELECT
-            i.id, i.name, i.code, i.image_url,
-            i.qty, c.name AS category_name,
-            i.note, i.storage_location
-        FROM items i
-        LEFT JOIN categories c ON c.id=i.category_id
-        WHERE i.guild_id=?
-          AND i.is_active=1
-          AND (i.name LIKE ? OR IFNULL(i.code,'') LIKE ?)
-        ORDER BY i.name ASC
-        LIMIT ?
-        """,
-        (guild_id, kw, kw, limit),
-    ).fetchall()
-
-    out: list[dict] = []
-    for r in rows:
-        out.append(
-            {
-                "id": r[0],
-                "name": r[1],
-                "code": r[2],
-                "image_url": r[3],
-                "qty": r[4],
-                "category_name": r[5],
-                "note": r[6],
-                "storage_location": r[7],
-            }
+    with read_conn(conn) as rc:
+        return fetch_records(
+            rc,
+            Item,
+            """
+            SELECT
+                i.id, i.name, i.code, i.image_url,
+                i.qty, i.warn_below,
+                i.note, i.storage_location,
+                COALESCE(c.name,'기타') AS category_name
+            FROM items i
+            LEFT JOIN categories c ON c.id=i.category_id
+            WHERE i.guild_id=?
+              AND i.is_active=1
+              AND (i.name LIKE ? OR IFNULL(i.code,'') LIKE ?)
+            ORDER BY i.name ASC
+            LIMIT ?
+            """,
+            (guild_id, kw, kw, limit),
         )
-    return out
 
 
 def deactivate_item(conn: sqlite3.Connection, guild_id: int, item_id: int, reason: str = ""):
@@ -270,28 +235,49 @@ def set_item_image(conn: sqlite3.Connection, guild_id: int, item_id: int, image_
     conn.commit()
 
 
-def search_items_inactive(conn: sqlite3.Connection, guild_id: int, keyword: str, limit: int = 20) -> list[dict]:
+def search_items_inactive(conn: sqlite3.Connection, guild_id: int, keyword: str, limit: int = 20) -> list[Item]:
     kw = f"%{(keyword or '').strip()}%"
-    rows = conn.execute(
-        """
-        SELECT i.id, i.name, i.code, i.qty, i.note, i.storage_location,
-               COALESCE(c.name,'기타') AS category_name,
-               i.image_url
-        FROM items i
-        LEFT JOIN categories c ON c.id=i.category_id
-        WHERE i.guild_id=? AND i.is_active=0 AND (i.name LIKE ? OR IFNULL(i.code,'') LIKE ?)
-        ORDER BY i.updated_at DESC
-        LIMIT ?
-        """,
-        (guild_id, kw, kw, limit),
-    ).fetchall()
+    with read_conn(conn) as rc:
+        return fetch_records(
+            rc,
+            Item,
+            """
+            SELECT
+                i.id, i.name, i.code, i.image_url,
+                i.qty, i.warn_below,
+                i.note, i.storage_location,
+                COALESCE(c.name,'기타') AS category_name,
+                i.is_active
+            FROM items i
+            LEFT JOIN categories c ON c.id=i.category_id
+            WHERE i.guild_id=? AND i.is_active=0 AND (i.name LIKE ? OR IFNULL(i.code,'') LIKE ?)
+            ORDER BY i.updated_at DESC
+            LIMIT ?
+            """,
+            (guild_id, kw, kw, limit),
+        )
 
-    out: list[dict] = []
-    for r in rows:
-        # sqlite3 row_factory가 꺼져 있으면 tuple일 수 있음
-        if isinstance(r, dict):
-            out.append(r)
-        else:
-            keys = ["id","name","code","qty","note","storage_location","category_name","image_url"]
-            out.append({keys[i]: r[i] for i in range(len(keys))})
-    return out
+def bulk_update_warn_below(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    changes: list[tuple[int, int, int]],
+) -> int:
+    """
+    경고 기준 일괄 변경(한 트랜잭션). changes: (item_id, 검토 때 본 warn_below, 새 값)
+    - 검토하는 사이 누가 손으로 바꾼 품목은 건너뜀(warn_below가 검토 때 값과 같을 때만 변경)
+    반환값: 실제로 바뀐 품목 수
+    """
+    k = now_kst().kst_text
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        cur.executemany(
+            "UPDATE items SET warn_below=?, updated_at=? WHERE guild_id=? AND id=? AND warn_below=?",
+            [(int(new), k, int(guild_id), int(item_id), int(old)) for item_id, old, new in changes],
+        )
+        changed = max(0, cur.rowcount)   # executemany: 바뀐 행 수 합계
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return int(changed)
@@ -0,0 +1,77 @@
+# src/repo/maintenance_repo.py
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+
+def start_job(
+    conn: sqlite3.Connection,
+    job_key: str,
+    kind: str,
+    guild_id: int | None,
+    cutoff_epoch: int,
+    started_at_kst_text: str,
+    started_at_epoch: int,
+) -> dict[str, Any]:
+    """
+    작업 행 생성 후 현재 상태 반환.
+    - 이미 있으면 진행 위치 그대로(같은 키로 다시 부르면 이어서 진행)
+    - 실패로 끝난 작업은 running으로 되돌려 재시도
+    """
+    conn.execute(
+        """
+        INSERT INTO maintenance_jobs (
+            job_key, kind, guild_id, cutoff_epoch, last_id, rows_done, status, detail,
+            started_at_kst_text, started_at_epoch, updated_at_epoch
+        ) VALUES (?, ?, ?, ?, 0, 0, 'running', '', ?, ?, ?)
+        ON CONFLICT(job_key) DO UPDATE SET
+            status='running',
+            finished_at_epoch=NULL
+        WHERE maintenance_jobs.status='failed'
+        """,
+        (job_key, kind, guild_id, int(cutoff_epoch), started_at_kst_text, int(started_at_epoch), int(started_at_epoch)),
+    )
+    conn.commit()
+    return get_job(conn, job_key)
+
+
+def get_job(conn: sqlite3.Connection, job_key: str) -> dict[str, Any] | None:
+    row = conn.execute("SELECT * FROM maintenance_jobs WHERE job_key=?", (job_key,)).fetchone()
+    return dict(row) if row else None
+
+
+def list_running_jobs(conn: sqlite3.Connection, guild_id: int | None = None) -> list[dict[str, Any]]:
+    rows = conn.execute(
+        """
+        SELECT * FROM maintenance_jobs
+        WHERE status='running' AND (? IS NULL OR guild_id = ?)
+        ORDER BY started_at_epoch ASC
+        """,
+        (guild_id, guild_id),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def record_job_progress(conn: sqlite3.Connection, job_key: str, last_id: int, rows: int, updated_at_epoch: int) -> None:
+    """진행 위치 기록(커밋은 호출 쪽: 실제 삭제와 같은 트랜잭션에 묶기 위해)."""
+    conn.execute(
+        """
+        UPDATE maintenance_jobs
+           SET last_id=?, rows_done=rows_done + ?, updated_at_epoch=?
+         WHERE job_key=?
+        """,
+        (int(last_id), int(rows), int(updated_at_epoch), job_key),
+    )
+
+
+def finish_job(conn: sqlite3.Connection, job_key: str, status: str, detail: str, finished_at_epoch: int) -> None:
+    conn.execute(
+        """
+        UPDATE maintenance_jobs
+           SET status=?, detail=?, updated_at_epoch=?, finished_at_epoch=?
+         WHERE job_key=?
+        """,
+        (status, (detail or "")[:500], int(finished_at_epoch), int(finished_at_epoch), job_key),
+    )
+    conn.commit()
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import sqlite3
+from repo.history_repo import invalidate_item_history
+from utils.metrics import STOCK_ACTIONS
 from utils.time_kst import now_kst
 
 
@@ -10,7 +12,8 @@ def _get_item_row(conn: sqlite3.Connection, guild_id: int, item_id: int) -> dict
         """
         SELECT
             i.id, i.name, i.code, i.qty, i.warn_below, i.category_id,
-            COALESCE(c.name, '기타') AS category_name
+            COALESCE(c.name, '기타') AS category_name,
+            COALESCE(i.image_url, '') AS image_url
         FROM items i
         LEFT JOIN categories c
           ON c.id = i.category_id AND c.guild_id = i.guild_id
@@ -26,7 +29,7 @@ def _get_item_row(conn: sqlite3.Connection, guild_id: int, item_id: int) -> dict
     try:
         return dict(row)
     except Exception:
-        keys = ["id", "name", "code", "qty", "warn_below", "category_id", "category_name"]
+        keys = ["id", "name", "code", "qty", "warn_below", "category_id", "category_name", "image_url"]
         return {k: row[i] for i, k in enumerate(keys)}
 
 
@@ -116,7 +119,7 @@ def apply_stock_change(
         """,
         (
             guild_id, item_id,
-            item_name, item_code, cat_name, None,
+            item_name, item_code or "", cat_name, item.get("image_url") or "",
             action, delta, before, after,
             reason, 1, "",
             actor_name, actor_id,
@@ -125,6 +128,8 @@ def apply_stock_change(
     )
 
     conn.commit()
+    invalidate_item_history(guild_id, item_id)
+    STOCK_ACTIONS.inc(guild_id, action)
 
     return {
         "item_id": item_id,
@@ -175,3 +180,4 @@ def log_simple_event(
         ),
     )
     conn.commit()
+    invalidate_item_history(guild_id, item_id)
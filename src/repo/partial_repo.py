@@ -0,0 +1,75 @@
+# src/repo/partial_repo.py
+from __future__ import annotations
+
+import sqlite3
+
+from db import read_conn
+
+
+def get_partial_fingerprints(conn: sqlite3.Connection, guild_id: int, first_day: str, last_day: str) -> dict[str, str]:
+    with read_conn(conn) as rc:
+        rows = rc.execute(
+            "SELECT day, fingerprint FROM report_day_partials WHERE guild_id=? AND day BETWEEN ? AND ?",
+            (int(guild_id), first_day, last_day),
+        ).fetchall()
+    return {str(r[0]): str(r[1]) for r in rows}
+
+
+def save_day_partial(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    day: str,
+    fingerprint: str,
+    row_count: int,
+    rollup: list[tuple],
+    created_at_epoch: int,
+) -> None:
+    """그날 조각 지문 + 품목별 합계를 한 트랜잭션으로 교체. rollup: (name, code, in, out, adj+, adj-, rows, first_row)"""
+    gid = int(guild_id)
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.execute("DELETE FROM daily_item_rollup WHERE guild_id=? AND day=?", (gid, day))
+        conn.executemany(
+            """
+            INSERT INTO daily_item_rollup (
+                guild_id, day, item_name, item_code, in_qty, out_qty, adj_plus, adj_minus, row_count, first_row
+            ) VALUES (?,?,?,?,?,?,?,?,?,?)
+            """,
+            [(gid, day, *r) for r in rollup],
+        )
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO report_day_partials (guild_id, day, fingerprint, row_count, created_at_epoch)
+            VALUES (?,?,?,?,?)
+            """,
+            (gid, day, fingerprint, int(row_count), int(created_at_epoch)),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def month_rollup(conn: sqlite3.Connection, guild_id: int, first_day: str, last_day: str) -> list[tuple]:
+    """기간 품목별 합계(처음 나온 순): (name, code, in, out, adj+, adj-, rows)"""
+    with read_conn(conn) as rc:
+        rows = rc.execute(
+            """
+            SELECT item_name, item_code, SUM(in_qty), SUM(out_qty), SUM(adj_plus), SUM(adj_minus), SUM(row_count)
+            FROM daily_item_rollup
+            WHERE guild_id=? AND day BETWEEN ? AND ?
+            GROUP BY item_name, item_code
+            ORDER BY MIN(printf('%s:%09d', day, first_row))
+            """,
+            (int(guild_id), first_day, last_day),
+        ).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def delete_partials_before(conn: sqlite3.Connection, guild_id: int, day: str) -> int:
+    gid = int(guild_id)
+    cur = conn.execute("DELETE FROM report_day_partials WHERE guild_id=? AND day < ?", (gid, day))
+    n = max(0, int(cur.rowcount))
+    conn.execute("DELETE FROM daily_item_rollup WHERE guild_id=? AND day < ?", (gid, day))
+    conn.commit()
+    return n
@@ -0,0 +1,135 @@
+# src/repo/records.py
+"""
+조회 결과용 가벼운 레코드 타입(__slots__) + 공용 변환 함수.
+
+- 행마다 dict를 만들지 않음(메모리/시간 절약, 속성 접근: item.name)
+- fetch_records: 커서의 row_factory를 끄고 튜플로 받아 클래스 생성자에 바로 넘김
+  SELECT 컬럼 순서가 __slots__ 앞부분과 같으면 위치 인자로(가장 빠름), 아니면 이름으로 매핑
+"""
+from __future__ import annotations
+
+import sqlite3
+from itertools import starmap
+from typing import Any, Sequence, TypeVar
+
+
+class _Record:
+    __slots__ = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Item(_Record):
+    __slots__ = (
+        "id", "name", "code", "image_url", "qty", "warn_below",
+        "note", "storage_location", "category_name", "is_active",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        code: str | None = None,
+        image_url: str | None = None,
+        qty: int = 0,
+        warn_below: int = 0,
+        note: str = "",
+        storage_location: str = "",
+        category_name: str = "기타",
+        is_active: int = 1,
+    ):
+        self.id = id
+        self.name = name
+        self.code = code
+        self.image_url = image_url
+        self.qty = qty
+        self.warn_below = warn_below
+        self.note = note
+        self.storage_location = storage_location
+        self.category_name = category_name
+        self.is_active = is_active
+
+
+class Category(_Record):
+    __slots__ = ("id", "name", "is_active", "deactivated_at", "sort_order", "created_at", "updated_at")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        is_active: int = 1,
+        deactivated_at: str | None = None,
+        sort_order: int = 999,
+        created_at: str | None = None,
+        updated_at: str | None = None,
+    ):
+        self.id = id
+        self.name = name
+        self.is_active = is_active
+        self.deactivated_at = deactivated_at
+        self.sort_order = sort_order
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+class Movement(_Record):
+    __slots__ = (
+        "id", "guild_id", "item_id", "item_name_snapshot", "item_code_snapshot", "category_name_snapshot",
+        "action", "qty_change", "before_qty", "after_qty",
+        "reason", "discord_name", "created_at_kst_text", "created_at_epoch",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        guild_id: int,
+        item_id: int | None = None,
+        item_name_snapshot: str = "",
+        item_code_snapshot: str = "",
+        category_name_snapshot: str = "",
+        action: str = "",
+        qty_change: int = 0,
+        before_qty: int = 0,
+        after_qty: int = 0,
+        reason: str = "",
+        discord_name: str = "",
+        created_at_kst_text: str = "",
+        created_at_epoch: int = 0,
+    ):
+        self.id = id
+        self.guild_id = guild_id
+        self.item_id = item_id
+        self.item_name_snapshot = item_name_snapshot
+        self.item_code_snapshot = item_code_snapshot
+        self.category_name_snapshot = category_name_snapshot
+        self.action = action
+        self.qty_change = qty_change
+        self.before_qty = before_qty
+        self.after_qty = after_qty
+        self.reason = reason
+        self.discord_name = discord_name
+        self.created_at_kst_text = created_at_kst_text
+        self.created_at_epoch = created_at_epoch
+
+
+R = TypeVar("R", bound=_Record)
+
+
+def fetch_records(conn: sqlite3.Connection, cls: type[R], sql: str, params: Sequence[Any] = ()) -> list[R]:
+    cur = conn.cursor()
+    cur.row_factory = None  # sqlite3.Row 생성 생략 → 튜플 그대로
+    cur.execute(sql, params)
+    names = tuple(d[0] for d in cur.description)
+    rows = cur.fetchall()
+
+    if names == cls.__slots__[: len(names)]:
+        return list(starmap(cls, rows))
+
+    # 컬럼 순서가 다르거나 레코드에 없는 컬럼이 섞인 경우
+    keep = [(i, n) for i, n in enumerate(names) if n in cls.__slots__]
+    return [cls(**{n: r[i] for i, n in keep}) for r in rows]
@@ -106,6 +106,10 @@ def _ensure_settings_columns(conn: sqlite3.Connection):
     if "last_quarter_cleanup" not in cols:
         conn.execute("ALTER TABLE settings ADD COLUMN last_quarter_cleanup TEXT")
 
+    # 마지막 주간 소모 분석 업로드 (YYYY-Www, ISO 주)
+    if "last_weekly_analytics_week" not in cols:
+        conn.execute("ALTER TABLE settings ADD COLUMN last_weekly_analytics_week TEXT")
+
     conn.commit()
 
 
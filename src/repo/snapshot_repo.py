@@ -0,0 +1,128 @@
+# src/repo/snapshot_repo.py
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from archive import iter_archived_rows
+from db import read_conn
+from utils.time_kst import KST
+
+
+def day_bounds(day: str) -> tuple[int, int, str]:
+    """'YYYY-MM-DD'(KST) → (시작 epoch, 다음날 0시 epoch, 다음날 0시 KST 텍스트)."""
+    start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=KST)
+    end = start + timedelta(days=1)
+    return int(start.timestamp()), int(end.timestamp()), end.strftime("%Y/%m/%d %H:%M:%S")
+
+
+def write_daily_snapshot(conn: sqlite3.Connection, guild_id: int, day: str) -> int:
+    """
+    day(KST) 24:00 기준 품목별 재고를 한 문장(INSERT…SELECT)으로 기록. 반환값: 기록한 품목 수.
+    - 자정이 지나서 돌아도 맞도록 현재 qty에서 자정 이후 movements 합계를 빼서 계산
+      (봇이 꺼져 있다가 며칠 뒤 켜져도 같은 방식으로 지난 날짜를 채울 수 있음)
+    - 그날 이후 생성된 품목은 제외(created_at은 KST 텍스트라 문자열 비교로 충분)
+    """
+    _, end_epoch, end_text = day_bounds(day)
+    cur = conn.execute(
+        """
+        INSERT OR REPLACE INTO inventory_snapshot (guild_id, day, item_id, qty)
+        SELECT
+            i.guild_id, ?, i.id,
+            i.qty - COALESCE((
+                SELECT SUM(m.qty_change) FROM movements m
+                WHERE m.item_id = i.id AND m.created_at_epoch >= ?
+            ), 0)
+        FROM items i
+        WHERE i.guild_id = ? AND i.created_at < ?
+        """,
+        (day, int(end_epoch), int(guild_id), end_text),
+    )
+    conn.commit()
+    return max(0, int(cur.rowcount))
+
+
+def last_snapshot_day(conn: sqlite3.Connection, guild_id: int) -> str | None:
+    row = conn.execute(
+        "SELECT MAX(day) FROM inventory_snapshot WHERE guild_id=?",
+        (int(guild_id),),
+    ).fetchone()
+    return str(row[0]) if row and row[0] else None
+
+
+def delete_snapshots_before(conn: sqlite3.Connection, guild_id: int, day: str) -> int:
+    cur = conn.execute(
+        "DELETE FROM inventory_snapshot WHERE guild_id=? AND day < ?",
+        (int(guild_id), day),
+    )
+    conn.commit()
+    return max(0, int(cur.rowcount))
+
+
+def _archived_sums(conn: sqlite3.Connection, guild_id: int, start_epoch: int, end_epoch: int) -> dict[int, int]:
+    """보관 파일로 옮겨진 [start, end) 기록의 품목별 qty_change 합계(운영 테이블에 남은 id 제외)."""
+    out: dict[int, int] = {}
+    for rows in iter_archived_rows(
+        conn, guild_id, start_epoch, end_epoch, "item_id, SUM(qty_change)", "AND item_id IS NOT NULL",
+        group_by="item_id", order_by="",
+    ):
+        for item_id, q in rows:
+            out[int(item_id)] = out.get(int(item_id), 0) + int(q or 0)
+    return out
+
+
+def stock_as_of(conn: sqlite3.Connection, guild_id: int, at_epoch: int) -> dict[int, int]:
+    """
+    at_epoch 시점 품목별 재고 {item_id: qty}(그 시점에 있던 품목만).
+    - at_epoch 이전 가장 가까운 스냅샷 + (스냅샷 자정 ~ at_epoch) movements 합계
+    - 스냅샷이 없거나 그 뒤에 생긴 품목은 현재 qty - (at_epoch 이후 movements 합계)로 거꾸로 계산
+    - 두 합계 모두 분기 정리로 보관 파일에 옮겨진 기록까지 포함
+    """
+    at_epoch = int(at_epoch)
+    at_day = datetime.fromtimestamp(at_epoch, KST)
+    at_text = at_day.strftime("%Y/%m/%d %H:%M:%S")
+
+    with read_conn(conn) as rc:
+        # 스냅샷 day는 그날 24:00 기준 → at 전날까지의 스냅샷만 사용 가능
+        row = rc.execute(
+            "SELECT MAX(day) FROM inventory_snapshot WHERE guild_id=? AND day < ?",
+            (int(guild_id), at_day.strftime("%Y-%m-%d")),
+        ).fetchone()
+    base_day = str(row[0]) if row and row[0] else None
+    base_end = day_bounds(base_day)[1] if base_day else at_epoch
+
+    # 보관 파일 합계는 읽기 커넥션을 잡기 전에(보관 목록 조회도 읽기 커넥션을 씀)
+    archived_gap = _archived_sums(conn, guild_id, base_end, at_epoch) if base_day else {}
+    archived_after = _archived_sums(conn, guild_id, at_epoch, 2 ** 62)
+
+    with read_conn(conn) as rc:
+        result: dict[int, int] = {}
+        if base_day:
+            for item_id, qty in rc.execute(
+                """
+                SELECT s.item_id, s.qty + COALESCE((
+                    SELECT SUM(m.qty_change) FROM movements m
+                    WHERE m.item_id = s.item_id AND m.created_at_epoch >= ? AND m.created_at_epoch < ?
+                ), 0)
+                FROM inventory_snapshot s
+                WHERE s.guild_id = ? AND s.day = ?
+                """,
+                (base_end, at_epoch, int(guild_id), base_day),
+            ):
+                result[int(item_id)] = int(qty) + archived_gap.get(int(item_id), 0)
+
+        # 스냅샷에 없는 품목(스냅샷 이후 생성 / 스냅샷 자체가 없음)
+        for item_id, qty in rc.execute(
+            """
+            SELECT i.id, i.qty - COALESCE((
+                SELECT SUM(m.qty_change) FROM movements m
+                WHERE m.item_id = i.id AND m.created_at_epoch >= ?
+            ), 0)
+            FROM items i
+            WHERE i.guild_id = ? AND i.created_at <= ?
+              AND i.id NOT IN (SELECT item_id FROM inventory_snapshot WHERE guild_id = ? AND day = ?)
+            """,
+            (at_epoch, int(guild_id), at_text, int(guild_id), base_day or ""),
+        ):
+            result[int(item_id)] = int(qty) - archived_after.get(int(item_id), 0)
+    return result
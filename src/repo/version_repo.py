@@ -0,0 +1,68 @@
+# src/repo/version_repo.py
+from __future__ import annotations
+
+import sqlite3
+
+from db import read_conn
+
+# 이 프로세스에서 트리거를 확인했는지(안 했으면 버전을 믿을 수 없음 → 캐시 안 씀)
+_triggers_ready = False
+
+_BUMP = (
+    "INSERT INTO data_versions (guild_id, items_version) VALUES ({row}.guild_id, 1) "
+    "ON CONFLICT(guild_id) DO UPDATE SET items_version = items_version + 1"
+)
+
+
+def ensure_data_version_triggers(conn: sqlite3.Connection) -> None:
+    """
+    items/categories 변경 → data_versions.items_version + 1.
+    입출고도 items.qty를 바꾸므로 재고 보고서는 이 값 하나로 충분.
+    """
+    global _triggers_ready
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS data_versions ("
+        "guild_id INTEGER PRIMARY KEY, items_version INTEGER NOT NULL DEFAULT 0)"
+    )
+    for table in ("items", "categories"):
+        for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN {_BUMP.format(row=row)}; END"
+            )
+    conn.commit()
+    _triggers_ready = True
+
+
+def items_version(conn: sqlite3.Connection, guild_id: int) -> int | None:
+    """트리거가 준비 안 됐으면 None(캐시 키로 쓰면 안 됨)."""
+    if not _triggers_ready:
+        return None
+    with read_conn(conn) as rc:
+        row = rc.execute("SELECT items_version FROM data_versions WHERE guild_id=?", (int(guild_id),)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def movements_fingerprint(conn: sqlite3.Connection, guild_id: int, start_epoch: int, end_epoch: int) -> tuple:
+    """
+    [start, end) 기록 보고서용 버전: (운영 테이블 건수, 최소/최대 id) + 기간에 걸친 보관 파일(파일명, 행 수, 갱신 시각).
+    movements는 추가/삭제만 있으므로(수정 없음) 이 값이 같으면 보고서 내용도 같음.
+    idx_movements_guild_epoch 범위만 세므로 한 달치도 수 ms.
+    """
+    with read_conn(conn) as rc:
+        row = rc.execute(
+            """
+            SELECT COUNT(*), COALESCE(MIN(id), 0), COALESCE(MAX(id), 0) FROM movements
+            WHERE guild_id = ? AND created_at_epoch >= ? AND created_at_epoch < ?
+            """,
+            (int(guild_id), int(start_epoch), int(end_epoch)),
+        ).fetchone()
+        archives = rc.execute(
+            """
+            SELECT file_name, row_count, updated_at_epoch FROM movement_archives
+            WHERE guild_id = ? AND start_epoch < ? AND end_epoch > ?
+            ORDER BY start_epoch
+            """,
+            (int(guild_id), int(end_epoch), int(start_epoch)),
+        ).fetchall()
+    return (tuple(row), tuple(tuple(a) for a in archives))
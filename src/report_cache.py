@@ -0,0 +1,97 @@
+# src/report_cache.py
+"""
+보고서 파일(xlsx) 디스크 캐시.
+
+- 키 = (길드, 보고서 종류, 기간, 데이터 버전) → 같은 보고서를 다시 누르거나(스케줄 + 수동)
+  이미 만든 지난달 월간 보고서를 또 올릴 때 엑셀 생성 없이 파일 읽기만으로 업로드
+- 데이터 버전: 재고 보고서는 data_versions.items_version(트리거), 로그 보고서는 그 기간의 movements 지문
+  (repo/version_repo.py). 데이터가 바뀌면 키가 달라져서 자연히 새로 만듦 → 따로 비울 필요 없음
+- REPORT_CACHE_DIR(기본 ./data/report_cache)에 키 해시 이름으로 저장, 읽을 때 mtime 갱신
+  → 총 크기가 REPORT_CACHE_MAX_MB(기본 200)를 넘으면 오래 안 쓴 파일부터 삭제(LRU)
+- REPORT_CACHE=0 이면 끔
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from utils.metrics import REGISTRY, cache_lookup
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+# 보고서 모양(열/시트)이 바뀌면 올려서 예전 캐시를 안 쓰게
+FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+_CACHE_BYTES = REGISTRY.gauge("inventory_report_cache_bytes", "보고서 캐시 디스크 사용량")
+
+
+def enabled() -> bool:
+    return os.environ.get("REPORT_CACHE", "1") != "0"
+
+
+def _cache_dir() -> Path:
+    d = Path(os.environ.get("REPORT_CACHE_DIR", "./data/report_cache"))
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def make_key(guild_id: int, kind: str, *parts) -> str:
+    raw = json.dumps([FORMAT_VERSION, int(guild_id), kind, *parts], ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+def get(key: str) -> bytes | None:
+    if not enabled():
+        return None
+    path = _cache_dir() / f"{key}.xlsx"
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # LRU: 최근 사용
+    except FileNotFoundError:
+        data = None
+    cache_lookup("report", data is not None)
+    return data
+
+
+def put(key: str, data: bytes) -> None:
+    if not enabled():
+        return
+    d = _cache_dir()
+    path = d / f"{key}.xlsx"
+    tmp = d / f"{key}.{threading.get_ident()}.tmp"
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    _evict(d)
+
+
+def _evict(d: Path) -> None:
+    limit = max(1, _env_int("REPORT_CACHE_MAX_MB", 200)) * 1024 * 1024
+    with _lock:
+        entries = []
+        for p in d.glob("*.xlsx"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(e[1] for e in entries)
+        entries.sort()
+        for _, size, p in entries:
+            if total <= limit:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        _CACHE_BYTES.set(total)
@@ -1,7 +1,9 @@
 # src/reporting.py
 from __future__ import annotations
 
+import asyncio
 import io
+import os
 from datetime import datetime, timedelta, timezone
 
 import discord
@@ -9,8 +11,27 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment
 from openpyxl.utils import get_column_letter
 
-from repo.report_repo import list_items_for_report, list_movements_in_epoch_range, delete_movements_before_epoch
+from analytics import (
+    ConsumptionReport,
+    WarnSuggestion,
+    analyze_consumption,
+    build_consumption_text,
+    suggest_warn_below,
+    warn_suggest_basis_text,
+)
+from archive import list_movements_with_archive, run_movement_cleanup_job
+from db import has_read_pool
+import report_cache
+import report_partials
+from report_partials import LOG_HEADER, log_row_values, summary_text
+from maintenance import reclaim_free_pages
+from repo.maintenance_repo import finish_job, get_job, list_running_jobs, start_job
+from repo.partial_repo import month_rollup
+from repo.report_repo import list_items_for_report
 from repo.settings_repo import get_settings, update_settings
+from repo.version_repo import items_version, movements_fingerprint
+from repo.snapshot_repo import day_bounds, delete_snapshots_before, last_snapshot_day, stock_as_of, write_daily_snapshot
+from utils.metrics import REGISTRY, REPORT_BUILD_SECONDS
 from utils.time_kst import now_kst
 
 
@@ -31,35 +52,31 @@ def _autosize(ws, max_col: int):
         ws.column_dimensions[get_column_letter(c)].width = 18
 
 
-def _wb_to_file(wb: Workbook, filename: str) -> discord.File:
-    bio = io.BytesIO()
-    wb.save(bio)
-    bio.seek(0)
-    return discord.File(fp=bio, filename=filename)
-
-
-def _action_kor(action: str) -> str:
-    return {"IN": "입고", "OUT": "출고", "ADJUST": "정정"}.get(action, action)
-
-
-def build_daily_inventory_wb(conn, guild_id: int) -> Workbook:
+def build_daily_inventory_wb(conn, guild_id: int, as_of_epoch: int | None = None) -> Workbook:
+    """as_of_epoch를 주면 그 시점 재고(inventory_snapshot + 그 뒤 movements)로 지난 날짜 보고서 재생성."""
     items = list_items_for_report(conn, guild_id)
+    past_qty = stock_as_of(conn, guild_id, as_of_epoch) if as_of_epoch is not None else None
 
     wb = Workbook()
     ws = wb.active
     ws.title = "일일 재고 보고서"
 
-    ws.append(["카테고리", "품목명", "코드", "현재재고", "경고기준", "보관 위치", "메모", "상태"])
+    qty_header = "현재재고"
+    if as_of_epoch is not None:
+        qty_header = f"재고({datetime.fromtimestamp(as_of_epoch - 1, KST).strftime('%Y-%m-%d')} 마감)"
+    ws.append(["카테고리", "품목명", "코드", qty_header, "경고기준", "보관 위치", "메모", "상태"])
     for it in items:
+        if past_qty is not None and it.id not in past_qty:
+            continue  # 그 시점에 없던 품목
         ws.append([
-            it.get("category_name") or "기타",
-            it.get("name") or "",
-            it.get("code") or "",
-            it.get("qty"),
-            it.get("warn_below"),
-            it.get("storage_location") or "",
-            it.get("note") or "",
-            "활성" if int(it.get("is_active", 1)) == 1 else "비활성",
+            it.category_name or "기타",
+            it.name or "",
+            it.code or "",
+            it.qty if past_qty is None else past_qty[it.id],
+            it.warn_below,
+            it.storage_location or "",
+            it.note or "",
+            "활성" if int(it.is_active) == 1 else "비활성",
         ])
 
     _style_header(ws)
@@ -67,21 +84,14 @@ def build_daily_inventory_wb(conn, guild_id: int) -> Workbook:
     return wb
 
 
-def build_daily_log_wb(conn, guild_id: int, start_epoch: int, end_epoch: int) -> Workbook:
-    rows = list_movements_in_epoch_range(conn, guild_id, start_epoch, end_epoch)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "일일 로그 기록"
-
-    # ✅ 요약 계산
+def _log_summary(rows) -> str:
     total_in = 0
     total_out = 0
     adj_plus = 0
     adj_minus = 0
     for r in rows:
-        act = str(r.get("action") or "")
-        q = int(r.get("qty_change") or 0)
+        act = str(r.action or "")
+        q = int(r.qty_change or 0)
         if act == "IN":
             total_in += q
         elif act == "OUT":
@@ -91,124 +101,223 @@ def build_daily_log_wb(conn, guild_id: int, start_epoch: int, end_epoch: int) ->
                 adj_plus += q
             else:
                 adj_minus += abs(q)
+    return summary_text(total_in, total_out, adj_plus, adj_minus, len(rows))
+
 
-    # ✅ 요약 1줄 (A1~J1 병합)
-    summary = f"요약: 총 입고 {total_in} · 총 출고 {total_out} · 정정 +{adj_plus}/-{adj_minus} · 로그 {len(rows)}건"
+def _append_log_sheet(ws, summary: str, rows) -> None:
+    # ✅ 요약 1줄 (A1~J1 병합) + 헤더는 2행
     ws.append([summary])
     ws.merge_cells("A1:J1")
     ws["A1"].font = Font(bold=True)
     ws["A1"].alignment = Alignment(vertical="center")
-
-    # ✅ 헤더는 2행
-    ws.append(["시간(KST)", "작업", "카테고리", "품목명", "코드", "변동수량", "재고(전)", "재고(후)", "사유", "수정자"])
-
+    ws.append(LOG_HEADER)
     for r in rows:
-        act = str(r.get("action") or "")
-        qty_change = int(r.get("qty_change") or 0)
+        ws.append(log_row_values(r))
+    _style_header(ws, header_row=2)
+    _autosize(ws, 10)
 
-        # ✅ 변동수량 표시(출고도 양수, 정정만 부호)
-        if act == "ADJUST":
-            sign = "+" if qty_change >= 0 else ""
-            change_text = f"{sign}{qty_change}"
-        else:
-            change_text = str(abs(qty_change))
 
-        ws.append([
-            r.get("created_at_kst_text"),
-            _action_kor(act),
-            r.get("category_name_snapshot") or "",
-            r.get("item_name_snapshot") or "",
-            r.get("item_code_snapshot") or "",
-            change_text,
-            r.get("before_qty"),
-            r.get("after_qty"),
-            r.get("reason") or "",
-            r.get("discord_name") or "",
-        ])
+def build_daily_log_wb(conn, guild_id: int, start_epoch: int, end_epoch: int) -> Workbook:
+    rows = list_movements_with_archive(conn, guild_id, start_epoch, end_epoch)
 
-    _style_header(ws, header_row=2)
-    _autosize(ws, 10)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "일일 로그 기록"
+    _append_log_sheet(ws, _log_summary(rows), rows)
     return wb
 
 
-def build_monthly_log_wb(conn, guild_id: int, start_epoch: int, end_epoch: int, ym_text: str) -> Workbook:
-    rows = list_movements_in_epoch_range(conn, guild_id, start_epoch, end_epoch)
-
+def _monthly_wb(summary: str, log_rows, item_rows) -> Workbook:
+    """월간 누적 로그 시트 + 요약 시트(품목별: 이름, 코드, 입고, 출고, 정정 합계)."""
     wb = Workbook()
     ws1 = wb.active
     ws1.title = "월간 누적 로그"
+    _append_log_sheet(ws1, summary, log_rows)
 
-    # ✅ 요약 계산
-    total_in = 0
-    total_out = 0
-    adj_plus = 0
-    adj_minus = 0
-    for r in rows:
-        act = str(r.get("action") or "")
-        q = int(r.get("qty_change") or 0)
-        if act == "IN":
-            total_in += q
-        elif act == "OUT":
-            total_out += abs(q)
-        elif act == "ADJUST":
-            if q >= 0:
-                adj_plus += q
-            else:
-                adj_minus += abs(q)
-
-    summary = f"요약: 총 입고 {total_in} · 총 출고 {total_out} · 정정 +{adj_plus}/-{adj_minus} · 로그 {len(rows)}건"
-    ws1.append([summary])
-    ws1.merge_cells("A1:J1")
-    ws1["A1"].font = Font(bold=True)
-    ws1["A1"].alignment = Alignment(vertical="center")
+    ws2 = wb.create_sheet("요약")
+    ws2.append(["품목명", "코드", "총 입고", "총 출고", "정정 합계"])
+    for row in item_rows:
+        ws2.append(list(row))
+    _style_header(ws2)
+    _autosize(ws2, 5)
+    return wb
 
-    # ✅ 헤더는 2행
-    ws1.append(["시간(KST)", "작업", "카테고리", "품목명", "코드", "변동수량", "재고(전)", "재고(후)", "사유", "수정자"])
 
-    for r in rows:
-        act = str(r.get("action") or "")
-        qty_change = int(r.get("qty_change") or 0)
-
-        if act == "ADJUST":
-            sign = "+" if qty_change >= 0 else ""
-            change_text = f"{sign}{qty_change}"
-        else:
-            change_text = str(abs(qty_change))
-
-        ws1.append([
-            r.get("created_at_kst_text"),
-            _action_kor(act),
-            r.get("category_name_snapshot") or "",
-            r.get("item_name_snapshot") or "",
-            r.get("item_code_snapshot") or "",
-            change_text,
-            r.get("before_qty"),
-            r.get("after_qty"),
-            r.get("reason") or "",
-            r.get("discord_name") or "",
-        ])
-
-    _style_header(ws1, header_row=2)
-    _autosize(ws1, 10)
+def build_monthly_log_wb(conn, guild_id: int, start_epoch: int, end_epoch: int, ym_text: str) -> Workbook:
+    """한 달치를 한 번에 조회/생성(REPORT_PARTIALS=0이거나 조각 조립이 실패했을 때)."""
+    rows = list_movements_with_archive(conn, guild_id, start_epoch, end_epoch)
 
     # 간단 요약 시트(품목별 IN/OUT 합)
-    ws2 = wb.create_sheet("요약")
-    ws2.append(["품목명", "코드", "총 입고", "총 출고", "정정 합계"])
     summary = {}
     for r in rows:
-        key = (r.get("item_name_snapshot") or "", r.get("item_code_snapshot") or "")
+        key = (r.item_name_snapshot or "", r.item_code_snapshot or "")
         s = summary.setdefault(key, {"IN": 0, "OUT": 0, "ADJUST": 0})
-        act = str(r.get("action") or "")
-        s[act] = s.get(act, 0) + int(r.get("qty_change") or 0)
+        act = str(r.action or "")
+        s[act] = s.get(act, 0) + int(r.qty_change or 0)
+    items = [
+        (name, code, s.get("IN", 0), abs(s.get("OUT", 0)), s.get("ADJUST", 0))
+        for (name, code), s in summary.items()
+    ]
+    return _monthly_wb(_log_summary(rows), rows, items)
+
+
+def _monthly_from_partials(guild_id: int, days: list[str], rollup: list[tuple]) -> bytes:
+    """(워커 스레드용) 일별 합계로 요약 줄/요약 시트만 만들고 로그 행은 일별 조각을 이어 붙임."""
+    count = sum(r[6] for r in rollup)
+    summary = summary_text(
+        sum(r[2] for r in rollup), sum(r[3] for r in rollup),
+        sum(r[4] for r in rollup), sum(r[5] for r in rollup), count,
+    )
+    items = [(name, code, tin, tout, plus - minus) for name, code, tin, tout, plus, minus, _ in rollup]
+    with REPORT_BUILD_SECONDS.time("monthly_log"):
+        skeleton = _wb_bytes(_monthly_wb(summary, [], items))
+        return report_partials.splice_month(skeleton, guild_id, days, count)
+
+
+def _days_cell(v: float):
+    return None if v == float("inf") else round(v, 1)
+
+
+def build_weekly_consumption_wb(conn, guild_id: int, rep: ConsumptionReport | None = None) -> Workbook:
+    """주간 소모 분석: 품목별 소모 속도/소진 예상 + 발주 제안(analytics.analyze_consumption)."""
+    rep = rep or analyze_consumption(conn, guild_id)
+    wb = Workbook()
 
-    for (name, code), s in summary.items():
-        ws2.append([name, code, s.get("IN", 0), abs(s.get("OUT", 0)), s.get("ADJUST", 0)])
+    ws = wb.active
+    ws.title = "발주 제안"
+    ws.append(["카테고리", "품목명", "코드", "현재재고", "경고기준", "일평균 출고", "예상 소진(일)", "경고까지(일)", "제안 수량"])
+    for f in rep.reorder():
+        ws.append([
+            f.category_name, f.name, f.code, f.qty, f.warn_below, round(f.burn, 2),
+            _days_cell(f.days_to_stockout), _days_cell(f.days_to_warn), f.reorder_qty,
+        ])
+    _style_header(ws)
+    _autosize(ws, 9)
+
+    ws2 = wb.create_sheet("소모 분석")
+    week_headers = []
+    for w in range(rep.weeks):
+        end = datetime.fromtimestamp(rep.as_of_epoch - 1 - 7 * 86400 * (rep.weeks - 1 - w), KST)
+        week_headers.append(f"~{end.strftime('%m/%d')} 주")
+    ws2.append([
+        "카테고리", "품목명", "코드", "현재재고", "경고기준",
+        "7일 평균", "28일 평균", "91일 평균", "소모 속도", "예상 소진(일)", *week_headers,
+    ])
+    for f in rep.consuming():
+        ws2.append([
+            f.category_name, f.name, f.code, f.qty, f.warn_below,
+            round(f.avg7, 2), round(f.avg28, 2), round(f.avg91, 2), round(f.burn, 2),
+            _days_cell(f.days_to_stockout), *[int(x) for x in f.weekly],
+        ])
     _style_header(ws2)
-    _autosize(ws2, 5)
-
+    _autosize(ws2, 10 + rep.weeks)
+
+    ws3 = wb.create_sheet("경고기준 제안")
+    ws3.append(["카테고리", "품목명", "코드", "현재재고", "현재 경고기준", "제안 경고기준", "일평균 출고", "일 표준편차"])
+    for sg in suggest_warn_below(conn, guild_id, rep.as_of_epoch):
+        ws3.append([
+            sg.category_name, sg.name, sg.code, sg.qty, sg.current or None, sg.suggested,
+            round(sg.daily_mean, 2), round(sg.daily_std, 2),
+        ])
+    _style_header(ws3)
+    _autosize(ws3, 8)
+    ws3.append([])
+    ws3.append([warn_suggest_basis_text() + " · 적용은 /경고기준제안"])
+
+    as_of = datetime.fromtimestamp(rep.as_of_epoch - 1, KST).strftime("%Y-%m-%d")
+    ws.append([])
+    ws.append([f"{as_of}까지 {rep.days}일 출고 기준 · 입고까지 {rep.lead_days}일 + {rep.cover_days}일치 확보"])
     return wb
 
 
+_REPORT_BUILDS_IN_FLIGHT = REGISTRY.gauge(
+    "inventory_report_builds_in_flight", "생성 중이거나 워커 스레드를 기다리는 보고서 수",
+)
+
+
+def _timed_build(build, conn, *args):
+    with REPORT_BUILD_SECONDS.time(build.__name__.removeprefix("build_").removesuffix("_wb")):
+        return build(conn, *args)
+
+
+async def _build_off_loop(conn, build, *args):
+    """읽기 풀이 있으면 워커 스레드에서 엑셀 생성(이벤트 루프/쓰기 커넥션이 안 막힘), 없으면 그대로 실행."""
+    _REPORT_BUILDS_IN_FLIGHT.inc()
+    try:
+        if has_read_pool(conn):
+            return await asyncio.to_thread(_timed_build, build, conn, *args)
+        return _timed_build(build, conn, *args)
+    finally:
+        _REPORT_BUILDS_IN_FLIGHT.dec()
+
+
+def _wb_bytes(wb: Workbook) -> bytes:
+    bio = io.BytesIO()
+    wb.save(bio)
+    return bio.getvalue()
+
+
+async def _cached_bytes_file(guild_id: int, kind: str, version, filename: str, args: list, make) -> discord.File:
+    """
+    report_cache에 (길드, 종류, args, 데이터 버전) 키로 있으면 파일만 읽어서, 없으면 make()로 만들어서 저장.
+    version=None(데이터 버전을 알 수 없음)이면 캐시 없이 생성.
+    """
+    key = report_cache.make_key(guild_id, kind, args, version) if version is not None else None
+    data = await asyncio.to_thread(report_cache.get, key) if key else None
+    if data is None:
+        data = await make()
+        if key:
+            await asyncio.to_thread(report_cache.put, key, data)
+    return discord.File(fp=io.BytesIO(data), filename=filename)
+
+
+async def _cached_report_file(conn, guild_id: int, kind: str, version, filename: str, build, *args) -> discord.File:
+    """build(conn, guild_id, *args) → 엑셀. 엑셀 저장(직렬화)도 생성과 함께 루프 밖에서."""
+    async def make() -> bytes:
+        wb = await _build_off_loop(conn, build, guild_id, *args)
+        return await asyncio.to_thread(_wb_bytes, wb)
+
+    return await _cached_bytes_file(guild_id, kind, version, filename, list(args), make)
+
+
+async def _daily_files(conn, guild_id: int, start_epoch: int, end_epoch: int, date_text: str, as_of_epoch: int | None = None):
+    # 재고 보고서: 입출고도 items.qty를 바꾸므로 items_version 하나로 충분
+    inv_args = () if as_of_epoch is None else (as_of_epoch,)
+    f1 = await _cached_report_file(
+        conn, guild_id, "daily_inventory", items_version(conn, guild_id),
+        f"일일_재고보고서_{date_text}.xlsx", build_daily_inventory_wb, *inv_args,
+    )
+    f2 = await _cached_report_file(
+        conn, guild_id, "daily_log", movements_fingerprint(conn, guild_id, start_epoch, end_epoch),
+        f"일일_로그기록_{date_text}.xlsx", build_daily_log_wb, start_epoch, end_epoch,
+    )
+    return f1, f2
+
+
+async def _monthly_file(conn, guild_id: int, ms: int, me: int, ym: str) -> discord.File:
+    """
+    월간 누적 로그: 빠진/바뀐 날만 일별 조각을 다시 만들고 이어 붙임(report_partials).
+    REPORT_PARTIALS=0이거나 조립이 실패하면 한 번에 생성.
+    """
+    version = movements_fingerprint(conn, guild_id, ms, me)
+    filename = f"월간_누적로그_{ym}.xlsx"
+    if not report_partials.enabled():
+        return await _cached_report_file(conn, guild_id, "monthly_log", version, filename, build_monthly_log_wb, ms, me, ym)
+
+    async def make() -> bytes:
+        try:
+            days = report_partials.month_days(ms, me)
+            await report_partials.ensure_day_partials(conn, guild_id, days)
+            rollup = month_rollup(conn, guild_id, days[0], days[-1])
+            return await asyncio.to_thread(_monthly_from_partials, guild_id, days, rollup)
+        except Exception as e:
+            print(f"[PARTIAL] guild={guild_id} monthly {ym} 조립 실패, 한 번에 생성: {type(e).__name__}: {e}")
+            wb = await _build_off_loop(conn, build_monthly_log_wb, guild_id, ms, me, ym)
+            return await asyncio.to_thread(_wb_bytes, wb)
+
+    return await _cached_bytes_file(guild_id, "monthly_log", version, filename, [ms, me, ym], make)
+
+
 async def _get_report_channel(interaction_client, guild: discord.Guild):
     conn = interaction_client.conn
     s = get_settings(conn, guild.id)
@@ -276,14 +385,7 @@ async def run_daily_reports(client, guild: discord.Guild):
     # 오늘 00:00~24:00 범위
     start_epoch, end_epoch = _kst_day_range_epochs(dt)
 
-    wb_inv = build_daily_inventory_wb(conn, guild.id)
-    wb_log = build_daily_log_wb(conn, guild.id, start_epoch, end_epoch)
-
-    date_text = dt.strftime("%Y-%m-%d")
-    f1 = _wb_to_file(wb_inv, f"일일_재고보고서_{date_text}.xlsx")
-    f2 = _wb_to_file(wb_log, f"일일_로그기록_{date_text}.xlsx")
-
-
+    f1, f2 = await _daily_files(conn, guild.id, start_epoch, end_epoch, dt.strftime("%Y-%m-%d"))
 
     await ch.send(content=f"📌 일일 보고서 / 로그 ({dt.strftime('%Y/%m/%d')})", files=[f1, f2])
 
@@ -297,25 +399,187 @@ async def run_daily_reports(client, guild: discord.Guild):
         ym = prev_month.strftime("%Y-%m")
         if (s.get("last_monthly_report_ym") or "") != ym:
             ms, me = _kst_month_range_epochs(prev_month)
-            wb_month = build_monthly_log_wb(conn, guild.id, ms, me, ym)
-            month_text = prev_month_dt.strftime("%Y-%m")
-            fm = _wb_to_file(wb_month, f"월간_누적로그_{month_text}.xlsx")
+            fm = await _monthly_file(conn, guild.id, ms, me, ym)
             await ch.send(content=f"📚 월간 누적 로그 ({ym})", file=fm)
             update_settings(conn, guild.id, last_monthly_report_ym=ym)
 
     # - 추가로: 말일 당일에 살아있으면 그날도 올리고 싶다? -> 원하면 여기서 “말일이면 바로”도 가능
 
 
+def _snapshot_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, str(default))))
+    except ValueError:
+        return default
+
+
+async def run_daily_snapshot(client, guild: discord.Guild) -> None:
+    """
+    어제(KST)까지의 일별 재고 스냅샷 기록(하루 1번, 자정 이후 첫 루프).
+    - 봇이 꺼져 있었으면 마지막 스냅샷 다음 날부터 최대 SNAPSHOT_CATCHUP_DAYS일 채움
+    - SNAPSHOT_KEEP_DAYS(기본 400일) 지난 스냅샷은 정리
+    - 같은 날들의 월간 로그 조각도 여기서 만들어 둠(report_partials, REPORT_PARTIAL_KEEP_DAYS 기본 70일 보관)
+    """
+    conn = client.conn
+    today = now_kst().dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    last = last_snapshot_day(conn, guild.id)
+    if last is not None and last >= yesterday:
+        return
+
+    first = today - timedelta(days=_snapshot_env("SNAPSHOT_CATCHUP_DAYS", 7))
+    if last is None:
+        first = today - timedelta(days=1)
+    else:
+        first = max(first, datetime.strptime(last, "%Y-%m-%d").replace(tzinfo=KST) + timedelta(days=1))
+
+    d = first
+    while d < today:
+        day = d.strftime("%Y-%m-%d")
+        n = write_daily_snapshot(conn, guild.id, day)
+        print(f"[SNAPSHOT] guild={guild.id} day={day} items={n}")
+        d += timedelta(days=1)
+
+    keep_from = (today - timedelta(days=_snapshot_env("SNAPSHOT_KEEP_DAYS", 400))).strftime("%Y-%m-%d")
+    delete_snapshots_before(conn, guild.id, keep_from)
+
+    # 끝난 날들의 월간 로그 조각(월말에는 이어 붙이기만)
+    if report_partials.enabled():
+        try:
+            await report_partials.ensure_day_partials(
+                conn, guild.id, report_partials.month_days(int(first.timestamp()), int(today.timestamp())),
+            )
+            keep_from = (today - timedelta(days=_snapshot_env("REPORT_PARTIAL_KEEP_DAYS", 70))).strftime("%Y-%m-%d")
+            report_partials.prune_partials(conn, guild.id, keep_from)
+        except Exception as e:
+            print(f"[PARTIAL] guild={guild.id} daily partial failed: {type(e).__name__}: {e}")
+
+
+async def build_consumption_reply(conn, guild_id: int, n: int = 10, excel: bool = False) -> tuple[str, discord.File | None]:
+    """/소모분석: 요약 텍스트(+ 엑셀). 분석은 1번만 하고 읽기 풀이 있으면 워커 스레드에서."""
+    if has_read_pool(conn):
+        rep = await asyncio.to_thread(analyze_consumption, conn, guild_id)
+    else:
+        rep = analyze_consumption(conn, guild_id)
+    text = build_consumption_text(rep, n)
+    if not excel:
+        return text, None
+    wb = await _build_off_loop(conn, build_weekly_consumption_wb, guild_id, rep)
+    data = await asyncio.to_thread(_wb_bytes, wb)  # 품목 1만 개면 저장만 수 초 → 루프 밖에서
+    stamp = datetime.fromtimestamp(rep.as_of_epoch - 1, KST).strftime("%Y%m%d")
+    return text, discord.File(fp=io.BytesIO(data), filename=f"소모분석_{stamp}.xlsx")
+
+
+async def build_warn_suggestions(conn, guild_id: int) -> tuple[list[WarnSuggestion], str]:
+    """/경고기준제안: 제안 목록 + 기준 설명(읽기 풀이 있으면 워커 스레드에서 계산)."""
+    if has_read_pool(conn):
+        suggestions = await asyncio.to_thread(suggest_warn_below, conn, guild_id)
+    else:
+        suggestions = suggest_warn_below(conn, guild_id)
+    return suggestions, warn_suggest_basis_text()
+
+
+async def run_weekly_consumption_report(client, guild: discord.Guild) -> None:
+    """
+    매주 월요일 보고서 시각 이후 1번: 지난주까지의 소모 분석/발주 제안 업로드.
+    (ISO 주 YYYY-Www를 last_weekly_analytics_week에 기록, ANALYTICS_WEEKLY=0이면 끔)
+    """
+    if os.environ.get("ANALYTICS_WEEKLY", "1") == "0":
+        return
+    conn = client.conn
+    s = get_settings(conn, guild.id)
+    dt = now_kst().dt
+    iso = dt.isocalendar()
+    week = f"{iso.year}-W{iso.week:02d}"
+    if (s.get("last_weekly_analytics_week") or "") == week:
+        return
+    h = int(s.get("report_hour", 18))
+    m = int(s.get("report_minute", 30))
+    if dt.weekday() == 0 and dt < dt.replace(hour=h, minute=m, second=0, microsecond=0):
+        return  # 월요일은 보고서 시각 이후(주 중간에 켜졌으면 바로)
+
+    ch = await _get_report_channel(client, guild)
+    if not ch:
+        return
+    wb = await _build_off_loop(conn, build_weekly_consumption_wb, guild.id)
+    data = await asyncio.to_thread(_wb_bytes, wb)
+    f = discord.File(fp=io.BytesIO(data), filename=f"주간_소모분석_{week}.xlsx")
+    await ch.send(content=f"📉 주간 소모 분석 / 발주 제안 ({week})", file=f)
+    update_settings(conn, guild.id, last_weekly_analytics_week=week)
+
+
+def _cleanup_kind() -> str:
+    # MOVEMENT_CLEANUP_MODE=delete 이면 보관 없이 삭제만(청크 단위)
+    mode = (os.environ.get("MOVEMENT_CLEANUP_MODE", "archive") or "archive").strip().lower()
+    return "movement_purge" if mode == "delete" else "movement_archive"
+
+
+# 길드별 정리 작업(백그라운드). 리포트 루프는 작업 끝날 때까지 기다리지 않음
+_cleanup_tasks: dict[int, asyncio.Task] = {}
+
+
+def cleanup_running() -> bool:
+    """분기 정리 작업이 하나라도 돌고 있는지(DB 유지보수는 그동안 쉼)."""
+    return any(not t.done() for t in _cleanup_tasks.values())
+
+
+async def _run_cleanup_job(client, guild: discord.Guild, job: dict) -> None:
+    conn = client.conn
+    job_key = str(job["job_key"])
+    try:
+        await run_movement_cleanup_job(conn, job)
+        freed = await reclaim_free_pages(conn)
+    except Exception as e:
+        finish_job(conn, job_key, "failed", repr(e), now_kst().epoch)
+        print("[CLEANUP_ERROR]", guild.id, repr(e))
+        return
+
+    k = now_kst()
+    finish_job(conn, job_key, "done", f"freed_pages={freed}", k.epoch)
+    done = get_job(conn, job_key) or job
+    qkey = job_key.rsplit(":", 1)[-1]
+    update_settings(conn, guild.id, last_quarter_cleanup=qkey)
+
+    cutoff_dt = datetime.fromtimestamp(int(done["cutoff_epoch"]), KST)
+    verb = "삭제" if done["kind"] == "movement_purge" else "보관 파일로 이동"
+    ch = await _get_report_channel(client, guild)
+    if ch:
+        await ch.send(
+            f"🧹 분기 로그 정리 완료: {int(done['rows_done'])}건 {verb} "
+            f"(기준: {cutoff_dt.strftime('%Y/%m/%d %H:%M:%S')} KST 이전)"
+        )
+
+
+def _spawn_cleanup(client, guild: discord.Guild, job: dict) -> None:
+    task = asyncio.create_task(_run_cleanup_job(client, guild, job))
+    _cleanup_tasks[guild.id] = task
+
+
 async def run_quarterly_cleanup(client, guild: discord.Guild):
     """
-    분기마다(3개월) '옛날 기록(= movements)'만 삭제.
-    기준: 현재 분기 시작일 00:00 이전 데이터는 삭제.
+    분기마다(3개월) '옛날 기록(= movements)'을 운영 테이블에서 정리.
+    기준: 현재 분기 시작일 00:00 이전 데이터.
+    - 기본은 분기별 보관 파일로 이동(감사 이력 유지, 보고서는 보관 구간도 합쳐서 읽음 - archive.py)
+    - 청크 단위 + 백그라운드 작업: 정리 중에도 입출고가 밀리지 않음
+    - 진행 위치는 maintenance_jobs에 남아서 재시작하면 이어서 진행(분기 첫 주가 지나도)
 
     ✅ 놓침 대비:
     - 분기 첫날 00:05를 놓쳐도
     - 분기 첫 주(day 1~7) 중 아무 때나 1회 실행
     """
     conn = client.conn
+
+    t = _cleanup_tasks.get(guild.id)
+    if t and not t.done():
+        return
+
+    # 끊긴 작업(재시작 등)이 있으면 먼저 이어서
+    running = list_running_jobs(conn, guild.id)
+    if running:
+        _spawn_cleanup(client, guild, running[0])
+        return
+
     s = get_settings(conn, guild.id)
 
     k = now_kst()
@@ -333,39 +597,37 @@ async def run_quarterly_cleanup(client, guild: discord.Guild):
     cutoff_dt = _start_of_current_quarter(dt)
     cutoff_epoch = int(cutoff_dt.timestamp())
 
-    deleted = delete_movements_before_epoch(conn, guild.id, cutoff_epoch)
+    job = start_job(
+        conn, f"movement_cleanup:{guild.id}:{qkey}", _cleanup_kind(), guild.id,
+        cutoff_epoch, k.kst_text, k.epoch,
+    )
+    if job["status"] != "running":
+        # 작업은 끝났는데 설정 기록 전에 멈췄던 경우
+        update_settings(conn, guild.id, last_quarter_cleanup=qkey)
+        return
 
-    ch = await _get_report_channel(client, guild)
-    if ch:
-        await ch.send(
-            f"🧹 분기 로그 정리 완료: {deleted}건 삭제 "
-            f"(기준: {cutoff_dt.strftime('%Y/%m/%d %H:%M:%S')} KST 이전)"
-        )
+    _spawn_cleanup(client, guild, job)
 
-    update_settings(conn, guild.id, last_quarter_cleanup=qkey)
-
-async def force_send_daily_reports(client, guild: discord.Guild, mark_done: bool = True) -> bool:
+async def force_send_daily_reports(client, guild: discord.Guild, mark_done: bool = True, day: str | None = None) -> bool:
     """
     ✅ 지금 즉시 '오늘자' 일일 재고보고서 + 일일 로그 업로드
     - mark_done=True면 오늘 스케줄 업로드도 중복되지 않게 last_daily_report_date 기록
+    - day(YYYY-MM-DD)를 주면 그날 마감 재고/그날 로그로 다시 생성(기록 안 남김)
     """
     conn = client.conn
     ch = await _get_report_channel(client, guild)
     if not ch:
         return False
 
-    k = now_kst()
-    dt = k.dt  # 오늘(KST)
-
-    start_epoch, end_epoch = _kst_day_range_epochs(dt)
-
-    wb_inv = build_daily_inventory_wb(conn, guild.id)
-    wb_log = build_daily_log_wb(conn, guild.id, start_epoch, end_epoch)
-
-    date_text = dt.strftime("%Y-%m-%d")
-    f1 = _wb_to_file(wb_inv, f"일일_재고보고서_{date_text}.xlsx")
-    f2 = _wb_to_file(wb_log, f"일일_로그기록_{date_text}.xlsx")
-
+    if day:
+        start_epoch, end_epoch, _ = day_bounds(day)
+        dt = datetime.fromtimestamp(start_epoch, KST)
+        mark_done = False
+        f1, f2 = await _daily_files(conn, guild.id, start_epoch, end_epoch, day, as_of_epoch=end_epoch)
+    else:
+        dt = now_kst().dt  # 오늘(KST)
+        start_epoch, end_epoch = _kst_day_range_epochs(dt)
+        f1, f2 = await _daily_files(conn, guild.id, start_epoch, end_epoch, dt.strftime("%Y-%m-%d"))
 
     await ch.send(content=f"📌 (수동) 일일 보고서 / 로그 ({dt.strftime('%Y/%m/%d')})", files=[f1, f2])
 
@@ -393,10 +655,7 @@ async def force_send_monthly_prev_month(client, guild: discord.Guild, mark_done:
     ym = prev_month_dt.strftime("%Y-%m")
 
     ms, me = _kst_month_range_epochs(prev_month_dt)
-    wb_month = build_monthly_log_wb(conn, guild.id, ms, me, ym)
-    month_text = prev_month_dt.strftime("%Y-%m")
-    fm = _wb_to_file(wb_month, f"월간_누적로그_{month_text}.xlsx")
-
+    fm = await _monthly_file(conn, guild.id, ms, me, ym)
 
     await ch.send(content=f"📚 (수동) 월간 누적 로그 ({ym})", file=fm)
 
@@ -0,0 +1,363 @@
+# src/restore.py
+"""
+시점 복원(point-in-time): 특정 시각의 품목별 재고를 재구성.
+
+1) 백업 카탈로그에서 목표 시각 이전의 가장 가까운 스냅샷을 고름
+   (전체 DB 일일/수동 스냅샷 또는 해당 길드 내보내기 파일)
+2) 스냅샷의 items.qty를 시작값으로, 스냅샷 이후 movements(IN/OUT/ADJUST)를 id 순서대로 재생
+3) 각 movement의 before_qty가 직전까지 재구성한 값과 같은지 확인(연속성 검증)
+
+- movements는 fetchmany 배치로 스트리밍 → 메모리는 품목 수에 비례(로그 길이와 무관)
+- 분기 정리로 보관 파일에 옮겨진 구간도 같이 재생(archive.py)
+- 스냅샷 이후 새로 생긴 품목은 시작 재고가 로그에 없으므로 첫 movement의 before_qty로 추정
+
+CLI:
+  python src/restore.py --guild 123 --at "2026/01/31 18:00"
+  python src/restore.py --guild 123 --at "2026/01/31 18:00" --csv restored.csv
+  python src/restore.py --guild 123 --at "2026/01/31 18:00" --apply --actor 관리자
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from archive import iter_archived_rows
+from repo.backup_repo import find_restore_bases
+from utils.time_kst import KST, now_kst
+
+
+STOCK_ACTIONS = ("IN", "OUT", "ADJUST")
+
+# 결과에 남기는 불일치 상세 최대 개수(건수는 전부 셈)
+_MAX_GAP_DETAILS = 200
+
+
+def _restore_batch_size() -> int:
+    try:
+        return max(100, int(os.environ.get("RESTORE_BATCH", "5000")))
+    except ValueError:
+        return 5000
+
+
+@dataclass
+class ReplayGap:
+    movement_id: int
+    item_id: int
+    expected_qty: int      # 직전까지 재구성한 값
+    before_qty: int        # 로그에 적힌 값
+    created_at_kst_text: str
+
+
+@dataclass
+class RestoreResult:
+    guild_id: int
+    at_epoch: int
+    at_kst_text: str
+    base_file: str = ""            # 비어있으면 스냅샷 없이 로그 처음부터 재생
+    base_kind: str = ""
+    base_kst_text: str = ""
+    base_movement_id: int = 0      # 이 id 이후의 movements만 재생
+    quantities: dict[int, int] = field(default_factory=dict)
+    replayed: int = 0
+    inferred_items: list[int] = field(default_factory=list)
+    gap_count: int = 0
+    gaps: list[ReplayGap] = field(default_factory=list)
+
+
+def parse_at(text: str) -> int:
+    """'YYYY/MM/DD HH:MM[:SS]' / 'YYYY-MM-DD HH:MM[:SS]' / 'YYYY-MM-DD'(KST) 또는 epoch 숫자."""
+    s = (text or "").strip()
+    if s.isdigit():
+        return int(s)
+    s = s.replace("-", "/")
+    for fmt in ("%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d"):
+        try:
+            return int(datetime.strptime(s, fmt).replace(tzinfo=KST).timestamp())
+        except ValueError:
+            continue
+    raise ValueError(f"시각 형식을 모르겠어요: {text}")
+
+
+def _epoch_to_kst_text(epoch: int) -> str:
+    return datetime.fromtimestamp(int(epoch), KST).strftime("%Y/%m/%d %H:%M:%S")
+
+
+def _open_readonly(path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def _load_db_snapshot(path: Path, guild_id: int) -> tuple[dict[int, int], int]:
+    """전체 DB 스냅샷 → (품목별 재고, 스냅샷 시점 movements id 발급 위치)."""
+    snap = _open_readonly(path)
+    try:
+        qty = {
+            int(r[0]): int(r[1])
+            for r in snap.execute("SELECT id, qty FROM items WHERE guild_id=?", (int(guild_id),))
+        }
+        row = snap.execute("SELECT seq FROM sqlite_sequence WHERE name='movements'").fetchone()
+        boundary = int(row[0]) if row and row[0] is not None else 0
+    finally:
+        snap.close()
+    return qty, boundary
+
+
+def _load_guild_export(path: Path) -> tuple[dict[int, int], int]:
+    """길드 내보내기 파일 → (품목별 재고, movements id 기준). 파일을 한 줄씩 읽음."""
+    qty: dict[int, int] = {}
+    max_in_file = 0
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        item_cols = header["columns"]["items"]
+        i_id, i_qty = item_cols.index("id"), item_cols.index("qty")
+        mv_id = header["columns"]["movements"].index("id")
+        for line in f:
+            rec = json.loads(line)
+            if rec["t"] == "items":
+                qty[int(rec["r"][i_id])] = int(rec["r"][i_qty])
+            elif rec["t"] == "movements":
+                max_in_file = max(max_in_file, int(rec["r"][mv_id]))
+
+    # 헤더에 기준이 없는 예전 파일은 파일 안 마지막 movement id로 대신함
+    boundary = header.get("max_movement_id")
+    return qty, int(boundary) if boundary is not None else max_in_file
+
+
+def _pick_base(conn: sqlite3.Connection, guild_id: int, at_epoch: int, backup_dir: Path):
+    for entry in find_restore_bases(conn, guild_id, at_epoch):
+        path = backup_dir / entry["file_name"]
+        if path.exists():
+            return entry, path
+    return None, None
+
+
+def reconstruct_quantities(
+    conn: sqlite3.Connection,
+    guild_id: int,
+    at_epoch: int,
+    backup_dir: Path,
+    batch_size: int | None = None,
+) -> RestoreResult:
+    """
+    at_epoch 시점의 품목별 재고를 재구성(읽기만 함).
+    conn: 운영 DB(카탈로그 + movements를 읽음)
+    """
+    batch_size = batch_size or _restore_batch_size()
+    result = RestoreResult(guild_id=int(guild_id), at_epoch=int(at_epoch), at_kst_text=_epoch_to_kst_text(at_epoch))
+
+    entry, path = _pick_base(conn, guild_id, at_epoch, backup_dir)
+    if entry is not None:
+        if entry["kind"] == "guild_export":
+            qty, boundary = _load_guild_export(path)
+        else:
+            qty, boundary = _load_db_snapshot(path, guild_id)
+        result.base_file = entry["file_name"]
+        result.base_kind = entry["kind"]
+        result.base_kst_text = entry["created_at_kst_text"]
+        result.base_movement_id = boundary
+    else:
+        qty, boundary = {}, 0
+
+    qs = ",".join(["?"] * len(STOCK_ACTIONS))
+    stock_where = f"AND item_id IS NOT NULL AND success = 1 AND action IN ({qs})"
+    inferred: set[int] = set()
+    last_id = int(boundary)
+
+    def _replay(rows) -> None:
+        nonlocal last_id
+        for mid, item_id, before, after, kst_text in rows:
+            if mid <= last_id:
+                continue  # 보관 이동 중이라 양쪽에 있는 행
+            expected = qty.get(item_id)
+            if expected is None:
+                # 스냅샷에 없던 품목: 시작 재고는 첫 기록의 before로 추정
+                inferred.add(item_id)
+            elif expected != before:
+                result.gap_count += 1
+                if len(result.gaps) < _MAX_GAP_DETAILS:
+                    result.gaps.append(ReplayGap(int(mid), int(item_id), int(expected), int(before), str(kst_text)))
+            qty[item_id] = int(after)
+            last_id = int(mid)
+            result.replayed += 1
+
+    # 1) 스냅샷 이후지만 이미 보관 파일로 옮겨진 기록(오래된 것부터)
+    for rows in iter_archived_rows(
+        conn, guild_id, 0, int(at_epoch) + 1,
+        "id, item_id, before_qty, after_qty, created_at_kst_text",
+        stock_where, STOCK_ACTIONS, after_id=boundary, skip_live=False, batch_size=batch_size,
+    ):
+        _replay(rows)
+
+    # 2) 운영 테이블
+    cur = conn.execute(
+        f"""
+        SELECT id, item_id, before_qty, after_qty, created_at_kst_text
+        FROM movements
+        WHERE id > ?
+          AND guild_id = ?
+          AND created_at_epoch <= ?
+          {stock_where}
+        ORDER BY id
+        """,
+        (last_id, int(guild_id), int(at_epoch), *STOCK_ACTIONS),
+    )
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        _replay(rows)
+
+    # 목표 시각 전에 만들어졌지만 스냅샷에도, 재생 구간에도 없는 품목
+    # → 그 뒤 첫 기록의 before_qty(없으면 지금 재고)가 그 시점 재고
+    missing = conn.execute(
+        "SELECT id, qty FROM items WHERE guild_id=? AND created_at <= ?",
+        (int(guild_id), result.at_kst_text),
+    ).fetchall()
+    for item_id, cur_qty in missing:
+        if item_id in qty:
+            continue
+        later = iter_archived_rows(
+            conn, guild_id, int(at_epoch), 2**62,
+            "before_qty", f"AND item_id = ? {stock_where}", (int(item_id), *STOCK_ACTIONS),
+            after_id=boundary, skip_live=False, batch_size=1,
+        )
+        first = next(later, None)
+        later.close()
+        row = first[0] if first else conn.execute(
+            f"""
+            SELECT before_qty FROM movements
+            WHERE item_id=? AND guild_id=? AND id > ? {stock_where}
+            ORDER BY id LIMIT 1
+            """,
+            (int(item_id), int(guild_id), int(boundary), *STOCK_ACTIONS),
+        ).fetchone()
+        qty[int(item_id)] = int(row[0]) if row else int(cur_qty)
+        inferred.add(int(item_id))
+
+    result.quantities = qty
+    result.inferred_items = sorted(inferred)
+    return result
+
+
+def apply_restored_quantities(
+    conn: sqlite3.Connection,
+    result: RestoreResult,
+    actor_name: str,
+    actor_id: int | None = None,
+) -> int:
+    """
+    재구성한 재고를 운영 DB에 반영(현재 남아있는 품목만).
+    값이 달라지는 품목마다 ADJUST 기록을 남김 → 되돌리기/추적 가능
+    반환값: 바뀐 품목 수
+    """
+    k = now_kst()
+    reason = f"시점 복원({result.at_kst_text})"
+    gid = int(result.guild_id)
+
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        rows = conn.execute(
+            """
+            SELECT i.id, i.name, i.code, i.image_url, i.qty, COALESCE(c.name, '기타') AS category_name
+            FROM items i
+            LEFT JOIN categories c ON c.id = i.category_id
+            WHERE i.guild_id=?
+            """,
+            (gid,),
+        ).fetchall()
+
+        updates: list[tuple] = []
+        logs: list[tuple] = []
+        for item_id, name, code, image_url, cur_qty, cat_name in rows:
+            target = result.quantities.get(int(item_id))
+            if target is None or int(target) == int(cur_qty):
+                continue
+            updates.append((int(target), k.kst_text, gid, int(item_id)))
+            logs.append((
+                gid, int(item_id), name, code or "", cat_name, image_url or "",
+                "ADJUST", int(target) - int(cur_qty), int(cur_qty), int(target),
+                reason, 1, "", actor_name, actor_id, k.kst_text, k.epoch,
+            ))
+
+        conn.executemany("UPDATE items SET qty=?, updated_at=? WHERE guild_id=? AND id=?", updates)
+        conn.executemany(
+            """
+            INSERT INTO movements (
+                guild_id, item_id,
+                item_name_snapshot, item_code_snapshot, category_name_snapshot, image_url,
+                action, qty_change, before_qty, after_qty,
+                reason, success, error_message,
+                discord_name, discord_id,
+                created_at_kst_text, created_at_epoch
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            logs,
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(updates)
+
+
+def write_result_csv(conn: sqlite3.Connection, result: RestoreResult, out_path: Path) -> None:
+    names = {
+        int(r[0]): (r[1], r[2] or "", int(r[3]))
+        for r in conn.execute("SELECT id, name, code, qty FROM items WHERE guild_id=?", (int(result.guild_id),))
+    }
+    inferred = set(result.inferred_items)
+    with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f)
+        w.writerow(["item_id", "name", "code", "restored_qty", "current_qty", "inferred"])
+        for item_id in sorted(result.quantities):
+            name, code, cur_qty = names.get(item_id, ("(삭제된 품목)", "", None))
+            w.writerow([item_id, name, code, result.quantities[item_id], cur_qty, int(item_id in inferred)])
+
+
+def _main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="백업 + 입출고 기록 재생으로 특정 시점 재고 복원")
+    ap.add_argument("--db", default=os.environ.get("DB_PATH", "./data/inventory.db"))
+    ap.add_argument("--backup-dir", default=os.environ.get("BACKUP_DIR", "./data/backups"))
+    ap.add_argument("--guild", type=int, required=True)
+    ap.add_argument("--at", required=True, help="KST 시각(YYYY/MM/DD HH:MM[:SS]) 또는 epoch")
+    ap.add_argument("--batch", type=int, default=None)
+    ap.add_argument("--csv", default=None, help="품목별 복원 결과 CSV")
+    ap.add_argument("--apply", action="store_true", help="복원 결과를 운영 DB에 반영(ADJUST 기록)")
+    ap.add_argument("--actor", default="시점 복원", help="--apply 시 기록에 남길 이름")
+    args = ap.parse_args(argv)
+
+    from db import connect
+    conn = connect(args.db)
+    try:
+        result = reconstruct_quantities(conn, args.guild, parse_at(args.at), Path(args.backup_dir), args.batch)
+
+        print(f"[RESTORE] 목표 시각: {result.at_kst_text}")
+        if result.base_file:
+            print(f"[RESTORE] 기준 스냅샷: {result.base_file} ({result.base_kind}, {result.base_kst_text}, movement>{result.base_movement_id})")
+        else:
+            print("[RESTORE] 기준 스냅샷 없음 → 기록 처음부터 재생")
+        print(f"[RESTORE] 재생한 기록: {result.replayed}건, 품목 {len(result.quantities)}개(추정 {len(result.inferred_items)}개)")
+        if result.gap_count:
+            print(f"[RESTORE] ⚠️ before_qty 불일치 {result.gap_count}건(이후 값은 기록의 after_qty 기준)")
+            for g in result.gaps[:20]:
+                print(f"  - movement #{g.movement_id} item #{g.item_id} {g.created_at_kst_text}: 재구성 {g.expected_qty} ≠ 기록 {g.before_qty}")
+
+        if args.csv:
+            write_result_csv(conn, result, Path(args.csv))
+            print(f"[RESTORE] CSV 저장: {args.csv}")
+        if args.apply:
+            changed = apply_restored_quantities(conn, result, args.actor)
+            print(f"[RESTORE] 반영 완료: {changed}개 품목 재고 변경")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    _main()
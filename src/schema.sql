@@ -170,3 +170,150 @@ CREATE TABLE IF NOT EXISTS favorites (
   PRIMARY KEY (guild_id, user_id, item_id),
   FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
 );
+
+-- =========================
+-- 7) 백업 카탈로그(백업 파일 목록/체크섬/검증 결과)
+--  - 목록/보관기간 정리/스케줄 판단은 디렉터리 스캔 대신 이 테이블로 조회
+--  - 인덱스는 repo/backup_repo.ensure_backup_catalog_schema에서 생성(구버전 컬럼 보강 후)
+--  - 백업 직후 원본 행 수를 같이 기록해두고
+--  - 백그라운드 검증(quick_check + 행 수 비교 + sha256)이 끝나면 verify_* 갱신
+-- =========================
+CREATE TABLE IF NOT EXISTS backup_catalog (
+  id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+  file_name            TEXT    NOT NULL UNIQUE,
+  kind                 TEXT    NOT NULL DEFAULT 'daily',   -- daily / manual / upload_zip / monthly_zip / guild_export
+  guild_id             INTEGER,                            -- 길드 단위 파일만(전체 DB 스냅샷은 NULL)
+  snapshot_key         TEXT    NOT NULL DEFAULT '',        -- 일일=YYYY-MM-DD, 월간=YYYY-MM
+  size_bytes           INTEGER NOT NULL DEFAULT 0,
+  sha256               TEXT    NOT NULL DEFAULT '',
+
+  -- 스냅샷 시점 원본 행 수(검증 비교용)
+  src_items            INTEGER,
+  src_movements        INTEGER,
+  src_categories       INTEGER,
+
+  verify_status        TEXT    NOT NULL DEFAULT 'pending', -- pending / ok / failed
+  verify_detail        TEXT    NOT NULL DEFAULT '',
+  verified_at_epoch    INTEGER,
+
+  created_at_kst_text  TEXT    NOT NULL,
+  created_at_epoch     INTEGER NOT NULL,
+  deleted_at_epoch     INTEGER                             -- 보관기간 정리로 파일 삭제된 시각
+);
+
+-- =========================
+-- 8) 입출고 기록 보관(아카이브) 목록
+--  - 분기 정리 때 오래된 movements를 지우는 대신 분기별 보관 DB 파일(movements_YYYY-QN.db)로 옮김
+--  - 길드 x 분기 1행: 보고서가 기간이 보관 구간에 걸칠 때 열어볼 파일을 여기서 찾음
+-- =========================
+CREATE TABLE IF NOT EXISTS movement_archives (
+  id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+  guild_id             INTEGER NOT NULL,
+  quarter_key          TEXT    NOT NULL,        -- YYYY-QN
+  file_name            TEXT    NOT NULL,        -- ARCHIVE_DIR 안 파일명
+  start_epoch          INTEGER NOT NULL,        -- 분기 시작(포함)
+  end_epoch            INTEGER NOT NULL,        -- 다음 분기 시작(미포함)
+  row_count            INTEGER NOT NULL DEFAULT 0,
+  updated_at_kst_text  TEXT    NOT NULL,
+  updated_at_epoch     INTEGER NOT NULL,
+  UNIQUE (guild_id, quarter_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_movement_archives_guild_range
+ON movement_archives(guild_id, start_epoch, end_epoch);
+
+-- =========================
+-- 9) 유지보수 작업 진행 상태(분기 정리 등 오래 걸리는 작업)
+--  - 청크 단위로 진행하며 처리한 마지막 id를 같은 트랜잭션에서 기록
+--  - 재시작하면 status='running' 작업을 last_id 다음부터 이어서 진행
+-- =========================
+CREATE TABLE IF NOT EXISTS maintenance_jobs (
+  job_key              TEXT    PRIMARY KEY,     -- 예: movement_cleanup:{guild_id}:YYYY-QN
+  kind                 TEXT    NOT NULL,        -- movement_archive / movement_purge
+  guild_id             INTEGER,
+  cutoff_epoch         INTEGER NOT NULL DEFAULT 0,
+  last_id              INTEGER NOT NULL DEFAULT 0,
+  rows_done            INTEGER NOT NULL DEFAULT 0,
+  status               TEXT    NOT NULL DEFAULT 'running',  -- running / done / failed
+  detail               TEXT    NOT NULL DEFAULT '',
+  started_at_kst_text  TEXT    NOT NULL,
+  started_at_epoch     INTEGER NOT NULL,
+  updated_at_epoch     INTEGER NOT NULL,
+  finished_at_epoch    INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_maintenance_jobs_status
+ON maintenance_jobs(status, guild_id);
+
+-- =========================
+-- 10) DB 파일 상태 기록(page_count / freelist_count 추이)
+--  - event: hourly(정기 기록) / vacuum(빈 페이지 반환 후) / checkpoint(WAL) / optimize / analyze / migrate(auto_vacuum 전환)
+-- =========================
+CREATE TABLE IF NOT EXISTS db_stats (
+  id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+  event                TEXT    NOT NULL DEFAULT 'hourly',
+  page_size            INTEGER NOT NULL DEFAULT 0,
+  page_count           INTEGER NOT NULL DEFAULT 0,
+  freelist_count       INTEGER NOT NULL DEFAULT 0,
+  auto_vacuum          INTEGER NOT NULL DEFAULT 0,   -- 0=NONE, 1=FULL, 2=INCREMENTAL
+  detail               TEXT    NOT NULL DEFAULT '',
+  created_at_kst_text  TEXT    NOT NULL,
+  created_at_epoch     INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_db_stats_event_epoch
+ON db_stats(event, created_at_epoch DESC);
+
+-- =========================
+-- 11) 일별 재고 스냅샷(그날 24:00 KST 기준 품목별 재고)
+--  - 스케줄러가 하루 1번 INSERT…SELECT로 기록(repo/snapshot_repo.py)
+--  - "X일 재고" = X 이전 가장 가까운 스냅샷 + 그 뒤 movements 합계 → 로그 전체 재생 없이 조회
+--  - SNAPSHOT_KEEP_DAYS 지난 날짜는 정리
+-- =========================
+CREATE TABLE IF NOT EXISTS inventory_snapshot (
+  guild_id   INTEGER NOT NULL,
+  day        TEXT    NOT NULL,                  -- YYYY-MM-DD (KST)
+  item_id    INTEGER NOT NULL,
+  qty        INTEGER NOT NULL,
+  PRIMARY KEY (guild_id, day, item_id)
+) WITHOUT ROWID;
+
+-- =========================
+-- 12) 길드별 데이터 버전(보고서 캐시 키)
+--  - items/categories가 바뀔 때마다 items_version + 1 (트리거)
+--  - 트리거는 본문에 문장 구분자가 있어 apply_schema(구분자로 단순 분해)로는 못 만듦
+--    → repo/version_repo.ensure_data_version_triggers 에서 생성
+-- =========================
+CREATE TABLE IF NOT EXISTS data_versions (
+  guild_id       INTEGER PRIMARY KEY,
+  items_version  INTEGER NOT NULL DEFAULT 0
+);
+
+-- =========================
+-- 13) 월간 로그 보고서용 일별 조각(report_partials.py)
+--  - report_day_partials: 그날 로그 행을 미리 엑셀 XML로 만들어 둔 파일의 지문(그날 movements 지문)
+--    → 월말에는 지문이 같은 날은 파일을 이어 붙이기만, 다른 날만 다시 만듦
+--  - daily_item_rollup: 그날 품목별 입고/출고/정정 합계 → 요약 시트/요약 줄
+-- =========================
+CREATE TABLE IF NOT EXISTS report_day_partials (
+  guild_id          INTEGER NOT NULL,
+  day               TEXT    NOT NULL,           -- YYYY-MM-DD (KST)
+  fingerprint       TEXT    NOT NULL,
+  row_count         INTEGER NOT NULL,
+  created_at_epoch  INTEGER NOT NULL,
+  PRIMARY KEY (guild_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_item_rollup (
+  guild_id      INTEGER NOT NULL,
+  day           TEXT    NOT NULL,
+  item_name     TEXT    NOT NULL,
+  item_code     TEXT    NOT NULL,
+  in_qty        INTEGER NOT NULL DEFAULT 0,
+  out_qty       INTEGER NOT NULL DEFAULT 0,      -- 양수
+  adj_plus      INTEGER NOT NULL DEFAULT 0,
+  adj_minus     INTEGER NOT NULL DEFAULT 0,      -- 양수
+  row_count     INTEGER NOT NULL DEFAULT 0,
+  first_row     INTEGER NOT NULL,                -- 그날 처음 나온 행 번호(요약 시트 순서)
+  PRIMARY KEY (guild_id, day, item_name, item_code)
+) WITHOUT ROWID;
@@ -0,0 +1,252 @@
+# src/sql_profiler.py
+"""
+SQL 프로파일러(opt-in, SQL_PROFILE=1).
+
+- db.add_query_observer로 봇/읽기 풀 커넥션의 모든 SQL을 관찰
+  정규화한 문장(숫자/문자열 리터럴 → ?, 공백 정리)별로 호출 수/총 시간/최대/가져온 행 수/호출 위치 집계
+  (실행 시간 + fetch 시간을 합쳐서 한 문장의 비용으로 봄)
+- 한 번에 SQL_SLOW_MS 이상 걸린 실행은 바로 [SLOW_SQL] 로그(호출 위치 포함)
+- /쿼리통계 로 상위 N개 확인, 종료 시 상위 N개 출력 + SQL_PROFILE_OUT(JSON) 저장
+- 상위 문장은 EXPLAIN QUERY PLAN으로 전체 스캔(SCAN) 여부 표시 → LIKE '%..%' 같은 스캔을 미리 찾기
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from db import add_query_observer, remove_query_observer
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+_STR = re.compile(r"'(?:[^']|'')*'")
+_NUM = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WS = re.compile(r"\s+")
+
+_SRC_DIR = Path(__file__).resolve().parent
+# 호출 위치를 찾을 때 건너뛸 파일(관찰 경로/공용 헬퍼)
+_SKIP_FILES = {"db.py", "sql_profiler.py", "records.py", "contextlib.py"}
+
+
+def normalize_sql(sql: str) -> str:
+    s = _STR.sub("?", sql)
+    s = _NUM.sub("?", s)
+    s = _IN_LIST.sub("(?...)", s)
+    return _WS.sub(" ", s).strip()
+
+
+@dataclass
+class _Stmt:
+    sql: str
+    count: int = 0
+    exec_s: float = 0.0
+    fetch_s: float = 0.0
+    max_s: float = 0.0
+    rows: int = 0
+    sites: Counter = field(default_factory=Counter)
+
+    @property
+    def total_s(self) -> float:
+        return self.exec_s + self.fetch_s
+
+
+class SqlProfiler:
+    def __init__(self, slow_ms: int):
+        self.slow_s = slow_ms / 1000.0
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._stmts: dict[str, _Stmt] = {}
+        self._norm_cache: dict[str, str] = {}
+
+    def _norm(self, sql: str) -> str:
+        n = self._norm_cache.get(sql)
+        if n is None:
+            if len(self._norm_cache) > 5000:
+                self._norm_cache.clear()  # 동적으로 만든 문장이 많아도 캐시가 끝없이 크지 않게
+            n = self._norm_cache[sql] = normalize_sql(sql)
+        return n
+
+    @staticmethod
+    def _call_site() -> str:
+        f = sys._getframe(3)
+        while f is not None:
+            name = os.path.basename(f.f_code.co_filename)
+            if name not in _SKIP_FILES:
+                path = Path(f.f_code.co_filename)
+                try:
+                    path = path.resolve().relative_to(_SRC_DIR)
+                except ValueError:
+                    path = Path(name)
+                return f"{path.as_posix()}:{f.f_lineno} {f.f_code.co_name}"
+            f = f.f_back
+        return "?"
+
+    def observe(self, event: str, sql: str, seconds: float, rows: int) -> None:
+        if not sql or sql.startswith("EXPLAIN"):
+            return  # /쿼리통계 가 돌리는 실행 계획 조회는 집계에서 제외
+        key = self._norm(sql)
+        site = self._call_site() if event != "fetch" else ""
+        with self._lock:
+            st = self._stmts.get(key)
+            if st is None:
+                st = self._stmts[key] = _Stmt(key)
+            if event == "fetch":
+                st.fetch_s += seconds
+                st.rows += max(0, rows)
+            else:
+                st.count += 1
+                st.exec_s += seconds
+                st.sites[site] += 1
+            st.max_s = max(st.max_s, seconds)
+        if seconds >= self.slow_s:
+            print(f"[SLOW_SQL] {seconds * 1000:.0f}ms {event} rows={rows} at {site or '-'} | {key[:300]}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stmts.clear()
+            self.started_at = time.time()
+
+    def top(self, n: int = 10) -> list[_Stmt]:
+        with self._lock:
+            return sorted(self._stmts.values(), key=lambda s: s.total_s, reverse=True)[:n]
+
+    def snapshot(self, n: int = 50) -> list[dict]:
+        return [
+            {
+                "sql": s.sql,
+                "count": s.count,
+                "total_ms": round(s.total_s * 1000, 3),
+                "exec_ms": round(s.exec_s * 1000, 3),
+                "fetch_ms": round(s.fetch_s * 1000, 3),
+                "avg_ms": round(s.total_s * 1000 / s.count, 3) if s.count else 0.0,
+                "max_ms": round(s.max_s * 1000, 3),
+                "rows": s.rows,
+                "sites": dict(s.sites.most_common(5)),
+            }
+            for s in self.top(n)
+        ]
+
+
+_profiler: SqlProfiler | None = None
+
+
+def enabled() -> bool:
+    return _profiler is not None
+
+
+def enable(slow_ms: int | None = None) -> SqlProfiler:
+    """프로파일러 켜기(여러 번 불러도 1개). 종료 시 상위 문장 출력/저장."""
+    global _profiler
+    if _profiler is None:
+        _profiler = SqlProfiler(_env_int("SQL_SLOW_MS", 100) if slow_ms is None else slow_ms)
+        add_query_observer(_profiler.observe)
+        atexit.register(_dump_at_exit)
+        print(f"[SQL_PROFILE] on (slow ≥ {_profiler.slow_s * 1000:.0f}ms)")
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    if _profiler is not None:
+        remove_query_observer(_profiler.observe)
+        _profiler = None
+
+
+def enable_from_env() -> bool:
+    if os.environ.get("SQL_PROFILE", "0") == "1":
+        enable()
+        return True
+    return False
+
+
+def reset() -> None:
+    if _profiler is not None:
+        _profiler.reset()
+
+
+def snapshot(n: int = 50) -> list[dict]:
+    return _profiler.snapshot(n) if _profiler is not None else []
+
+
+def _query_plan(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """정규화된 문장을 ?=NULL로 EXPLAIN QUERY PLAN(값과 무관한 스캔 여부 확인용)."""
+    if not sql.upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+        return []
+    q = sql.replace("(?...)", "(?)")
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {q}", [None] * q.count("?")).fetchall()
+    except sqlite3.Error:
+        return []
+    return [str(r[3]) for r in rows]
+
+
+def _scan_note(plan: list[str]) -> str:
+    scans = [p for p in plan if p.startswith("SCAN") and "USING COVERING INDEX" not in p]
+    return "; ".join(scans)
+
+
+def build_top_text(conn: sqlite3.Connection | None = None, n: int = 10) -> str:
+    """/쿼리통계 출력."""
+    if _profiler is None:
+        return "SQL 프로파일러가 꺼져 있어요. (SQL_PROFILE=1 로 켜고 재시작)"
+
+    top = _profiler.top(n)
+    mins = (time.time() - _profiler.started_at) / 60
+    lines = [f"🧮 **SQL 상위 {len(top)}개** (총 시간 순, 최근 {mins:.0f}분)"]
+    if not top:
+        lines.append("아직 기록이 없어요.")
+        return "\n".join(lines)
+
+    for i, s in enumerate(top, 1):
+        avg = s.total_s * 1000 / s.count if s.count else 0.0
+        site = s.sites.most_common(1)[0][0] if s.sites else "-"
+        rows_per = s.rows / s.count if s.count else 0
+        lines.append(
+            f"**{i}.** {s.total_s * 1000:.0f}ms · {s.count}회 · 평균 {avg:.2f}ms · 최대 {s.max_s * 1000:.1f}ms · 행/회 {rows_per:.0f}"
+        )
+        lines.append(f"`{site}`")
+        if conn is not None:
+            scan = _scan_note(_query_plan(conn, s.sql))
+            if scan:
+                lines.append(f"⚠️ {scan}")
+        lines.append(f"```sql\n{s.sql[:180]}\n```")
+    return "\n".join(lines)[:1990]
+
+
+def _dump_at_exit() -> None:
+    if _profiler is None:
+        return
+    n = _env_int("SQL_PROFILE_TOP", 20)
+    snap = _profiler.snapshot(n)
+    if not snap:
+        return
+    print(f"[SQL_PROFILE] top {len(snap)} statements by total time")
+    for s in snap:
+        print(f"  {s['total_ms']:>10.1f}ms {s['count']:>7}x avg={s['avg_ms']:.2f}ms max={s['max_ms']:.1f}ms "
+              f"rows={s['rows']} | {s['sql'][:160]}")
+    out = os.environ.get("SQL_PROFILE_OUT", "./data/sql_profile.json")
+    try:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(json.dumps({
+            "started_at": _profiler.started_at,
+            "ended_at": time.time(),
+            "statements": snap,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[SQL_PROFILE] saved: {out}")
+    except OSError as e:
+        print(f"[SQL_PROFILE] save failed: {e!r}")
@@ -5,25 +5,26 @@ import discord
 from discord.ui import View, Button, Select, Modal, TextInput
 
 from utils.perm import is_admin
+from repo.records import Category
 from repo.category_repo import (
     list_categories,
     create_or_reactivate_category,
     deactivate_category_and_move_items_to_etc,
 )
 
-def _build_embed(guild: discord.Guild, cats: list[dict]) -> discord.Embed:
+def _build_embed(guild: discord.Guild, cats: list[Category]) -> discord.Embed:
     emb = discord.Embed(title="카테고리 관리", description="추가/비활성화(삭제 대체)를 할 수 있어요.")
-    act = [c for c in cats if c["is_active"] == 1]
-    ina = [c for c in cats if c["is_active"] == 0]
+    act = [c for c in cats if c.is_active == 1]
+    ina = [c for c in cats if c.is_active == 0]
 
     emb.add_field(
         name=f"활성({len(act)})",
-        value="\n".join([f"- {c['name']}" for c in act]) or "- 없음",
+        value="\n".join([f"- {c.name}" for c in act]) or "- 없음",
         inline=False,
     )
     emb.add_field(
         name=f"비활성({len(ina)})",
-        value="\n".join([f"- {c['name']}" for c in ina]) or "- 없음",
+        value="\n".join([f"- {c.name}" for c in ina]) or "- 없음",
         inline=False,
     )
     emb.set_footer(text=f"{guild.name} · '기타'는 항상 활성 유지")
@@ -59,9 +60,9 @@ class _CategorySelect(Select):
         cats = list_categories(conn, guild_id, include_inactive=True)
         opts = []
         for c in cats:
-            label = c["name"]
-            desc = "활성" if c["is_active"] == 1 else "비활성"
-            opts.append(discord.SelectOption(label=label[:100], value=str(c["id"]), description=desc))
+            label = c.name
+            desc = "활성" if c.is_active == 1 else "비활성"
+            opts.append(discord.SelectOption(label=label[:100], value=str(c.id), description=desc))
         super().__init__(placeholder="비활성화할 카테고리 선택", min_values=1, max_values=1, options=opts)
 
     async def callback(self, interaction: discord.Interaction):
@@ -5,6 +5,7 @@ import discord
 from discord.ui import Modal, TextInput, View, Select
 
 from repo.item_repo import search_items
+from repo.records import Item
 from ui.item_actions import _InOutModal, _AdjustModal  # reuse existing modals
 
 
@@ -19,16 +20,16 @@ def _item_desc(category_name: str, qty: int | None) -> str:
 
 
 class _ActionItemSelect(Select):
-    def __init__(self, items: list[dict], action: str):
+    def __init__(self, items: list[Item], action: str):
         self.items = items
         self.action = action  # IN / OUT / ADJUST
         opts = []
         for it in items:
             opts.append(
                 discord.SelectOption(
-                    label=_item_label(it.get("name", ""), it.get("code")),
-                    value=str(it.get("id")),
-                    description=_item_desc(it.get("category_name", "기타"), it.get("qty")),
+                    label=_item_label(it.name or "", it.code),
+                    value=str(it.id),
+                    description=_item_desc(it.category_name or "기타", it.qty),
                 )
             )
         placeholder = "품목을 선택하세요"
@@ -37,11 +38,11 @@ class _ActionItemSelect(Select):
     async def callback(self, interaction: discord.Interaction):
         try:
             chosen_id = int(self.values[0])
-            chosen = next((x for x in self.items if int(x.get("id")) == chosen_id), None)
+            chosen = next((x for x in self.items if x.id == chosen_id), None)
             if not chosen:
                 return await interaction.response.send_message("선택한 품목을 찾지 못했어요.", ephemeral=True)
 
-            name = str(chosen.get("name") or "")
+            name = str(chosen.name or "")
 
             if self.action == "IN":
                 return await interaction.response.send_modal(_InOutModal(chosen_id, name, "IN"))
@@ -56,7 +57,7 @@ class _ActionItemSelect(Select):
 
 
 class ActionItemPickView(View):
-    def __init__(self, items: list[dict], action: str):
+    def __init__(self, items: list[Item], action: str):
         super().__init__(timeout=5 * 60)
         self.add_item(_ActionItemSelect(items, action))
 
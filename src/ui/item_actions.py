@@ -162,6 +162,7 @@ class ItemActionsView(View):
         self.add_item(_BtnIn(item_id, item_name))
         self.add_item(_BtnOut(item_id, item_name))
         self.add_item(_BtnAdjust(item_id, item_name))
+        self.add_item(_BtnHistory(item_id, item_name))
 
 
 class _BtnIn(Button):
@@ -193,3 +194,17 @@ class _BtnAdjust(Button):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.send_modal(_AdjustModal(self.item_id, self.item_name))
 
+
+class _BtnHistory(Button):
+    def __init__(self, item_id: int, item_name: str):
+        super().__init__(label="이력", style=discord.ButtonStyle.primary)
+        self.item_id = item_id
+        self.item_name = item_name
+
+    async def callback(self, interaction: discord.Interaction):
+        # 순환 import 방지
+        from ui.item_history import ItemHistoryView
+
+        view = ItemHistoryView(interaction.client.conn, interaction.guild_id, self.item_id, self.item_name)
+        await view.send(interaction)
+
@@ -5,6 +5,7 @@ import discord
 from discord.ui import View, Select, Modal, TextInput
 
 from repo.category_repo import list_active_categories
+from repo.records import Category
 from repo.item_repo import create_item
 
 
@@ -68,13 +69,13 @@ class AddItemModal(Modal):
 
 
 class CategorySelect(Select):
-    def __init__(self, conn, guild_id: int, categories: list[dict]):
+    def __init__(self, conn, guild_id: int, categories: list[Category]):
         self.conn = conn
         self.guild_id = guild_id
         self.categories = categories
 
         options = [
-            discord.SelectOption(label=str(c["name"])[:100], value=str(c["id"]))
+            discord.SelectOption(label=str(c.name)[:100], value=str(c.id))
             for c in categories[:25]
         ]
         super().__init__(
@@ -93,12 +94,12 @@ class CategorySelect(Select):
             )
 
         cid = int(self.values[0])
-        c = next((x for x in self.categories if int(x["id"]) == cid), None)
+        c = next((x for x in self.categories if int(x.id) == cid), None)
         if not c:
             return await interaction.response.send_message("카테고리를 찾지 못했어요.", ephemeral=True)
 
         await interaction.response.send_modal(
-            AddItemModal(self.conn, self.guild_id, cid, str(c["name"]))
+            AddItemModal(self.conn, self.guild_id, cid, str(c.name))
         )
 
         # 에페메랄은 삭제가 안 되는 경우가 많아서 UI 제거(재사용 방지)
@@ -0,0 +1,117 @@
+# src/ui/item_history.py
+from __future__ import annotations
+
+import discord
+from discord.ui import View, Button
+
+from repo.history_repo import list_item_movements_page
+from repo.records import Movement
+
+PAGE_SIZE = 10
+
+_ACTION_KOR = {"IN": "입고", "OUT": "출고", "ADJUST": "정정"}
+
+
+def _fmt_movement_line(m: Movement) -> str:
+    when = str(m.created_at_kst_text or "")[2:16]  # YY/MM/DD HH:MM
+    action = _ACTION_KOR.get(str(m.action), str(m.action))
+    bits = [f"`{when}`", f"**{action}**"]
+    if m.action in _ACTION_KOR:
+        change = int(m.qty_change or 0)
+        bits.append(f"{'+' if change >= 0 else ''}{change} ({m.before_qty}→{m.after_qty})")
+    bits.append(str(m.discord_name or ""))
+    reason = str(m.reason or "").strip()
+    if reason:
+        bits.append(f"사유: {reason[:60]}")
+    return " · ".join(bits)
+
+
+class _BtnNewer(Button):
+    def __init__(self):
+        super().__init__(label="◀ 최근", style=discord.ButtonStyle.secondary)
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if not isinstance(view, ItemHistoryView):
+            return
+        if view.page > 0:
+            view.page -= 1
+        await view._update_message(interaction)
+
+
+class _BtnOlder(Button):
+    def __init__(self):
+        super().__init__(label="이전 ▶", style=discord.ButtonStyle.secondary)
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if not isinstance(view, ItemHistoryView):
+            return
+        if view.has_more:
+            view.page += 1
+        await view._update_message(interaction)
+
+
+class ItemHistoryView(View):
+    """
+    품목 1개 입출고 이력(최신순, 페이지 이동)
+    - 페이지마다 마지막 행의 (created_at_epoch, id)를 커서로 저장 → 앞으로/뒤로 OFFSET 없이 이동
+    - 분기 정리로 보관 파일에 옮겨진 오래된 기록은 여기 나오지 않음
+    """
+
+    def __init__(self, conn, guild_id: int, item_id: int, item_name: str):
+        super().__init__(timeout=10 * 60)
+        self.conn = conn
+        self.guild_id = int(guild_id)
+        self.item_id = int(item_id)
+        self.item_name = item_name
+        self.page = 0
+        self.cursors: list[tuple[int, int] | None] = [None]  # page → 그 페이지 시작 커서
+        self.has_more = False
+
+        self.btn_newer = _BtnNewer()
+        self.btn_older = _BtnOlder()
+        self.add_item(self.btn_newer)
+        self.add_item(self.btn_older)
+
+    def _render_embed(self) -> discord.Embed:
+        rows = list_item_movements_page(
+            self.conn, self.guild_id, self.item_id, before=self.cursors[self.page], limit=PAGE_SIZE,
+        )
+        self.has_more = len(rows) > PAGE_SIZE
+        rows = rows[:PAGE_SIZE]
+        if self.has_more:
+            last = rows[-1]
+            nxt = (int(last.created_at_epoch), int(last.id))
+            if len(self.cursors) == self.page + 1:
+                self.cursors.append(nxt)
+            else:
+                self.cursors[self.page + 1] = nxt
+
+        self.btn_newer.disabled = self.page == 0
+        self.btn_older.disabled = not self.has_more
+
+        lines = [_fmt_movement_line(m) for m in rows] or ["(기록이 없어요)"]
+        emb = discord.Embed(
+            title=f"🧾 이력 · {self.item_name}",
+            description=(f"페이지 **{self.page + 1}** · 최신순\n\n" + "\n".join(lines))[:4000],
+        )
+        emb.set_footer(text=f"품목 ID {self.item_id} · 보관(아카이브)된 분기 기록은 제외")
+        return emb
+
+    async def send(self, interaction: discord.Interaction):
+        emb = self._render_embed()
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=emb, view=self, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=emb, view=self, ephemeral=True)
+
+    async def _update_message(self, interaction: discord.Interaction):
+        emb = self._render_embed()
+        try:
+            await interaction.response.edit_message(embed=emb, view=self)
+        except Exception:
+            try:
+                await interaction.followup.send(embed=emb, view=self, ephemeral=True)
+            except Exception:
+                pass
@@ -5,6 +5,7 @@ import discord
 from discord.ui import View, Select, Button
 
 from repo.category_repo import list_active_categories
+from repo.records import Category, Item
 from repo.item_repo import (
     list_items_by_category,
     count_items_by_category,
@@ -14,13 +15,13 @@ from repo.item_repo import (
 PAGE_SIZE = 12
 
 
-def _fmt_item_line(it: dict) -> str:
-    name = str(it.get("name") or "").strip() or "(이름없음)"
-    code = str(it.get("code") or "").strip()
-    qty = int(it.get("qty") or 0)
-    warn = int(it.get("warn_below") or 0)
-    storage = str(it.get("storage_location") or "").strip()
-    note = str(it.get("note") or "").strip()
+def _fmt_item_line(it: Item) -> str:
+    name = str(it.name or "").strip() or "(이름없음)"
+    code = str(it.code or "").strip()
+    qty = int(it.qty or 0)
+    warn = int(it.warn_below or 0)
+    storage = str(it.storage_location or "").strip()
+    note = str(it.note or "").strip()
 
     bits = [f"**{name}**"]
     if code:
@@ -37,13 +38,13 @@ def _fmt_item_line(it: dict) -> str:
 
 
 class _CategorySelect(Select):
-    def __init__(self, categories: list[dict], current_category_id: int | None):
+    def __init__(self, categories: list[Category], current_category_id: int | None):
         self.categories = categories
 
         opts = []
         for c in categories[:25]:
-            cid = str(c.get("id") or "")
-            label = str(c.get("name") or "")[:100] or "(이름없음)"
+            cid = str(c.id or "")
+            label = str(c.name or "")[:100] or "(이름없음)"
             opts.append(
                 discord.SelectOption(
                     label=label,
@@ -136,7 +137,7 @@ class ItemListView(View):
 
         cats = list_active_categories(self.conn, self.guild_id)
         if cats:
-            self.category_id = int(cats[0]["id"])
+            self.category_id = int(cats[0].id)
         else:
             # 카테고리가 없으면, (이론상 ensure_initialized로 생길 텐데) 혹시 몰라 방어
             msg = "카테고리가 없어요. 먼저 `/카테고리관리`에서 카테고리를 추가해 주세요."
@@ -177,8 +178,8 @@ class ItemListView(View):
         # 카테고리명 찾기
         cat_name = "카테고리"
         for c in list_active_categories(self.conn, self.guild_id):
-            if int(c["id"]) == int(self.category_id):
-                cat_name = str(c["name"])
+            if int(c.id) == int(self.category_id):
+                cat_name = str(c.name)
                 break
 
         emb = discord.Embed(
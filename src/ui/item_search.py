@@ -5,6 +5,7 @@ import discord
 from discord.ui import Modal, TextInput, View, Select
 
 from repo.item_repo import search_items
+from repo.records import Item
 from ui.item_actions import ItemActionsView
 from utils.perm import is_admin
 
@@ -22,14 +23,14 @@ def _item_desc(category_name: str, qty: int | None) -> str:
     return f"{category_name} · 재고 {q}"[:100]
 
 
-def build_item_embed(guild: discord.Guild, item: dict) -> discord.Embed:
-    name = item.get("name") or "(이름 없음)"
-    code = item.get("code") or "-"
-    qty = item.get("qty")
-    cat = item.get("category_name") or "기타"
-    note = item.get("note") or "-"
-    loc = item.get("storage_location") or "-"
-    img = item.get("image_url")
+def build_item_embed(guild: discord.Guild, item: Item) -> discord.Embed:
+    name = item.name or "(이름 없음)"
+    code = item.code or "-"
+    qty = item.qty
+    cat = item.category_name or "기타"
+    note = item.note or "-"
+    loc = item.storage_location or "-"
+    img = item.image_url
 
     emb = discord.Embed(title=name, description="품목 상세")
     emb.add_field(name="코드", value=str(code), inline=True)
@@ -39,7 +40,7 @@ def build_item_embed(guild: discord.Guild, item: dict) -> discord.Embed:
     emb.add_field(name="메모", value=str(note), inline=False)
     if img:
         emb.set_image(url=str(img))
-    emb.set_footer(text=f"{guild.name} · 품목 ID {item.get('id')}")
+    emb.set_footer(text=f"{guild.name} · 품목 ID {item.id}")
     return emb
 
 
@@ -76,15 +77,15 @@ class ItemSearchModal(Modal, title="품목 검색"):
 
 
 class ItemResultSelect(Select):
-    def __init__(self, items: list[dict]):
+    def __init__(self, items: list[Item]):
         self.items = items
         opts = []
         for it in items:
             opts.append(
                 discord.SelectOption(
-                    label=_item_label(it.get("name", ""), it.get("code")),
-                    value=str(it.get("id")),
-                    description=_item_desc(it.get("category_name", "기타"), it.get("qty")),
+                    label=_item_label(it.name or "", it.code),
+                    value=str(it.id),
+                    description=_item_desc(it.category_name or "기타", it.qty),
                 )
             )
         super().__init__(placeholder="품목을 선택하세요", min_values=1, max_values=1, options=opts)
@@ -98,23 +99,23 @@ class ItemResultSelect(Select):
 
         try:
             chosen_id = int(self.values[0])
-            chosen = next((x for x in self.items if int(x.get("id")) == chosen_id), None)
+            chosen = next((x for x in self.items if x.id == chosen_id), None)
             if not chosen:
                 return await interaction.followup.send("선택한 품목을 찾지 못했어요.", ephemeral=True)
 
             emb = build_item_embed(interaction.guild, chosen)
 
-            # 기본 3버튼(입고/출고/정정)
-            view = ItemActionsView(item_id=chosen_id, item_name=str(chosen.get("name") or ""))
+            # 기본 버튼(입고/출고/정정/이력)
+            view = ItemActionsView(item_id=chosen_id, item_name=str(chosen.name or ""))
 
             # 사진 업로드 버튼(누구나)
             from ui.item_image import _BtnUploadImage
-            view.add_item(_BtnUploadImage(chosen_id, str(chosen.get("name") or "")))
+            view.add_item(_BtnUploadImage(chosen_id, str(chosen.name or "")))
 
             # 품목 삭제(비활성화) 버튼(관리자)
             if is_admin(interaction, interaction.client.conn):
                 from ui.item_delete import _BtnDeactivate
-                view.add_item(_BtnDeactivate(chosen_id, str(chosen.get("name") or "")))
+                view.add_item(_BtnDeactivate(chosen_id, str(chosen.name or "")))
 
             await interaction.followup.send(embed=emb, ephemeral=True, view=view)
 
@@ -126,6 +127,6 @@ class ItemResultSelect(Select):
 
 
 class ItemSearchResultsView(View):
-    def __init__(self, items: list[dict]):
+    def __init__(self, items: list[Item]):
         super().__init__(timeout=5 * 60)
         self.add_item(ItemResultSelect(items))
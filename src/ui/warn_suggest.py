@@ -0,0 +1,164 @@
+# src/ui/warn_suggest.py
+from __future__ import annotations
+
+import discord
+from discord.ui import View, Button
+
+from analytics import WarnSuggestion
+from repo.item_repo import bulk_update_warn_below
+from utils.perm import is_admin
+
+PAGE_SIZE = 15
+
+
+def _fmt_line(s: WarnSuggestion) -> str:
+    cur = str(s.current) if s.current > 0 else "꺼짐"
+    code = f" ({s.code})" if s.code else ""
+    mark = " ⚠️" if s.newly_alerting else ""
+    return (
+        f"`{s.name[:20]}{code}` {cur} → **{s.suggested}**"
+        f" · 재고 {s.qty} · 일평균 {s.daily_mean:.1f}{mark}"
+    )
+
+
+class _BtnPrev(Button):
+    def __init__(self):
+        super().__init__(label="◀", style=discord.ButtonStyle.secondary, row=0)
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if not isinstance(view, WarnSuggestView):
+            return
+        view.page = max(0, view.page - 1)
+        await view._update_message(interaction)
+
+
+class _BtnNext(Button):
+    def __init__(self):
+        super().__init__(label="▶", style=discord.ButtonStyle.secondary, row=0)
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if not isinstance(view, WarnSuggestView):
+            return
+        view.page = min(view.pages - 1, view.page + 1)
+        await view._update_message(interaction)
+
+
+class _BtnApply(Button):
+    def __init__(self, only_off: bool):
+        label = "꺼진 품목만 적용" if only_off else "전체 적용"
+        style = discord.ButtonStyle.primary if only_off else discord.ButtonStyle.success
+        super().__init__(label=label, style=style, row=1)
+        self.only_off = only_off
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if not isinstance(view, WarnSuggestView):
+            return
+        await view.apply(interaction, self.only_off)
+
+
+class _BtnCancel(Button):
+    def __init__(self):
+        super().__init__(label="취소", style=discord.ButtonStyle.secondary, row=1)
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if not isinstance(view, WarnSuggestView):
+            return
+        view.done("취소했어요. 경고 기준은 그대로예요.")
+        await interaction.response.edit_message(embed=view._render_embed(), view=view)
+
+
+class WarnSuggestView(View):
+    """
+    경고 기준(warn_below) 제안 검토 화면(관리자)
+    - 제안 목록을 페이지로 보고 → 전체 / 현재 꺼진(0) 품목만 한 트랜잭션으로 적용
+    - ⚠️: 적용하면 바로 경고 상태(재고 ≤ 기준)가 되는 품목
+    """
+
+    def __init__(self, conn, guild_id: int, suggestions: list[WarnSuggestion], basis: str):
+        super().__init__(timeout=15 * 60)
+        self.conn = conn
+        self.guild_id = int(guild_id)
+        self.suggestions = suggestions
+        self.basis = basis
+        self.page = 0
+        self.result: str | None = None
+
+        self.btn_prev = _BtnPrev()
+        self.btn_next = _BtnNext()
+        self.btn_all = _BtnApply(only_off=False)
+        self.btn_off = _BtnApply(only_off=True)
+        for b in (self.btn_prev, self.btn_next, self.btn_all, self.btn_off, _BtnCancel()):
+            self.add_item(b)
+
+    @property
+    def pages(self) -> int:
+        return max(1, (len(self.suggestions) + PAGE_SIZE - 1) // PAGE_SIZE)
+
+    def done(self, text: str) -> None:
+        self.result = text
+        for child in self.children:
+            child.disabled = True
+        self.stop()
+
+    def _render_embed(self) -> discord.Embed:
+        total = len(self.suggestions)
+        n_off = sum(1 for s in self.suggestions if s.current == 0)
+        n_alert = sum(1 for s in self.suggestions if s.newly_alerting)
+
+        if self.result is None:
+            self.btn_prev.disabled = self.page == 0
+            self.btn_next.disabled = self.page >= self.pages - 1
+            self.btn_all.disabled = total == 0
+            self.btn_off.disabled = n_off == 0
+
+        rows = self.suggestions[self.page * PAGE_SIZE:(self.page + 1) * PAGE_SIZE]
+        lines = [_fmt_line(s) for s in rows] or ["(바꿀 만한 품목이 없어요)"]
+        head = (
+            f"제안 **{total}개** (꺼진 품목 {n_off}개) · 적용 시 바로 경고 상태 ⚠️ {n_alert}개\n"
+            f"{self.basis}\n\n"
+        )
+        emb = discord.Embed(title="🔔 경고 기준 제안", description=(head + "\n".join(lines))[:4000])
+        if self.result:
+            emb.add_field(name="결과", value=self.result[:1000], inline=False)
+        emb.set_footer(text=f"페이지 {self.page + 1}/{self.pages} · 현재 → 제안")
+        return emb
+
+    async def send(self, interaction: discord.Interaction):
+        emb = self._render_embed()
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=emb, view=self, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=emb, view=self, ephemeral=True)
+
+    async def _update_message(self, interaction: discord.Interaction):
+        emb = self._render_embed()
+        try:
+            await interaction.response.edit_message(embed=emb, view=self)
+        except Exception:
+            try:
+                await interaction.followup.send(embed=emb, view=self, ephemeral=True)
+            except Exception:
+                pass
+
+    async def apply(self, interaction: discord.Interaction, only_off: bool):
+        if not is_admin(interaction, self.conn):
+            return await interaction.response.send_message("권한이 없어요.", ephemeral=True)
+
+        picked = [s for s in self.suggestions if s.current == 0] if only_off else list(self.suggestions)
+        try:
+            changed = bulk_update_warn_below(
+                self.conn, self.guild_id, [(s.item_id, s.current, s.suggested) for s in picked],
+            )
+        except Exception as e:
+            return await interaction.response.send_message(f"적용 실패: `{type(e).__name__}: {e}`", ephemeral=True)
+
+        print(f"[WARN_SUGGEST] guild={self.guild_id} applied={changed}/{len(picked)} by={interaction.user.id}")
+        text = f"✅ {changed}개 품목의 경고 기준을 바꿨어요."
+        if changed < len(picked):
+            text += f"\n(검토하는 동안 다른 곳에서 바뀐 {len(picked) - changed}개는 건너뜀)"
+        self.done(text)
+        await self._update_message(interaction)
@@ -0,0 +1,329 @@
+# src/utils/instrument.py
+"""
+인터랙션(슬래시 명령/버튼·셀렉트/모달 제출) 지연 계측.
+
+- install(): discord.py 디스패치 지점(View/Modal/CommandTree)을 감싸서 핸들러마다 자동 측정
+  (콜백마다 데코레이터를 붙이지 않아도 됨, INSTRUMENT=0 이면 끔)
+  · ack: 핸들러 시작 → 첫 응답(defer/메시지/모달) 완료. 디스코드 3초 기한 대상
+  · response: 핸들러 시작 → 사용자에게 실제 내용이 보인 첫 시점(defer 제외, followup 포함)
+  · total: 핸들러 전체
+  · db: 이 핸들러 안에서 실행한 SQL 시간(db.add_query_observer), api: 디스코드 API 호출 시간
+  · gateway: 디스코드가 인터랙션을 만든 시각 → 핸들러 시작(게이트웨이 + 이벤트 루프 대기)
+- 핸들러별/길드별로 최근 INSTR_SAMPLES개 값을 메모리에 보관 → /상태 에서 p50/p95/p99
+- total 또는 ack가 INSTR_SLOW_MS 이상이면 [SLOW] 로그(구간별 시간 포함)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import wraps
+
+import discord
+from discord import app_commands
+
+from db import add_query_observer
+from utils.metrics import INTERACTION_ACK_SECONDS, INTERACTIONS
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+ACK_DEADLINE_MS = 3000.0
+
+
+@dataclass
+class _Trace:
+    name: str
+    kind: str                       # command / component / modal
+    guild_id: int | None
+    started: float
+    gateway_ms: float = 0.0
+    ack_at: float | None = None
+    response_at: float | None = None
+    db_s: float = 0.0
+    db_n: int = 0
+    api_s: float = 0.0
+    api_n: int = 0
+    error: str = ""
+
+
+_current: ContextVar[_Trace | None] = ContextVar("inventory_interaction_trace", default=None)
+
+
+class _Rolling:
+    """최근 maxlen개 값(ms) → 백분위."""
+
+    def __init__(self, maxlen: int):
+        self.values: deque[float] = deque(maxlen=maxlen)
+
+    def add(self, v: float) -> None:
+        self.values.append(v)
+
+    def pct(self, p: float) -> float:
+        if not self.values:
+            return 0.0
+        s = sorted(self.values)
+        return s[min(len(s) - 1, int(len(s) * p))]
+
+    def mean(self) -> float:
+        return sum(self.values) / len(self.values) if self.values else 0.0
+
+
+@dataclass
+class _Stats:
+    maxlen: int
+    count: int = 0
+    slow: int = 0
+    no_ack: int = 0
+    errors: int = 0
+    ack: _Rolling = field(init=False)
+    response: _Rolling = field(init=False)
+    total: _Rolling = field(init=False)
+    db: _Rolling = field(init=False)
+    api: _Rolling = field(init=False)
+
+    def __post_init__(self):
+        self.ack = _Rolling(self.maxlen)
+        self.response = _Rolling(self.maxlen)
+        self.total = _Rolling(self.maxlen)
+        self.db = _Rolling(self.maxlen)
+        self.api = _Rolling(self.maxlen)
+
+
+_lock = threading.Lock()
+_by_handler: dict[str, _Stats] = {}
+_by_guild: dict[int, _Stats] = {}
+_installed = False
+_started_at = time.time()
+
+
+def _record(t: _Trace, total_ms: float, ack_ms: float | None, response_ms: float | None) -> None:
+    maxlen = max(100, _env_int("INSTR_SAMPLES", 1000))
+    slow = total_ms >= _env_int("INSTR_SLOW_MS", 2000) or (ack_ms or 0.0) >= _env_int("INSTR_ACK_WARN_MS", 2500)
+    with _lock:
+        targets = [_by_handler.setdefault(t.name, _Stats(maxlen))]
+        if t.guild_id:
+            targets.append(_by_guild.setdefault(int(t.guild_id), _Stats(maxlen)))
+        for st in targets:
+            st.count += 1
+            st.total.add(total_ms)
+            st.db.add(t.db_s * 1000)
+            st.api.add(t.api_s * 1000)
+            if ack_ms is None:
+                st.no_ack += 1
+            else:
+                st.ack.add(ack_ms)
+            if response_ms is not None:
+                st.response.add(response_ms)
+            if slow:
+                st.slow += 1
+            if t.error:
+                st.errors += 1
+    INTERACTIONS.inc(t.kind, "error" if t.error else ("no_ack" if ack_ms is None else "ok"))
+    if ack_ms is not None:
+        INTERACTION_ACK_SECONDS.observe(ack_ms / 1000, t.kind)
+    if slow:
+        db_ms, api_ms = t.db_s * 1000, t.api_s * 1000
+        print(
+            f"[SLOW] {t.name} guild={t.guild_id} total={total_ms:.0f}ms "
+            f"ack={'-' if ack_ms is None else f'{ack_ms:.0f}ms'} "
+            f"resp={'-' if response_ms is None else f'{response_ms:.0f}ms'} "
+            f"gateway={t.gateway_ms:.0f}ms db={db_ms:.0f}ms({t.db_n}q) api={api_ms:.0f}ms({t.api_n}) "
+            f"other={max(0.0, total_ms - db_ms - api_ms):.0f}ms"
+            + (f" error={t.error}" if t.error else "")
+        )
+
+
+def _gateway_ms(interaction: discord.Interaction) -> float:
+    try:
+        return max(0.0, (datetime.now(timezone.utc) - interaction.created_at).total_seconds() * 1000)
+    except Exception:
+        return 0.0
+
+
+async def _traced(name: str, kind: str, interaction: discord.Interaction, run):
+    t = _Trace(
+        name=name,
+        kind=kind,
+        guild_id=getattr(interaction, "guild_id", None),
+        started=time.perf_counter(),
+        gateway_ms=_gateway_ms(interaction),
+    )
+    token = _current.set(t)
+    try:
+        return await run()
+    except Exception as e:
+        t.error = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        end = time.perf_counter()
+        _record(
+            t,
+            (end - t.started) * 1000,
+            None if t.ack_at is None else (t.ack_at - t.started) * 1000,
+            None if t.response_at is None else (t.response_at - t.started) * 1000,
+        )
+
+
+# ---- 디스패치 지점 감싸기 ----
+
+def _item_name(view, item) -> str:
+    if getattr(item, "_provided_custom_id", False) and getattr(item, "custom_id", None):
+        return str(item.custom_id)
+    return f"{type(view).__name__}.{type(item).__name__}"
+
+
+def _command_name(interaction: discord.Interaction) -> str:
+    data = interaction.data or {}
+    return "/" + str(data.get("name") or "?")
+
+
+def _wrap_dispatch() -> None:
+    view_task = discord.ui.View._scheduled_task
+
+    @wraps(view_task)
+    async def view_scheduled_task(self, item, interaction):
+        return await _traced(_item_name(self, item), "component", interaction,
+                             lambda: view_task(self, item, interaction))
+
+    modal_task = discord.ui.Modal._scheduled_task
+
+    @wraps(modal_task)
+    async def modal_scheduled_task(self, interaction, *args, **kwargs):
+        return await _traced(type(self).__name__, "modal", interaction,
+                             lambda: modal_task(self, interaction, *args, **kwargs))
+
+    tree_call = app_commands.CommandTree._call
+
+    @wraps(tree_call)
+    async def tree_call_traced(self, interaction):
+        return await _traced(_command_name(interaction), "command", interaction,
+                             lambda: tree_call(self, interaction))
+
+    discord.ui.View._scheduled_task = view_scheduled_task
+    discord.ui.Modal._scheduled_task = modal_scheduled_task
+    app_commands.CommandTree._call = tree_call_traced
+
+    # View/Modal은 예외를 on_error로 넘기고 삼키므로 여기서 에러 표시 + 트레이스백 출력
+    for cls in (discord.ui.View, discord.ui.Modal):
+        orig_on_error = cls.on_error
+
+        def _make(orig):
+            @wraps(orig)
+            async def on_error(self, interaction, error, *args):
+                t = _current.get()
+                if t is not None:
+                    t.error = type(error).__name__
+                    print(f"[INTERACTION_ERROR] {t.name} guild={t.guild_id}")
+                    traceback.print_exception(type(error), error, error.__traceback__)
+                return await orig(self, interaction, error, *args)
+            return on_error
+
+        cls.on_error = _make(orig_on_error)
+
+
+def _wrap_api(cls, attr: str, marks: tuple[str, ...]) -> None:
+    """디스코드 API 코루틴 메서드: 시간 합산 + (marks) ack/response 시각 기록."""
+    orig = getattr(cls, attr)
+
+    @wraps(orig)
+    async def wrapper(*args, **kwargs):
+        t = _current.get()
+        if t is None:
+            return await orig(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return await orig(*args, **kwargs)
+        finally:
+            t1 = time.perf_counter()
+            t.api_s += t1 - t0
+            t.api_n += 1
+            if "ack" in marks and t.ack_at is None:
+                t.ack_at = t1
+            if "response" in marks and t.response_at is None:
+                t.response_at = t1
+
+    setattr(cls, attr, wrapper)
+
+
+def _on_query(event: str, sql: str, seconds: float, rows: int) -> None:
+    t = _current.get()
+    if t is None:
+        return
+    t.db_s += seconds
+    if event != "fetch":
+        t.db_n += 1
+
+
+def install() -> bool:
+    """main()에서 1회. discord.py 내부 구조가 달라 감쌀 수 없으면 계측 없이 진행."""
+    global _installed
+    if _installed or os.environ.get("INSTRUMENT", "1") == "0":
+        return False
+    try:
+        _wrap_dispatch()
+        ir = discord.InteractionResponse
+        _wrap_api(ir, "defer", ("ack",))
+        _wrap_api(ir, "send_message", ("ack", "response"))
+        _wrap_api(ir, "edit_message", ("ack", "response"))
+        _wrap_api(ir, "send_modal", ("ack", "response"))
+        _wrap_api(discord.Webhook, "send", ("response",))                     # interaction.followup
+        _wrap_api(discord.Interaction, "edit_original_response", ("response",))
+        _wrap_api(discord.abc.Messageable, "send", ())                        # 알림 채널 등
+    except AttributeError as e:
+        print(f"[INSTR] 계측 설치 실패(discord.py {discord.__version__}): {e!r}")
+        return False
+    add_query_observer(_on_query)
+    _installed = True
+    print("[INSTR] interaction instrumentation on")
+    return True
+
+
+# ---- /상태 ----
+
+def _fmt(v: float) -> str:
+    return f"{v:.0f}" if v >= 10 else f"{v:.1f}"
+
+
+def build_status_text(guild_id: int | None = None, top: int = 12) -> str:
+    if not _installed:
+        return "계측이 꺼져 있어요. (INSTRUMENT=0 이거나 설치 실패)"
+
+    with _lock:
+        rows = sorted(_by_handler.items(), key=lambda kv: kv[1].count, reverse=True)[:top]
+        g = _by_guild.get(int(guild_id)) if guild_id else None
+
+        uptime_h = (time.time() - _started_at) / 3600
+        lines = [f"📈 **인터랙션 지연** (최근 {_env_int('INSTR_SAMPLES', 1000)}건 기준, 가동 {uptime_h:.1f}시간)"]
+        if g and g.count:
+            lines.append(
+                f"- 이 서버: {g.count}건 · ack p50/p95/p99 {_fmt(g.ack.pct(.5))}/{_fmt(g.ack.pct(.95))}/{_fmt(g.ack.pct(.99))}ms"
+                f" · 느림 {g.slow} · 무응답 {g.no_ack} · 오류 {g.errors}"
+            )
+        if not rows:
+            lines.append("아직 기록이 없어요.")
+            return "\n".join(lines)
+
+        lines.append("```")
+        lines.append(f"{'handler':<26}{'n':>5} {'ack p50/95/99':>16} {'total p50/95/99':>17} {'db':>5} {'api':>5} {'slow':>4} {'err':>3}")
+        for name, st in rows:
+            ack = f"{_fmt(st.ack.pct(.5))}/{_fmt(st.ack.pct(.95))}/{_fmt(st.ack.pct(.99))}"
+            tot = f"{_fmt(st.total.pct(.5))}/{_fmt(st.total.pct(.95))}/{_fmt(st.total.pct(.99))}"
+            lines.append(
+                f"{name[:26]:<26}{st.count:>5} {ack:>16} {tot:>17} {_fmt(st.db.mean()):>5} {_fmt(st.api.mean()):>5}"
+                f" {st.slow:>4} {st.errors:>3}"
+            )
+        lines.append("```")
+        lines.append(f"단위 ms · db/api는 평균 · 느림 기준 total≥{_env_int('INSTR_SLOW_MS', 2000)}ms 또는 ack≥{_env_int('INSTR_ACK_WARN_MS', 2500)}ms")
+    return "\n".join(lines)[:1990]
@@ -0,0 +1,219 @@
+# src/utils/loop_watchdog.py
+"""
+이벤트 루프 멈춤(블로킹 호출) 감지.
+
+- 루프 안 heartbeat 태스크가 LOOP_WATCHDOG_INTERVAL_MS마다 시각을 갱신
+- 별도 데몬 스레드가 같은 간격으로 확인 → 마지막 heartbeat가 LOOP_STALL_MS 이상 지났으면 멈춤으로 보고
+  멈춘 동안 루프 스레드의 스택을 계속 샘플링(sys._current_frames) → 가장 많이 찍힌 함수가 범인
+  (src 안의 가장 안쪽 프레임 기준: build_monthly_log_wb, do_backup_sqlite 같은 이름이 나옴)
+- 멈춤이 끝나면 [LOOP_STALL] 로그 1줄 + 스택 요약, 같은 범인은 누적 횟수/총 시간/최대로 집계 → /상태
+- 스레드는 멈춤이 없을 때 시각 비교만 하므로 부담 거의 없음. LOOP_WATCHDOG=0 이면 끔
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from utils.metrics import REGISTRY
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+_SRC_DIR = Path(__file__).resolve().parents[1]
+# 범인 후보에서 뺄 파일(계측/DB 래퍼 - 항상 스택에 끼어 있어서 범인으로 보이면 의미 없음)
+_SKIP_FILES = {"loop_watchdog.py", "instrument.py", "db.py", "records.py", "metrics.py"}
+_MAX_DEPTH = 80
+
+_STALLS = REGISTRY.counter("inventory_event_loop_stalls_total", "LOOP_STALL_MS 이상 이벤트 루프가 멈춘 횟수")
+_STALL_SECONDS = REGISTRY.histogram(
+    "inventory_event_loop_stall_seconds", "이벤트 루프 멈춤 시간",
+    buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+@dataclass
+class _Offender:
+    count: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    last_at: float = 0.0
+    leaf: str = ""
+
+
+@dataclass
+class _Stall:
+    started: float
+    samples: int = 0
+    culprits: Counter = field(default_factory=Counter)
+    leaves: Counter = field(default_factory=Counter)
+    stack: list[str] = field(default_factory=list)
+
+
+def _rel(filename: str) -> str | None:
+    """src 안 파일이면 src 기준 상대 경로, 아니면 None."""
+    try:
+        return Path(filename).resolve().relative_to(_SRC_DIR).as_posix()
+    except ValueError:
+        return None
+
+
+def _describe(frame) -> tuple[str, str, list[str]]:
+    """(범인: src 안 가장 안쪽 프레임, 실제 멈춘 맨 안쪽 프레임, 요약 스택(바깥→안쪽))."""
+    culprit = ""
+    leaf = ""
+    stack: list[str] = []
+    f = frame
+    depth = 0
+    while f is not None and depth < _MAX_DEPTH:
+        code = f.f_code
+        where = f"{os.path.basename(code.co_filename)}:{f.f_lineno} {code.co_name}"
+        if not leaf:
+            leaf = where
+        rel = _rel(code.co_filename)
+        if rel is not None:
+            stack.append(f"{rel}:{f.f_lineno} {code.co_name}")
+            if not culprit and os.path.basename(code.co_filename) not in _SKIP_FILES:
+                culprit = f"{rel}:{code.co_name}"
+        f = f.f_back
+        depth += 1
+    stack.reverse()
+    return culprit or leaf, leaf, stack
+
+
+class LoopWatchdog:
+    def __init__(self, loop: asyncio.AbstractEventLoop, stall_ms: int, interval_ms: int):
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()  # start()는 루프 스레드에서 호출
+        self.stall_s = stall_ms / 1000.0
+        self.interval_s = max(0.01, interval_ms / 1000.0)
+        self.offenders: dict[str, _Offender] = {}
+        self.stalls = 0
+        self._last_beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+    # ---- 루프 쪽 ----
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval_s)
+
+    # ---- 감시 스레드 ----
+    def _watch(self) -> None:
+        stall: _Stall | None = None
+        while not self._stop.wait(self.interval_s):
+            now = time.monotonic()
+            since = now - self._last_beat
+            # heartbeat 자체가 interval만큼 자므로 그만큼은 빼고 판단
+            if since - self.interval_s >= self.stall_s:
+                if stall is None:
+                    stall = _Stall(started=self._last_beat + self.interval_s)
+                self._sample(stall)
+                if stall.samples == int(10 / self.interval_s):
+                    # 아주 긴 멈춤은 끝나기 전에 한 번 알림
+                    culprit = stall.culprits.most_common(1)[0][0] if stall.culprits else "?"
+                    print(f"[LOOP_STALL] still blocked {now - stall.started:.1f}s in {culprit}")
+            elif stall is not None:
+                self._finish(stall, self._last_beat - stall.started)
+                stall = None
+
+    def _sample(self, stall: _Stall) -> None:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+        culprit, leaf, stack = _describe(frame)
+        del frame
+        stall.samples += 1
+        stall.culprits[culprit] += 1
+        stall.leaves[leaf] += 1
+        if not stall.stack or stall.culprits[culprit] == stall.culprits.most_common(1)[0][1]:
+            stall.stack = stack
+
+    def _finish(self, stall: _Stall, seconds: float) -> None:
+        seconds = max(seconds, self.stall_s)
+        culprit = stall.culprits.most_common(1)[0][0] if stall.culprits else "?"
+        leaf = stall.leaves.most_common(1)[0][0] if stall.leaves else "?"
+        with self._lock:
+            self.stalls += 1
+            o = self.offenders.setdefault(culprit, _Offender())
+            o.count += 1
+            o.total_s += seconds
+            o.max_s = max(o.max_s, seconds)
+            o.last_at = time.time()
+            o.leaf = leaf
+            n = o.count
+        _STALLS.inc()
+        _STALL_SECONDS.observe(seconds)
+        print(
+            f"[LOOP_STALL] {seconds * 1000:.0f}ms blocked in {culprit} (leaf {leaf}, samples={stall.samples}"
+            + (f", {n}회째" if n > 1 else "") + ")"
+        )
+        if stall.stack:
+            print("  " + " → ".join(stall.stack[-8:]))
+
+    # ---- 시작/중지 ----
+    def start(self) -> None:
+        self._task = self.loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def top(self, n: int = 8) -> list[tuple[str, _Offender]]:
+        with self._lock:
+            return sorted(self.offenders.items(), key=lambda kv: kv[1].total_s, reverse=True)[:n]
+
+
+_watchdog: LoopWatchdog | None = None
+
+
+def start() -> bool:
+    """setup_hook 등 이벤트 루프 안에서 1회. LOOP_WATCHDOG=0 이면 끔."""
+    global _watchdog
+    if _watchdog is not None or os.environ.get("LOOP_WATCHDOG", "1") == "0":
+        return False
+    _watchdog = LoopWatchdog(
+        asyncio.get_running_loop(),
+        _env_int("LOOP_STALL_MS", 500),
+        _env_int("LOOP_WATCHDOG_INTERVAL_MS", 50),
+    )
+    _watchdog.start()
+    print(f"[LOOP_WATCHDOG] on (stall ≥ {_watchdog.stall_s * 1000:.0f}ms)")
+    return True
+
+
+def stop() -> None:
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+
+
+def build_summary_text(n: int = 5) -> str:
+    """/상태 하단: 루프를 멈춘 함수 상위 n개."""
+    if _watchdog is None:
+        return ""
+    top = _watchdog.top(n)
+    if not top:
+        return f"🐢 이벤트 루프 멈춤(≥{_watchdog.stall_s * 1000:.0f}ms): 없음"
+    lines = [f"🐢 **이벤트 루프 멈춤** {_watchdog.stalls}회 (≥{_watchdog.stall_s * 1000:.0f}ms, 총 시간 순)"]
+    for culprit, o in top:
+        lines.append(f"- `{culprit}` {o.count}회 · 총 {o.total_s:.1f}s · 최대 {o.max_s:.1f}s")
+    return "\n".join(lines)
@@ -0,0 +1,370 @@
+# src/utils/metrics.py
+"""
+운영용 지표(카운터/게이지/히스토그램) + 로컬 HTTP 노출(Prometheus 텍스트 형식).
+
+- 모듈 전역 REGISTRY 하나에 등록, 이름은 inventory_* 로 통일
+- 핫패스(입출고 등)에서는 inc/observe만 호출: 잠금 1번 + dict 갱신 정도라 부담 없음
+- 큐 깊이/풀 사용량처럼 "지금 값"은 set_function으로 긁어갈 때(scrape)만 계산
+- METRICS_PORT > 0 이면 setup_hook에서 start_http_server() → http://METRICS_HOST:PORT/metrics
+  (기본 127.0.0.1, 외부 노출이 필요하면 리버스 프록시/METRICS_HOST로 직접 지정)
+- aiohttp는 discord.py 의존성이라 보통 설치돼 있음. 없으면 엔드포인트 없이 지표만 집계
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+import time
+from typing import Callable, Iterable
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _fmt_value(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    if v == -math.inf:
+        return "-Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: tuple) -> tuple[str, ...]:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name}: 라벨 {self.label_names} 개수가 맞지 않아요: {labels}")
+        return tuple(str(v) for v in labels)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels_text(self.label_names, k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._fn: Callable[[], float | dict[tuple, float]] | None = None
+
+    def set(self, value: float, *labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, fn: Callable[[], float | dict[tuple, float]]) -> None:
+        """긁어갈 때마다 fn() 값을 씀. 라벨이 있으면 {라벨 튜플: 값} 반환."""
+        self._fn = fn
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        if self._fn is not None:
+            try:
+                v = self._fn()
+            except Exception as e:
+                print(f"[METRICS] {self.name} 계산 실패: {e!r}")
+                return []
+            if not isinstance(v, dict):
+                return [f"{self.name} {_fmt_value(v)}"]
+            items = sorted((self._key(k if isinstance(k, tuple) else (k,)), float(x)) for k, x in v.items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{_labels_text(self.label_names, k)} {_fmt_value(v)}" for k, v in items]
+
+
+# 초 단위 기본 구간(보고서 생성/백업처럼 수십 ms ~ 수십 초 걸리는 작업 기준)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # 라벨 → [구간별 개수..., 합계, 개수]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        key = self._key(labels)
+        n = len(self.buckets)
+        with self._lock:
+            v = self._values.get(key)
+            if v is None:
+                v = self._values[key] = [0.0] * (n + 2)
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    v[i] += 1
+                    break
+            v[n] += value
+            v[n + 1] += 1
+
+    def time(self, *labels) -> "_Timer":
+        return _Timer(self, labels)
+
+    def count(self, *labels) -> float:
+        v = self._values.get(self._key(labels))
+        return v[-1] if v else 0.0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = []
+        n = len(self.buckets)
+        les = ['le="%s"' % _fmt_value(b) for b in self.buckets]
+        for key, v in items:
+            acc = 0.0
+            for i, le in enumerate(les):
+                acc += v[i]
+                out.append(f"{self.name}_bucket{_labels_text(self.label_names, key, le)} {_fmt_value(acc)}")
+            inf = _labels_text(self.label_names, key, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{inf} {_fmt_value(v[n + 1])}")
+            out.append(f"{self.name}_sum{_labels_text(self.label_names, key)} {_fmt_value(v[n])}")
+            out.append(f"{self.name}_count{_labels_text(self.label_names, key)} {_fmt_value(v[n + 1])}")
+        return out
+
+
+class _Timer:
+    """with HIST.time(라벨...): ... → 걸린 초를 observe."""
+
+    def __init__(self, hist: Histogram, labels: tuple):
+        self.hist = hist
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, m: _Metric) -> _Metric:
+        with self._lock:
+            old = self._metrics.get(m.name)
+            if old is not None:
+                if type(old) is not type(m) or old.label_names != m.label_names:
+                    raise ValueError(f"지표 이름 중복: {m.name}")
+                return old  # 모듈 재로딩 등으로 같은 지표를 다시 만들면 기존 것 재사용
+            self._metrics[m.name] = m
+            return m
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help_text: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))  # type: ignore[return-value]
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ---- 공용 지표(여러 모듈에서 씀) ----
+STOCK_ACTIONS = REGISTRY.counter(
+    "inventory_stock_actions_total", "입출고/정정 처리 수", ("guild_id", "action"),
+)
+LOW_STOCK_ALERTS = REGISTRY.counter(
+    "inventory_low_stock_alerts_total", "새로 경고 상태에 들어간 품목 수(알림 발송 대상)", ("guild_id",),
+)
+REPORT_BUILD_SECONDS = REGISTRY.histogram(
+    "inventory_report_build_seconds", "보고서(엑셀) 생성 시간", ("report",),
+)
+BACKUP_SECONDS = REGISTRY.histogram(
+    "inventory_backup_seconds", "백업 생성 시간(스냅샷/길드 내보내기)", ("kind",),
+)
+BACKUP_LAST_BYTES = REGISTRY.gauge(
+    "inventory_backup_last_bytes", "마지막 백업 파일 크기", ("kind",),
+)
+BACKUP_LAST_SUCCESS = REGISTRY.gauge(
+    "inventory_backup_last_success_timestamp_seconds", "마지막 백업 성공 시각(epoch)", ("kind",),
+)
+BACKUP_FAILURES = REGISTRY.counter(
+    "inventory_backup_failures_total", "백업 생성/검증 실패 수", ("kind",),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "inventory_cache_lookups_total", "메모리 캐시 조회 수(result=hit/miss)", ("cache", "result"),
+)
+INTERACTIONS = REGISTRY.counter(
+    "inventory_interactions_total", "처리한 인터랙션 수(kind=command/component/modal)", ("kind", "outcome"),
+)
+INTERACTION_ACK_SECONDS = REGISTRY.histogram(
+    "inventory_interaction_ack_seconds", "인터랙션 첫 응답(ack)까지 시간", ("kind",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 2.5, 3.0, 5.0),
+)
+EVENT_LOOP_LAG = REGISTRY.gauge(
+    "inventory_event_loop_lag_seconds", "이벤트 루프 지연(예약한 깨어남 시각 대비 늦은 정도, 최근 값)",
+)
+EVENT_LOOP_LAG_MAX = REGISTRY.gauge(
+    "inventory_event_loop_lag_max_seconds", "직전 긁기 이후 최대 이벤트 루프 지연",
+)
+START_TIME = REGISTRY.gauge("inventory_process_start_time_seconds", "프로세스 시작 시각(epoch)")
+START_TIME.set(time.time())
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+
+
+# ---- 이벤트 루프 지연 측정 ----
+
+_lag_max = 0.0
+
+
+async def _lag_probe(interval: float) -> None:
+    global _lag_max
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - t0 - interval)
+        EVENT_LOOP_LAG.set(lag)
+        _lag_max = max(_lag_max, lag)
+
+
+def _take_lag_max() -> float:
+    global _lag_max
+    v, _lag_max = _lag_max, 0.0
+    return v
+
+
+EVENT_LOOP_LAG_MAX.set_function(_take_lag_max)
+
+
+# ---- HTTP 노출 ----
+
+_server_runner = None
+_lag_task: asyncio.Task | None = None
+
+
+async def start_http_server(host: str | None = None, port: int | None = None) -> bool:
+    """
+    /metrics 엔드포인트 시작(이벤트 루프 안에서 1회). METRICS_PORT가 0이면 아무것도 안 함.
+    지연 측정 태스크는 포트와 무관하게 시작(다른 곳에서 지표를 읽을 수도 있으니).
+    """
+    global _server_runner, _lag_task
+    if _lag_task is None:
+        _lag_task = asyncio.create_task(_lag_probe(_env_int("METRICS_LAG_INTERVAL_MS", 500) / 1000))
+
+    port = _env_int("METRICS_PORT", 0) if port is None else int(port)
+    host = host or os.environ.get("METRICS_HOST", "127.0.0.1")
+    if port <= 0 or _server_runner is not None:
+        return False
+
+    try:
+        from aiohttp import web
+    except ImportError:
+        print("[METRICS] aiohttp가 없어 /metrics 엔드포인트 없이 진행")
+        return False
+
+    async def handle(_request):
+        # 렌더링은 dict 순회뿐이라 루프에서 바로 처리(set_function 값도 가벼운 것만 등록)
+        return web.Response(
+            text=REGISTRY.render(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        print(f"[METRICS] {host}:{port} 열기 실패: {e!r}")
+        await runner.cleanup()
+        return False
+    _server_runner = runner
+    print(f"[METRICS] serving http://{host}:{port}/metrics")
+    return True
+
+
+async def stop_http_server() -> None:
+    global _server_runner, _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+    if _server_runner is not None:
+        await _server_runner.cleanup()
+        _server_runner = None
@@ -0,0 +1,204 @@
+# src/utils/sampling_profiler.py
+"""
+운영 중 켜는 샘플링 프로파일러(모든 스레드, N초).
+
+- 감시 스레드가 interval_ms마다 sys._current_frames()로 전 스레드 스택을 찍음
+  (코드 실행에 끼어들지 않음 → 18:30 보고서 몰릴 때/대량 입고 중에도 켜도 됨, 기본 10ms 간격)
+- 결과는 collapsed stack 형식(스레드;바깥 함수;...;안쪽 함수 횟수) → flamegraph.pl, speedscope 에 바로 넣을 수 있음
+- /프로파일 명령(관리자): 끝나면 파일 업로드 + 많이 찍힌 함수 요약
+- SIGUSR2(리눅스): PROFILE_SIGNAL_SECONDS초 동안 찍어서 PROFILE_DIR에 저장(명령을 못 쓸 때)
+- 한 번에 하나만 실행
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from utils.time_kst import KST
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+_SRC_DIR = Path(__file__).resolve().parents[1]
+_MAX_DEPTH = 120
+_running = threading.Lock()
+_signal_tasks: set[asyncio.Task] = set()
+
+
+@dataclass
+class ProfileResult:
+    stacks: Counter          # "스레드;프레임;...;프레임" → 샘플 수
+    leaves: Counter          # (스레드, 가장 안쪽 프레임) → 샘플 수
+    ticks: int
+    seconds: float
+    interval_ms: float
+    threads: int
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+_path_cache: dict[str, str] = {}
+
+
+def _short_path(filename: str) -> str:
+    # 샘플마다 resolve()하면 파일시스템 호출이 많아서 파일명별로 1번만
+    p = _path_cache.get(filename)
+    if p is None:
+        try:
+            p = Path(filename).resolve().relative_to(_SRC_DIR).as_posix()
+        except ValueError:
+            p = os.path.basename(filename)
+        _path_cache[filename] = p
+    return p
+
+
+def _frame_label(code) -> str:
+    path = _short_path(code.co_filename)
+    # collapsed 형식에서 ';' 와 공백(뒤쪽 횟수 구분)은 쓰면 안 됨
+    return f"{code.co_name}({path})".replace(";", ":").replace(" ", "_")
+
+
+def _collapse(frame, thread_name: str) -> tuple[str, str]:
+    labels = []
+    f = frame
+    while f is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_frame_label(f.f_code))
+        f = f.f_back
+    leaf = labels[0] if labels else "?"
+    labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+    labels.reverse()
+    return ";".join(labels), leaf
+
+
+def sample(seconds: float, interval_ms: float = 10.0) -> ProfileResult:
+    """(워커 스레드용) seconds초 동안 샘플링. 이미 실행 중이면 RuntimeError."""
+    if not _running.acquire(blocking=False):
+        raise RuntimeError("이미 프로파일링 중이에요.")
+    try:
+        me = threading.get_ident()
+        interval = max(1.0, float(interval_ms)) / 1000.0
+        stacks: Counter = Counter()
+        leaves: Counter = Counter()
+        seen_threads: set[int] = set()
+        names: dict[int, str] = {}
+        ticks = 0
+        started = time.perf_counter()
+        deadline = started + float(seconds)
+        next_tick = started
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate() if t.ident is not None}
+            frames = sys._current_frames()
+            for tid, frame in frames.items():
+                if tid == me:
+                    continue
+                name = names.get(tid, f"thread-{tid}")
+                stack, leaf = _collapse(frame, name)
+                stacks[stack] += 1
+                leaves[(name, leaf)] += 1
+                seen_threads.add(tid)
+            frames = frame = None  # 프레임 참조를 오래 잡고 있지 않게
+            ticks += 1
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # 밀렸으면 따라잡지 말고 다음 간격부터
+        return ProfileResult(stacks, leaves, ticks, time.perf_counter() - started, interval * 1000, len(seen_threads))
+    finally:
+        _running.release()
+
+
+def is_running() -> bool:
+    return _running.locked()
+
+
+def _profile_dir() -> Path:
+    d = Path(os.environ.get("PROFILE_DIR", "./data/profiles"))
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def save_result(res: ProfileResult, label: str = "profile") -> Path:
+    """collapsed 파일 저장(.txt, 크면 .txt.gz). 반환값: 저장 경로."""
+    stamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")
+    data = res.collapsed().encode("utf-8")
+    if len(data) > _env_int("PROFILE_GZIP_OVER_BYTES", 4 * 1024 * 1024):
+        path = _profile_dir() / f"{label}_{stamp}.collapsed.txt.gz"
+        path.write_bytes(gzip.compress(data))
+    else:
+        path = _profile_dir() / f"{label}_{stamp}.collapsed.txt"
+        path.write_bytes(data)
+    return path
+
+
+def build_summary_text(res: ProfileResult, n: int = 10) -> str:
+    lines = [
+        f"🔥 **샘플링 프로파일** {res.seconds:.0f}초 · {res.ticks}회 × {res.threads}개 스레드 (간격 {res.interval_ms:.0f}ms)",
+        "가장 많이 찍힌 함수(스레드별, 대기 포함):",
+        "```",
+    ]
+    for (thread, leaf), count in res.leaves.most_common(n):
+        pct = count * 100 / res.ticks if res.ticks else 0
+        lines.append(f"{pct:5.1f}% {thread[:18]:<18} {leaf[:60]}")
+    lines.append("```")
+    lines.append("첨부 파일은 flamegraph.pl / speedscope.app 에 그대로 넣으면 돼요.")
+    return "\n".join(lines)[:1990]
+
+
+async def profile_for(seconds: float, interval_ms: float = 10.0, label: str = "profile") -> tuple[ProfileResult, Path]:
+    """이벤트 루프에서 호출: 워커 스레드에서 샘플링 후 저장."""
+    res = await asyncio.to_thread(sample, seconds, interval_ms)
+    path = await asyncio.to_thread(save_result, res, label)
+    return res, path
+
+
+def install_signal_handler(loop: asyncio.AbstractEventLoop) -> bool:
+    """SIGUSR2 → PROFILE_SIGNAL_SECONDS초 프로파일을 파일로 저장(윈도우 등 지원 안 하면 False)."""
+    import signal
+
+    sig = getattr(signal, "SIGUSR2", None)
+    if sig is None:
+        return False
+
+    def _on_signal() -> None:
+        if is_running():
+            print("[PROFILE] 이미 실행 중 - 신호 무시")
+            return
+        seconds = max(1, min(600, _env_int("PROFILE_SIGNAL_SECONDS", 30)))
+
+        async def _run() -> None:
+            try:
+                res, path = await profile_for(seconds, _env_int("PROFILE_INTERVAL_MS", 10), "signal")
+                print(f"[PROFILE] {res.ticks} samples → {path}")
+            except Exception as e:
+                print("[PROFILE_ERROR]", repr(e))
+
+        print(f"[PROFILE] SIGUSR2: {seconds}s 샘플링 시작")
+        task = loop.create_task(_run())
+        _signal_tasks.add(task)
+        task.add_done_callback(_signal_tasks.discard)
+
+    try:
+        loop.add_signal_handler(sig, _on_signal)
+    except (NotImplementedError, RuntimeError, ValueError):
+        return False
+    return True